@@ -10,11 +10,14 @@ sys.path.append(project_root)
 sys.path.append(os.path.join(project_root, 'src'))
 
 from src.database.connection import DatabaseConnection
+from src.database.bulk import bulk_insert
 from src.utils.security import Security
 
 class DataSeeder:
     def __init__(self):
         self.conn = DatabaseConnection.get_connection()
+        # Pooled connections default to autocommit; the seeder batches its own commits
+        self.conn.autocommit = False
         self.cursor = self.conn.cursor(dictionary=True)
         # Mật khẩu mặc định: Test123!
         self.common_pass = Security.hash_password("Test123!")
@@ -147,6 +150,18 @@ class DataSeeder:
             )
             return self.cursor.lastrowid
 
+        USER_COLUMNS = ("username", "password", "full_name", "email", "phone", "role", "status", "address", "dob")
+
+        def create_users_bulk(users, role):
+            """users: list of (username, email, name). One multi-row INSERT, returns the new user ids."""
+            rows = []
+            for username, email, name in users:
+                phone = f"09{self.fake.random_number(digits=8)}"
+                dob = self.fake.date_of_birth(minimum_age=18, maximum_age=55)
+                addr = self.fake.address().replace('\n', ', ')
+                rows.append((username, self.common_pass, name, email, phone, role, 'ACTIVE', addr, dob))
+            return bulk_insert(self.cursor, "Users", USER_COLUMNS, rows)
+
         # 4.1 ADMIN
         uid_admin = create_user_db("admin", "admin@uth.edu.vn", "System Admin", "Admin")
         self.cursor.execute("INSERT INTO Academic_Officers (user_id, admin_code) VALUES (%s, 'ADM01')", (uid_admin,))
@@ -159,13 +174,14 @@ class DataSeeder:
         lecturer_ids.append(self.cursor.lastrowid)
         lid_main = self.cursor.lastrowid
 
-        for i in range(2, 21):
-            name = self.fake.name()
-            uname = f"lec{i:02d}"
-            uid = create_user_db(uname, f"{uname}@uth.edu.vn", f"Prof. {name}", "Lecturer")
-            self.cursor.execute("INSERT INTO Lecturers (user_id, dept_id, lecturer_code, degree) VALUES (%s, %s, %s, 'Master')", 
-                                (uid, random.choice(dept_ids), f"L{i:03d}"))
-            lecturer_ids.append(self.cursor.lastrowid)
+        lec_numbers = range(2, 21)
+        lec_uids = create_users_bulk(
+            [(f"lec{i:02d}", f"lec{i:02d}@uth.edu.vn", f"Prof. {self.fake.name()}") for i in lec_numbers], "Lecturer"
+        )
+        lecturer_ids += bulk_insert(
+            self.cursor, "Lecturers", ("user_id", "dept_id", "lecturer_code", "degree"),
+            [(uid, random.choice(dept_ids), f"L{i:03d}", 'Master') for uid, i in zip(lec_uids, lec_numbers)]
+        )
 
         # 4.3 STUDENTS
         student_ids = []
@@ -182,13 +198,14 @@ class DataSeeder:
         student_ids.append(self.cursor.lastrowid)
 
         # Random Students (Increased to ~50 total)
-        for i in range(3, 51):
-            name = self.fake.name()
-            uname = f"stu{i:02d}"
-            uid = create_user_db(uname, f"{uname}@uth.edu.vn", name, "Student")
-            self.cursor.execute("INSERT INTO Students (user_id, dept_id, student_code, major, academic_year) VALUES (%s, %s, %s, 'IT', 2024)", 
-                                (uid, random.choice(dept_ids), f"2111{i:02d}"))
-            student_ids.append(self.cursor.lastrowid)
+        stu_numbers = range(3, 51)
+        stu_uids = create_users_bulk(
+            [(f"stu{i:02d}", f"stu{i:02d}@uth.edu.vn", self.fake.name()) for i in stu_numbers], "Student"
+        )
+        student_ids += bulk_insert(
+            self.cursor, "Students", ("user_id", "dept_id", "student_code", "major", "academic_year"),
+            [(uid, random.choice(dept_ids), f"2111{i:02d}", 'IT', 2024) for uid, i in zip(stu_uids, stu_numbers)]
+        )
 
         # ==========================================
         # 5. CLASSES & SCHEDULE
@@ -203,38 +220,26 @@ class DataSeeder:
             "Friday 07:00-09:30", "Friday 13:00-15:30"
         ]
         
-        class_ids_open = []
-        class_ids_closed = []
+        CLASS_COLUMNS = ("course_id", "semester_id", "lecturer_id", "room", "schedule", "max_capacity")
 
         # Past Semester Classes
-        for i in range(20):
-            course = random.choice(all_course_ids)
-            lecturer = random.choice(lecturer_ids)
-            self.cursor.execute(
-                "INSERT INTO Course_Classes (course_id, semester_id, lecturer_id, room, schedule, max_capacity) VALUES (%s, %s, %s, %s, %s, 50)",
-                (course, sem_closed_id, lecturer, f"OLD-{i}", random.choice(slots))
-            )
-            class_ids_closed.append(self.cursor.lastrowid)
+        class_ids_closed = bulk_insert(self.cursor, "Course_Classes", CLASS_COLUMNS, [
+            (random.choice(all_course_ids), sem_closed_id, random.choice(lecturer_ids), f"OLD-{i}", random.choice(slots), 50)
+            for i in range(20)
+        ])
 
         # Current Semester Classes (Main Lecturer has specific schedule)
         my_slots = ["Monday 07:00-09:30", "Wednesday 13:00-15:30"] 
-        for i, slot in enumerate(my_slots):
-            course = random.choice(all_course_ids)
-            self.cursor.execute(
-                "INSERT INTO Course_Classes (course_id, semester_id, lecturer_id, room, schedule, max_capacity) VALUES (%s, %s, %s, %s, %s, 50)",
-                (course, sem_open_id, lid_main, f"MY-ROOM-{i}", slot)
-            )
-            class_ids_open.append(self.cursor.lastrowid)
+        class_ids_open = bulk_insert(self.cursor, "Course_Classes", CLASS_COLUMNS, [
+            (random.choice(all_course_ids), sem_open_id, lid_main, f"MY-ROOM-{i}", slot, 50)
+            for i, slot in enumerate(my_slots)
+        ])
 
         # Random classes
-        for i in range(20):
-            course = random.choice(all_course_ids)
-            lecturer = random.choice(lecturer_ids)
-            self.cursor.execute(
-                "INSERT INTO Course_Classes (course_id, semester_id, lecturer_id, room, schedule, max_capacity) VALUES (%s, %s, %s, %s, %s, 50)",
-                (course, sem_open_id, lecturer, f"NEW-{i}", random.choice(slots))
-            )
-            class_ids_open.append(self.cursor.lastrowid)
+        class_ids_open += bulk_insert(self.cursor, "Course_Classes", CLASS_COLUMNS, [
+            (random.choice(all_course_ids), sem_open_id, random.choice(lecturer_ids), f"NEW-{i}", random.choice(slots), 50)
+            for i in range(20)
+        ])
 
         # ==========================================
         # 6. ENROLLMENTS & GRADES
@@ -242,24 +247,24 @@ class DataSeeder:
         print("   -> 6. Enrolling Students & Grading...")
 
         # 6.1 Main Student
-        my_classes = random.sample(class_ids_open, 3) 
-        for cid in my_classes:
-            self.cursor.execute("INSERT INTO Grades (student_id, class_id, is_locked) VALUES (%s, %s, 0)", (sid_main, cid))
+        enrollments = [(sid_main, cid, 0) for cid in random.sample(class_ids_open, 3)]
         
         old_classes = random.sample(class_ids_closed, 3)
+        graded = []
         for cid in old_classes:
             final = random.randint(5, 10)
-            self.cursor.execute(
-                "INSERT INTO Grades (student_id, class_id, attendance_score, midterm, final, total, letter_grade, is_locked) VALUES (%s, %s, 10, %s, %s, %s, 'A', 1)",
-                (sid_main, cid, final, final, final)
-            )
+            graded.append((sid_main, cid, 10, final, final, final, 'A', 1))
+        bulk_insert(self.cursor, "Grades",
+                    ("student_id", "class_id", "attendance_score", "midterm", "final", "total", "letter_grade", "is_locked"),
+                    graded)
 
         # 6.2 Other Students (Include the Forgot Password user)
         for sid in student_ids:
             if sid == sid_main: continue 
             k = random.randint(2, 4)
             for cid in random.sample(class_ids_open, k):
-                self.cursor.execute("INSERT INTO Grades (student_id, class_id, is_locked) VALUES (%s, %s, 0)", (sid, cid))
+                enrollments.append((sid, cid, 0))
+        bulk_insert(self.cursor, "Grades", ("student_id", "class_id", "is_locked"), enrollments)
 
         # ==========================================
         # 7. ANNOUNCEMENTS
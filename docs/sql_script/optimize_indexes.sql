@@ -2,6 +2,8 @@
 -- PERFORMANCE OPTIMIZATION: ADD INDEXES
 -- ============================================================
 -- Run this script in your MySQL to speed up queries
+-- Superseded by migration 2 in src/database/migrations.py, which skips
+-- indexes that already exist:  cd src && python -m database.migrations
 
 -- Students table indexes
 CREATE INDEX idx_student_code ON Students(student_code);
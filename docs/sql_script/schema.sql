@@ -113,8 +113,21 @@ CREATE TABLE IF NOT EXISTS Grades (
 CREATE TABLE IF NOT EXISTS Announcements (
     announcement_id INT AUTO_INCREMENT PRIMARY KEY,
     officer_id INT,
+    user_id INT NULL, -- Personal notification recipient (NULL = announcement for everyone)
     title VARCHAR(255) NOT NULL,
     content TEXT,
     created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (officer_id) REFERENCES Academic_Officers(officer_id) ON DELETE SET NULL
-);
\ No newline at end of file
+    FOREIGN KEY (officer_id) REFERENCES Academic_Officers(officer_id) ON DELETE SET NULL,
+    FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+);
+
+-- 11. Change Journal (append-only; feeds cross-client cache invalidation, see src/database/change_journal.py)
+CREATE TABLE IF NOT EXISTS Change_Journal (
+    version BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    row_id BIGINT NULL,
+    operation VARCHAR(10) NOT NULL,
+    client_id CHAR(32) NOT NULL,
+    changed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_journal_changed_at (changed_at)
+);
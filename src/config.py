@@ -24,4 +24,84 @@ class Config:
     DB_PASSWORD = os.getenv("MYSQLPASSWORD") or os.getenv("DB_PASSWORD", "password")
     DB_NAME = os.getenv("MYSQLDATABASE") or os.getenv("DB_NAME", "student_management_db")
     SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_key_do_not_use_in_prod")
-    RESEND_API_KEY = os.getenv("RESEND_API_KEY")
\ No newline at end of file
+    RESEND_API_KEY = os.getenv("RESEND_API_KEY")
+
+    # Database backend (see database/backend.py): "mysql", or "sqlite" for tests and benchmarks
+    DB_BACKEND = os.getenv("DB_BACKEND", "mysql")
+    # Apply pending schema migrations (database/migrations.py) at startup. Off by default: the app
+    # refuses to start with pending ones, and operators run `cd src && python -m database.migrations`
+    DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "0") == "1"
+    SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")   # Database file, or ":memory:"
+    SQLITE_SCHEMA_FILES = [
+        os.path.join(application_path, "..", "docs", "sql_script", name.strip())
+        for name in os.getenv("SQLITE_SCHEMA_FILES", "schema.sql,reset_passwordtoken.sql,update_address.sql").split(",")
+    ]
+
+    # WAN mode for a hosted database (MYSQLHOST) where every round trip costs tens of ms:
+    # compressed protocol and connections opened at startup
+    DB_WAN_MODE = os.getenv("DB_WAN_MODE", "1" if os.getenv("MYSQLHOST") else "0") == "1"
+    # TCP keepalive on pooled connections, for NATs / load balancers that drop idle ones.
+    # Needs the socket of mysql-connector's pure-Python protocol (use_pure), which parses
+    # large results slower than the C extension; without it the pool's ping replaces them
+    DB_TCP_KEEPALIVE = os.getenv("DB_TCP_KEEPALIVE", "0") == "1"
+    DB_KEEPALIVE_IDLE = int(os.getenv("DB_KEEPALIVE_IDLE", "60"))          # Idle seconds before the first keepalive probe
+    DB_KEEPALIVE_INTERVAL = int(os.getenv("DB_KEEPALIVE_INTERVAL", "15"))  # Seconds between unanswered probes
+
+    # Connection pool (see database/pool.py)
+    DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))              # Seconds a caller waits for a free connection
+    DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))    # Seconds before surplus idle connections are closed
+    DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", "30"))   # Ping connections idle longer than this before use
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "0"))  # Prepared statements kept per connection (0 = disabled)
+    DB_BULK_CHUNK_SIZE = int(os.getenv("DB_BULK_CHUNK_SIZE", "500"))           # Rows per multi-row INSERT/UPDATE (see database/bulk.py)
+
+    # Read replicas: comma-separated "host[:port]" list, empty = primary only
+    DB_REPLICA_HOSTS = os.getenv("DB_REPLICA_HOSTS", "")
+    DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))                    # Seconds behind the primary before reads fall back to it
+    DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))      # Seconds between replication lag checks
+    DB_READ_YOUR_WRITES_WINDOW = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "10"))   # Seconds a thread reads from the primary after it writes
+
+    # Paginated list totals (see database/count_service.py)
+    COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", "30"))                        # Seconds an exact total is reused
+    COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "200000"))  # Use information_schema estimates above this many rows (0 = never)
+
+    # In-memory cache (see utils/cache.py): least recently used entries are evicted beyond these limits
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_MB", "64")) * 1024 * 1024   # Approximate memory budget
+    CACHE_NEGATIVE_TTL = int(os.getenv("CACHE_NEGATIVE_TTL", "30"))         # Max seconds a "not found" result is cached
+    CACHE_STATS_LOG_INTERVAL = int(os.getenv("CACHE_STATS_LOG_INTERVAL", "0"))  # Seconds between Cache.stats() log dumps (0 = off)
+    CACHE_STATS_LOG_FILE = os.getenv("CACHE_STATS_LOG_FILE", "")                # Cache stats log path (empty = stderr)
+
+    # Dashboards (stale-while-revalidate, see Cache.get_or_revalidate)
+    DASHBOARD_STALE_AFTER = int(os.getenv("DASHBOARD_STALE_AFTER", "30"))  # Older data is shown, then refreshed in the background
+    DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "900"))     # Older data is dropped and loaded before showing
+
+    # Repository query cache (see database/query_cache.py); writes evict dependent entries
+    QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "300"))            # Reference data: semesters, departments
+    QUERY_CACHE_USER_TTL = int(os.getenv("QUERY_CACHE_USER_TTL", "60"))   # Per-user data: transcripts, schedules
+
+    # Closing a semester moves its classes and grades to the archive tables, reopening it moves them back
+    # (see SemesterRepository.archive). Only student transcripts and schedules read the archive: archived
+    # classes and rosters disappear from the lecturer schedule, grading, the admin class list and the counts.
+    SEMESTER_AUTO_ARCHIVE = os.getenv("SEMESTER_AUTO_ARCHIVE", "0") == "1"
+
+    # Cross-client invalidation through the Change_Journal table (see database/change_journal.py).
+    # Off by default: each write through execute_query then runs in its own transaction (START
+    # TRANSACTION + COMMIT) with one more INSERT into Change_Journal, i.e. 3 extra round trips per
+    # write, plus one poll query per client every CHANGE_POLL_INTERVAL. Turn on when several clients
+    # share the database and must not serve each other's stale cache entries
+    CHANGE_JOURNAL_ENABLED = os.getenv("CHANGE_JOURNAL_ENABLED", "0") == "1"
+    CHANGE_POLL_INTERVAL = float(os.getenv("CHANGE_POLL_INTERVAL", "3"))               # Seconds between polls
+    CHANGE_JOURNAL_RETENTION = int(os.getenv("CHANGE_JOURNAL_RETENTION", "86400"))     # Seconds journal entries are kept
+
+    # On-disk second tier of the query cache for reference data (see database/persistent_cache.py).
+    # Warmed at startup, revalidated against Change_Journal; needs the change journal. Empty path = off
+    PERSISTENT_CACHE_PATH = os.getenv("PERSISTENT_CACHE_PATH", "")
+    PERSISTENT_CACHE_TABLES = os.getenv("PERSISTENT_CACHE_TABLES", "Departments,Semesters,Courses")  # Reads of only these tables are kept
+
+    # Query instrumentation (see database/instrumentation.py)
+    QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "1") == "1"              # Per-method latency histogram
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))    # Statements slower than this are logged
+    SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "")                      # Slow-query log path (empty = stderr)
+    QUERY_STATS_DUMP_ON_EXIT = os.getenv("QUERY_STATS_DUMP_ON_EXIT", "0") == "1"    # Print the histogram when the app closes
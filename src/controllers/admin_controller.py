@@ -16,6 +16,7 @@ from models.academic.semester import Semester
 from models.academic.course_class import CourseClass
 from models.academic.announcement import Announcement
 
+from config import Config
 from utils.security import Security
 from utils.validators import Validators
 
@@ -85,6 +86,10 @@ class AdminController:
     def get_all_students(self, page=1, per_page=15, search_query=None):
         return self.student_repo.get_all(page=page, per_page=per_page, search_query=search_query)
 
+    def get_students_page(self, cursor=None, per_page=15, search_query=None):
+        """Keyset pagination: pass next_cursor / prev_cursor of the previous result."""
+        return self.student_repo.get_page(per_page=per_page, cursor=cursor, search_query=search_query)
+
     def create_student(self, full_name, email, phone, student_code, dept_id, major, year):
         if not Validators.is_valid_email(email):
             return False, "Invalid email format"
@@ -153,6 +158,9 @@ class AdminController:
     def get_all_lecturers(self, page=1, per_page=15, search_query=None):
         return self.lecturer_repo.get_all(page=page, per_page=per_page, search_query=search_query)
 
+    def get_lecturers_page(self, cursor=None, per_page=15, search_query=None):
+        return self.lecturer_repo.get_page(per_page=per_page, cursor=cursor, search_query=search_query)
+
     def get_total_lecturers(self):
         return self.lecturer_repo.count_all()
 
@@ -195,6 +203,9 @@ class AdminController:
     def get_all_courses(self, page=1, per_page=15, search_query=None):
         return self.course_repo.get_all(page=page, per_page=per_page, search_query=search_query)
 
+    def get_courses_page(self, cursor=None, per_page=15, search_query=None):
+        return self.course_repo.get_page(per_page=per_page, cursor=cursor, search_query=search_query)
+
     def get_total_courses(self):
         return self.course_repo.count_all()
 
@@ -245,7 +256,20 @@ class AdminController:
     def update_semester(self, sem_id, name, start, end, status):
         if not (Validators.is_valid_date(start) and Validators.is_valid_date(end)):
             return False, "Invalid date format (YYYY-MM-DD)"
-        return self.semester_repo.update(Semester(sem_id, name, start, end, status))
+        success, msg = self.semester_repo.update(Semester(sem_id, name, start, end, status))
+        if not success or not Config.SEMESTER_AUTO_ARCHIVE:
+            return success, msg
+
+        # OPTIMIZATION: Closed semesters leave the hot Grades / Course_Classes tables
+        if status == "CLOSED":
+            archived, archive_msg = self.semester_repo.archive(sem_id)
+            if not archived:
+                return True, f"{msg} (not archived: {archive_msg})"
+        elif self.semester_repo.is_archived(sem_id):
+            restored, restore_msg = self.semester_repo.restore(sem_id)
+            if not restored:
+                return True, f"{msg} (classes still archived: {restore_msg})"
+        return success, msg
 
     def delete_semester(self, sem_id):
         return self.semester_repo.delete(sem_id)
@@ -256,6 +280,9 @@ class AdminController:
     def get_all_classes_details(self, page=1, per_page=15, search_query=None):
         return self.class_repo.get_all_details(page=page, per_page=per_page, search_query=search_query)
 
+    def get_classes_page(self, cursor=None, per_page=15, search_query=None):
+        return self.class_repo.get_page(per_page=per_page, cursor=cursor, search_query=search_query)
+
     def get_total_classes(self):
         return self.class_repo.count_all()
 
@@ -7,6 +7,9 @@ from database.repositories.semester_repo import SemesterRepository
 from models.academic.grade import Grade
 from utils.validators import Validators
 from database.repositories.announcement_repo import AnnouncementRepository
+from database.unit_of_work import UnitOfWork
+from database.change_journal import ChangePoller
+from utils.cache import Cache
 
 class LecturerController:
     def __init__(self, user_id):
@@ -24,6 +27,9 @@ class LecturerController:
         # OPTIMIZATION: Use Lazy Loading to avoid blocking UI during init
         self.current_lecturer = None
         self._schedule_cache = None # Cache for teaching schedule
+        # Admins (re)assigning classes or students enrolling on other clients
+        # invalidate the schedule and dashboard (see _on_remote_change)
+        ChangePoller.subscribe(("Course_Classes", "Courses", "Semesters", "Grades"), self._on_remote_change)
 
     @property
     def lecturer_repo(self):
@@ -55,6 +61,38 @@ class LecturerController:
         if self._ann_repo is None: self._ann_repo = AnnouncementRepository()
         return self._ann_repo
 
+    def dashboard_cache_key(self):
+        """Cache key of this lecturer's dashboard data (views/lecturer/dashboard.py)."""
+        return ("LecturerDashboard", self.user_id)
+
+    def _on_remote_change(self, changes):
+        """
+        Called from the change poller thread when another client edited classes,
+        courses, semesters or enrollments. Drops the schedule and dashboard only
+        when the changed rows belong to this lecturer's classes.
+        """
+        if self._schedule_affected(changes):
+            self._schedule_cache = None
+            Cache.clear(self.dashboard_cache_key())
+
+    def _schedule_affected(self, changes):
+        if {table.lower() for table, _, _ in changes} & {"courses", "semesters"}:
+            return True
+        class_ids = ChangePoller.changed_rows(changes, "Course_Classes")
+        # Score edits don't show in the schedule, only (un)enrollments (enrolled_count)
+        grade_ids = ChangePoller.changed_rows(changes, "Grades", operations=("INSERT", "DELETE"))
+        if class_ids is None or grade_ids is None:
+            return True
+        schedule = self._schedule_cache
+        if schedule and class_ids & {c['class_id'] for c in schedule}:
+            return True  # Covers classes reassigned away from this lecturer
+        if not (class_ids or grade_ids):
+            return False
+        self._ensure_lecturer_loaded()
+        return bool(self.current_lecturer) and self.class_repo.concerns_lecturer(
+            self.current_lecturer.lecturer_id, class_ids, grade_ids
+        )
+
     def _ensure_lecturer_loaded(self):
         if self.current_lecturer is None:
             self.current_lecturer = self.lecturer_repo.get_by_user_id(self.user_id)
@@ -193,65 +231,79 @@ class LecturerController:
     def update_class_grades(self, class_id, grades_data):
         """
         OPTIMIZATION: Bulk update grades to reduce DB calls.
+        The whole batch (lookups, score updates, notifications) runs in one
+        UnitOfWork: a single pooled connection and a single COMMIT.
         grades_data: list of tuples (student_id, attendance, midterm, final)
         """
-        # 1. Validate Semester Status ONCE for the whole batch
-        cls_info = self.class_repo.get_by_id(class_id)
-        if cls_info:
-            sem = self.semester_repo.get_by_id(cls_info.semester_id)
-            if sem:
-                if sem.status == 'CLOSED':
-                    return False, "Grade update period has expired (Semester Closed)."
-                
-                if sem.end_date:
-                    end_date = sem.end_date
-                    if isinstance(end_date, str):
-                        try:
-                            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-                        except ValueError:
-                            pass
+        with UnitOfWork():
+            # 1. Validate Semester Status ONCE for the whole batch
+            cls_info = self.class_repo.get_by_id(class_id)
+            if cls_info:
+                sem = self.semester_repo.get_by_id(cls_info.semester_id)
+                if sem:
+                    if sem.status == 'CLOSED':
+                        return False, "Grade update period has expired (Semester Closed)."
                     
-                    if hasattr(end_date, 'year') and datetime.now().date() > end_date:
-                        return False, "Grade update period has expired (Date passed)."
+                    if sem.end_date:
+                        end_date = sem.end_date
+                        if isinstance(end_date, str):
+                            try:
+                                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+                            except ValueError:
+                                pass
+                        
+                        if hasattr(end_date, 'year') and datetime.now().date() > end_date:
+                            return False, "Grade update period has expired (Date passed)."
 
-        # 2. Process Updates
-        
-        # OPTIMIZATION: Fetch all grade IDs for this class once to avoid N queries inside loop
-        # This reduces complexity from O(N) DB queries to O(1) DB query for lookups
-        class_grades = self.grade_repo.get_by_class(class_id)
-        grade_map = {} # Map student_id -> grade_id
-        if class_grades:
-            for g in class_grades:
-                # Handle dictionary or object return type safely
-                sid = g.get('student_id') if isinstance(g, dict) else getattr(g, 'student_id', None)
-                gid = g.get('grade_id') if isinstance(g, dict) else getattr(g, 'grade_id', None)
-                if sid and gid:
-                    grade_map[sid] = gid
-
-        success_count = 0
-        
-        for sid, att, mid, fin in grades_data:
-            # Validate inputs locally
-            if not (0 <= att <= 10 and 0 <= mid <= 10 and 0 <= fin <= 10):
-                 continue
-
-            # Find grade_id from map (Memory lookup instead of DB query)
-            grade_id = grade_map.get(sid)
-            if not grade_id:
-                continue
-                
-            grade_obj = Grade(
-                grade_id=grade_id, student_id=sid, class_id=class_id,
-                attendance_score=att, midterm=mid, final=fin,
-                total=0, letter_grade=""
-            )
-            if self.grade_repo.update_scores(grade_obj):
-                success_count += 1
-                # Notify student (Simulated)
-                self._notify_student_grade_update(sid, class_id)
+            # 2. Process Updates
+            
+            # OPTIMIZATION: Fetch all grade IDs for this class once to avoid N queries inside loop
+            # This reduces complexity from O(N) DB queries to O(1) DB query for lookups
+            class_grades = self.grade_repo.get_by_class(class_id)
+            grade_map = {} # Map student_id -> grade_id
+            user_map = {}  # Map student_id -> user_id (notification recipient)
+            if class_grades:
+                for g in class_grades:
+                    # Handle dictionary or object return type safely
+                    sid = g.get('student_id') if isinstance(g, dict) else getattr(g, 'student_id', None)
+                    gid = g.get('grade_id') if isinstance(g, dict) else getattr(g, 'grade_id', None)
+                    uid = g.get('user_id') if isinstance(g, dict) else getattr(g, 'user_id', None)
+                    locked = g.get('is_locked') if isinstance(g, dict) else getattr(g, 'is_locked', False)
+                    if sid and gid and not locked:
+                        grade_map[sid] = gid
+                        user_map[sid] = uid
+
+            grade_objs = []
+            for sid, att, mid, fin in grades_data:
+                # Validate inputs locally
+                if not (0 <= att <= 10 and 0 <= mid <= 10 and 0 <= fin <= 10):
+                     continue
+
+                # Find grade_id from map (Memory lookup instead of DB query)
+                grade_id = grade_map.get(sid)
+                if not grade_id:
+                    continue
+                    
+                grade_objs.append(Grade(
+                    grade_id=grade_id, student_id=sid, class_id=class_id,
+                    attendance_score=att, midterm=mid, final=fin,
+                    total=0, letter_grade=""
+                ))
+
+            # OPTIMIZATION: Multi-row UPDATE and notification INSERT instead of 2 statements per student
+            saved, msg, saved_ids = self.grade_repo.update_scores_bulk(grade_objs)
+            if not saved:
+                return False, msg
+            # Grades locked since get_by_class were skipped by the UPDATE: count and notify only the saved ones
+            saved_ids = set(saved_ids)
+            saved_students = [g.student_id for g in grade_objs if g.grade_id in saved_ids]
+            success_count = len(saved_students)
+
+            # Notify students (Simulated)
+            self._notify_students_grade_update(saved_students, class_id, user_map)
         
         if success_count == 0 and grades_data:
-            return False, "No grades were saved. Please check inputs (0-10)."
+            return False, "No grades were saved. Please check inputs (0-10) and that grades are not locked."
                 
         return True, f"Successfully saved grades for {success_count} students."
 
@@ -271,6 +323,19 @@ class LecturerController:
         except Exception as e:
             print(f"⚠️ Failed to notify student {student_id}: {e}")
 
+    def _notify_students_grade_update(self, student_ids, class_id, user_map):
+        """Batch version of _notify_student_grade_update. user_map: student_id -> user_id"""
+        user_ids = [user_map[sid] for sid in student_ids if user_map.get(sid)]
+        if not user_ids:
+            return
+        title = "Grade Update"
+        body = f"Your grades for Class ID {class_id} have been updated. Please check your transcript."
+        ok, msg = self.ann_repo.add_notifications(user_ids, title, body)
+        if ok:
+            print(f"🔔 [NOTIFICATION] Saved to Announcements for {len(user_ids)} students")
+        else:
+            print(f"⚠️ Failed to notify students of class {class_id}: {msg}")
+
     def get_dashboard_summary(self):
         """
         OPTIMIZATION: Fetch schedule once for both upcoming class and stats.
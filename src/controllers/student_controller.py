@@ -3,6 +3,9 @@ from database.repositories.class_repo import ClassRepository
 from database.repositories.grade_repo import GradeRepository
 from database.repositories.announcement_repo import AnnouncementRepository
 from database.repositories.semester_repo import SemesterRepository
+from database.repository import BaseRepository
+from database.change_journal import ChangePoller
+from utils.cache import Cache
 from utils.validators import Validators
 from datetime import datetime
 
@@ -10,6 +13,9 @@ class StudentController:
     # Constants for GPA calculation
     GPA_POINT_MAP = {'A': 4.0, 'B': 3.0, 'C': 2.0, 'D': 1.0, 'F': 0.0}
     DEFAULT_CREDITS = 3
+    # Tables the dashboard reads; shared ones evict it on any change
+    DASHBOARD_TABLES = ("Users", "Students", "Grades", "Course_Classes", "Courses", "Semesters", "Announcements")
+    SHARED_TABLES = {"courses", "semesters", "announcements"}
 
     def __init__(self, user_id):
         self.user_id = user_id
@@ -24,10 +30,11 @@ class StudentController:
         
         # OPTIMIZATION: Use Lazy Loading. Student data is fetched only when needed via _ensure_student_loaded
         self.current_student = None
-        
-        # OPTIMIZATION: Cache expensive data to avoid re-fetching/re-calculating in the same request
-        self._grade_data_cache = None
-        self._schedule_cache = None
+
+        # Transcript and schedule are cached by the repositories (query cache),
+        # which evicts them whenever Grades / Course_Classes change
+        # Edits made on other clients evict the dashboard (see _on_remote_change)
+        ChangePoller.subscribe(self.DASHBOARD_TABLES, self._on_remote_change)
 
     @property
     def student_repo(self):
@@ -54,6 +61,38 @@ class StudentController:
         if self._semester_repo is None: self._semester_repo = SemesterRepository()
         return self._semester_repo
 
+    def dashboard_cache_key(self):
+        """Cache key of this student's dashboard data (views/student/dashboard.py)"""
+        return ("StudentDashboard", self.user_id)
+
+    def _on_remote_change(self, changes):
+        """
+        Called from the change poller thread. Evicts the dashboard only when the
+        changed rows concern this student.
+        """
+        if self._dashboard_affected(changes):
+            Cache.clear(self.dashboard_cache_key())
+
+    def _dashboard_affected(self, changes):
+        if {table.lower() for table, _, _ in changes} & self.SHARED_TABLES:
+            return True
+        user_ids = ChangePoller.changed_rows(changes, "Users")
+        if user_ids is None or self.user_id in user_ids:
+            return True
+        self._ensure_student_loaded()
+        if not self.current_student:
+            return False
+        student_ids = ChangePoller.changed_rows(changes, "Students")
+        if student_ids is None or self.current_student.student_id in student_ids:
+            return True
+        grade_ids = ChangePoller.changed_rows(changes, "Grades")
+        class_ids = ChangePoller.changed_rows(changes, "Course_Classes")
+        if grade_ids is None or class_ids is None:
+            return True
+        if not (grade_ids or class_ids):
+            return False
+        return self.grade_repo.concerns_student(self.current_student.student_id, grade_ids, class_ids)
+
     def _ensure_student_loaded(self):
         """Helper to lazy load student data only when needed"""
         if self.current_student is None:
@@ -123,27 +162,20 @@ class StudentController:
         """
         FR-07: View Weekly Schedule
         """
-        if not force_update and self._schedule_cache is not None:
-            return self._schedule_cache
-
         self._ensure_student_loaded()
         if not self.current_student: return []
         
-        self._schedule_cache = self.class_repo.get_schedule_by_student(self.current_student.student_id)
-        return self._schedule_cache
+        return self.class_repo.get_schedule_by_student(self.current_student.student_id, refresh=force_update)
 
     def view_grades(self, force_update=False):
         """
         FR-08: View Academic Results
         """
-        if not force_update and self._grade_data_cache:
-            return self._grade_data_cache
-
         self._ensure_student_loaded()
         if not self.current_student: 
             return {'transcript': [], 'cumulative_gpa': 0.0, 'earned_credits': 0}
             
-        grades = self.grade_repo.get_by_student(self.current_student.student_id)
+        grades = self.grade_repo.get_by_student(self.current_student.student_id, refresh=force_update)
         
         # Calculate cumulative GPA (Optional - Business logic)
         total_points = 0
@@ -165,13 +197,11 @@ class StudentController:
         
         gpa = round(total_points / total_credits_attempted, 2) if total_credits_attempted > 0 else 0.0
         
-        self._grade_data_cache = {
+        return {
             "transcript": grades,
             "cumulative_gpa": gpa,
             "earned_credits": total_credits_earned
         }
-        
-        return self._grade_data_cache
 
     # --- For DASHBOARD ---
     def get_upcoming_class(self):
@@ -276,6 +306,22 @@ class StudentController:
     def get_latest_announcements(self, limit=3):
         return self.ann_repo.get_recent(user_id=self.user_id, limit=limit)
 
+    def prefetch_dashboard(self, announcement_limit=3):
+        """
+        OPTIMIZATION: Loads transcript, schedule, active semester and latest
+        announcements in one round trip (instead of four) so the dashboard
+        methods below are answered from the query cache.
+        """
+        self._ensure_student_loaded()
+        if not self.current_student: return
+        student_id = self.current_student.student_id
+        BaseRepository.prefetch(
+            lambda: self.grade_repo.get_by_student(student_id),
+            lambda: self.class_repo.get_schedule_by_student(student_id),
+            self.semester_repo.get_active,
+            lambda: self.ann_repo.get_recent(user_id=self.user_id, limit=announcement_limit),
+        )
+
     def get_dashboard_academic_summary(self):
         """
         OPTIMIZATION: Fetch grades once for both stats and recent list.
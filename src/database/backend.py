@@ -0,0 +1,177 @@
+"""
+Pluggable database backends.
+
+DatabaseConnection opens raw connections through the backend selected by
+Config.DB_BACKEND instead of calling mysql.connector directly:
+    mysql   - the production MySQL server (default)
+    sqlite  - embedded SQLite (in-memory or a file) for tests and benchmarks,
+              see database/sqlite_backend.py
+
+A backend's connections must behave like mysql.connector connections as far
+as this code base uses them: cursor(dictionary=..., buffered=..., prepared=...),
+start_transaction/commit/rollback, autocommit, in_transaction, ping, close.
+"""
+import socket
+from collections import namedtuple
+
+import mysql.connector
+from config import Config
+
+# One table access of a query plan; full_scan = every row of the table is read
+PlanStep = namedtuple("PlanStep", "table full_scan detail")
+
+
+class DatabaseBackend:
+    name = None
+    Error = Exception           # Base class of the backend's driver errors
+    supports_replicas = False   # Read replicas (SHOW REPLICA STATUS lag checks)
+    supports_row_estimates = False  # information_schema.TABLES row estimates
+
+    def connect(self, host=None, port=None):
+        """Opens a new raw connection."""
+        raise NotImplementedError
+
+    def fetch_batch(self, connection, statements):
+        """
+        Runs independent SELECTs [(sql, params), ...] and returns their results
+        as [(column_names, tuple rows), ...]. Backends that can send them in
+        one round trip override this; the default runs them one by one.
+        """
+        cursor = connection.cursor()
+        try:
+            results = []
+            for sql, params in statements:
+                cursor.execute(sql, params or ())
+                results.append((cursor.column_names, cursor.fetchall()))
+            return results
+        finally:
+            cursor.close()
+
+    # --- Introspection (database/migrations.py, database/plan_check.py) ---
+    def table_columns(self, cursor, table):
+        """Set of column names of `table`."""
+        raise NotImplementedError
+
+    def table_indexes(self, cursor, table):
+        """{index name: (column, ...)} of `table`, including primary and unique keys."""
+        raise NotImplementedError
+
+    def table_foreign_keys(self, cursor, table):
+        """Set of (column, referenced table, referenced column) of the foreign keys of `table`."""
+        raise NotImplementedError
+
+    def explain(self, cursor, sql, params=None):
+        """Query plan of a SELECT as a list of PlanStep."""
+        raise NotImplementedError
+
+
+class MySQLBackend(DatabaseBackend):
+    name = "mysql"
+    Error = mysql.connector.Error
+    supports_replicas = True
+    supports_row_estimates = True
+
+    def connect(self, host=None, port=None):
+        """
+        Opens a new raw connection (to the primary unless host/port are given).
+        In WAN mode (Config.DB_WAN_MODE) the protocol is compressed. With
+        Config.DB_TCP_KEEPALIVE the socket sends TCP keepalives, so idle pooled
+        connections survive NAT and load balancer timeouts instead of failing
+        their next ping.
+        """
+        wan_options = {}
+        if Config.DB_WAN_MODE:
+            wan_options['compress'] = True
+        if Config.DB_TCP_KEEPALIVE:
+            # Only the pure-Python protocol exposes its socket for the keepalive options
+            wan_options['use_pure'] = True
+        connection = mysql.connector.connect(
+            host=host or Config.DB_HOST,
+            port=port or Config.DB_PORT,
+            user=Config.DB_USER,
+            password=Config.DB_PASSWORD,
+            database=Config.DB_NAME,
+            autocommit=True,  # Reads skip COMMIT; writes open explicit transactions
+            **wan_options
+        )
+        if Config.DB_TCP_KEEPALIVE:
+            sock = getattr(getattr(connection, '_socket', None), 'sock', None)
+            if sock is not None:
+                _enable_keepalive(sock, Config.DB_KEEPALIVE_IDLE, Config.DB_KEEPALIVE_INTERVAL)
+        return connection
+
+    def fetch_batch(self, connection, statements):
+        # One multi-statement query: a single round trip for the whole batch.
+        # mysql-connector >= 9.2 runs multi statements from a plain execute()
+        # (execute(multi=True) was removed); nextset() moves to the next result.
+        sql = ";\n".join(query.strip().rstrip(";") for query, _ in statements)
+        params = tuple(value for _, values in statements for value in (values or ()))
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            results = []
+            while True:
+                if cursor.with_rows:
+                    results.append((cursor.column_names, cursor.fetchall()))
+                if not cursor.nextset():
+                    return results
+        finally:
+            cursor.close()
+
+    def table_columns(self, cursor, table):
+        cursor.execute(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def table_indexes(self, cursor, table):
+        cursor.execute(
+            "SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX", (table,)
+        )
+        indexes = {}
+        for name, column in cursor.fetchall():
+            indexes[name] = indexes.get(name, ()) + (column,)
+        return indexes
+
+    def table_foreign_keys(self, cursor, table):
+        cursor.execute(
+            "SELECT COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL", (table,)
+        )
+        return {tuple(row) for row in cursor.fetchall()}
+
+    def explain(self, cursor, sql, params=None):
+        # type ALL = full table scan; "index" (full index scan, e.g. ORDER BY ... LIMIT) is not flagged
+        cursor.execute("EXPLAIN " + sql, params or ())
+        columns = cursor.column_names
+        steps = []
+        for row in cursor.fetchall():
+            row = dict(zip(columns, row))
+            steps.append(PlanStep(row['table'], row['type'] == 'ALL',
+                                  f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']}"))
+        return steps
+
+
+def _enable_keepalive(sock, idle, interval):
+    """Turns on TCP keepalive with the given idle time and probe interval (seconds)."""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):      # Linux
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+    elif hasattr(socket, "TCP_KEEPALIVE"):   # macOS: idle time only
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle)
+    elif hasattr(socket, "SIO_KEEPALIVE_VALS"):  # Windows
+        sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, idle * 1000, interval * 1000))
+
+
+def create_backend(name=None):
+    """Backend instance for `name` (defaults to Config.DB_BACKEND)."""
+    name = (name or Config.DB_BACKEND).lower()
+    if name == "mysql":
+        return MySQLBackend()
+    if name == "sqlite":
+        from database.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(Config.SQLITE_PATH, Config.SQLITE_SCHEMA_FILES)
+    raise ValueError(f"Unknown database backend: {name}")
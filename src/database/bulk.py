@@ -0,0 +1,133 @@
+"""
+Multi-row statement builders for bulk writes.
+
+Instead of one INSERT/UPDATE round trip per row, rows are sent in chunks:
+    INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), ...
+    INSERT ... ON DUPLICATE KEY UPDATE a = VALUES(a)
+    SELECT k FROM t WHERE k IN (...) FOR UPDATE, then
+    UPDATE t JOIN (SELECT %s AS k, %s AS a UNION ALL SELECT ...) v ON ... SET ...
+
+The functions take an open cursor, so they run inside whatever transaction
+the caller manages (BaseRepository wraps them in a session / UnitOfWork).
+"""
+
+
+def _chunks(rows, chunk_size):
+    rows = list(rows)
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+
+def _column_list(columns):
+    return ", ".join(f"`{c}`" for c in columns)
+
+
+def bulk_insert(cursor, table, columns, rows, chunk_size=500, update_columns=None,
+                id_column=None, key_column=None):
+    """
+    Inserts `rows` (sequences ordered like `columns`) with one multi-row
+    INSERT per chunk.
+
+    Args:
+        update_columns: Columns to overwrite when a row hits an existing
+            PRIMARY/UNIQUE key (INSERT ... ON DUPLICATE KEY UPDATE)
+        id_column, key_column: Generated id column and a UNIQUE column among
+            `columns`. Each chunk's ids are read back by key, one SELECT per chunk.
+
+    Returns:
+        List of generated ids in row order, when id_column / key_column are
+        given (otherwise []). The ids of a multi-row INSERT are not derived
+        from LAST_INSERT_ID(): they are not consecutive when
+        auto_increment_increment > 1 (Galera, many hosted MySQL servers).
+        Upserts return [] since updated rows get no new id.
+    """
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    base_sql = f"INSERT INTO `{table}` ({_column_list(columns)}) VALUES "
+    suffix = ""
+    if update_columns:
+        suffix = " ON DUPLICATE KEY UPDATE " + ", ".join(f"`{c}` = VALUES(`{c}`)" for c in update_columns)
+
+    resolve_ids = id_column is not None and key_column is not None and not update_columns
+    key_index = list(columns).index(key_column) if resolve_ids else None
+
+    ids = []
+    for chunk in _chunks(rows, chunk_size):
+        sql = base_sql + ", ".join([placeholders] * len(chunk)) + suffix
+        params = [value for row in chunk for value in row]
+        cursor.execute(sql, params)
+        if resolve_ids:
+            ids.extend(_ids_by_key(cursor, table, id_column, key_column, [row[key_index] for row in chunk]))
+    return ids
+
+
+def _ids_by_key(cursor, table, id_column, key_column, keys):
+    """Ids of the rows with `keys` (in that order), read on the inserting cursor's transaction."""
+    cursor.execute(
+        f"SELECT `{id_column}`, `{key_column}` FROM `{table}` WHERE `{key_column}` IN "
+        f"({', '.join(['%s'] * len(keys))})", keys
+    )
+    by_key = {key: row_id for row_id, key in cursor.fetchall()}
+    missing = [key for key in keys if key not in by_key]
+    if missing:
+        raise RuntimeError(f"Could not resolve the generated {table}.{id_column} of {missing[:5]}")
+    return [by_key[key] for key in keys]
+
+
+def bulk_update(cursor, table, key_column, columns, rows, chunk_size=500, where=None):
+    """
+    Updates many rows by primary key with one UPDATE ... JOIN per chunk.
+    Unlike an upsert, keys that do not exist are ignored, never inserted.
+
+    Each chunk first locks the target rows that exist and match `where`
+    (SELECT ... FOR UPDATE), then updates exactly those. MySQL's rowcount
+    only counts rows whose values changed, so it cannot tell which rows
+    were skipped.
+
+    Args:
+        rows: Sequences of (key, value for each of `columns`)
+        where: Optional extra SQL condition on the target table, aliased `t`
+            (e.g. "t.is_locked = 0"); rows failing it are skipped
+
+    Returns:
+        Keys of the rows updated, in row order.
+    """
+    aliases = [key_column] + list(columns)
+    select_row = "SELECT " + ", ".join(f"%s AS `{c}`" for c in aliases)
+    assignments = ", ".join(f"t.`{c}` = v.`{c}`" for c in columns)
+
+    updated = []
+    for chunk in _chunks(rows, chunk_size):
+        found = _locked_keys(cursor, table, key_column, [row[0] for row in chunk], where)
+        chunk = [row for row in chunk if row[0] in found]
+        if not chunk:
+            continue
+        derived = " UNION ALL ".join([select_row] * len(chunk))
+        sql = (f"UPDATE `{table}` t JOIN ({derived}) v ON t.`{key_column}` = v.`{key_column}` "
+               f"SET {assignments}")
+        params = [value for row in chunk for value in row]
+        cursor.execute(sql, params)
+        updated.extend(row[0] for row in chunk)
+    return updated
+
+
+def _locked_keys(cursor, table, key_column, keys, where=None):
+    """Set of `keys` whose rows exist and match `where`, locked until the caller's transaction ends."""
+    sql = (f"SELECT t.`{key_column}` FROM `{table}` t WHERE t.`{key_column}` IN "
+           f"({', '.join(['%s'] * len(keys))})")
+    if where:
+        sql += f" AND ({where})"
+    cursor.execute(sql + " FOR UPDATE", keys)
+    return {row[0] for row in cursor.fetchall()}
+
+
+def execute_many(cursor, sql, seq_params, chunk_size=500):
+    """
+    cursor.executemany() in chunks. mysql.connector rewrites an INSERT ... VALUES
+    statement into a single multi-row INSERT per call; other statements are
+    still sent one by one. Returns the number of rows affected.
+    """
+    affected = 0
+    for chunk in _chunks(seq_params, chunk_size):
+        cursor.executemany(sql, chunk)
+        affected += max(cursor.rowcount, 0)
+    return affected
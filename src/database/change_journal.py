@@ -0,0 +1,239 @@
+"""
+Append-only change journal for cross-client cache invalidation.
+
+Every desktop client talks to the same MySQL database, so a write made by one
+client leaves stale entries in the caches of all the others. Repository
+writes therefore append (table, primary key, operation) rows to
+Change_Journal (migration 5) in the same transaction, so a write and its
+entry commit or roll back together. Its AUTO_INCREMENT `version` is
+monotonically increasing.
+Each client runs a ChangePoller that fetches only the entries after the last
+version it has seen and evicts exactly the affected query-cache entries,
+cached counts and subscribed controller caches.
+
+Usage:
+    ChangePoller.start()                                     # once, after login
+    ChangePoller.subscribe(("Course_Classes",), self._on_class_change)
+"""
+import re
+import threading
+import time
+import uuid
+import weakref
+
+from config import Config
+from database.connection import DatabaseConnection
+from database.count_service import CountService
+from database.query_cache import QueryCache
+
+# Target table of INSERT / REPLACE / UPDATE / DELETE (leading "#" comment lines allowed)
+_WRITE_RE = re.compile(
+    r"^\s*(?:#[^\n]*\n\s*)*"
+    r"(?:(INSERT|REPLACE)\s+(?:IGNORE\s+)?INTO|(UPDATE)|(DELETE)\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+
+
+def parse_write(sql):
+    """(table, operation) written by a statement, or None for reads."""
+    match = _WRITE_RE.match(sql)
+    if not match:
+        return None
+    insert, update, delete, table = match.groups()
+    return table, (insert or update or delete).upper().replace("REPLACE", "INSERT")
+
+
+class ChangeJournal:
+    CLIENT_ID = uuid.uuid4().hex  # Identifies this process' own entries
+
+    @classmethod
+    def record(cls, connection, table, operation, row_ids=None):
+        """
+        Appends journal entries on `connection`, inside the writer's own
+        transaction (the caller commits). row_ids=None records a table-level change.
+        Never raises: a missing journal only delays other clients' refresh until
+        their cache TTLs expire.
+        """
+        if not Config.CHANGE_JOURNAL_ENABLED:
+            return
+        ids = list(row_ids) if row_ids else [None]
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            values = ", ".join(["(%s, %s, %s, %s)"] * len(ids))
+            params = []
+            for row_id in ids:
+                params.extend((table, row_id, operation, cls.CLIENT_ID))
+            cursor.execute(
+                f"INSERT INTO Change_Journal (table_name, row_id, operation, client_id) VALUES {values}", params
+            )
+        except Exception as e:
+            print(f"Change journal error ({table}): {e}")
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+
+class ChangePoller:
+    """Background thread that applies other clients' journal entries to the local caches."""
+    _thread = None
+    _stop = threading.Event()
+    _lock = threading.Lock()
+    _subscribers = []       # (set of lower-cased tables, weak callback)
+
+    _last_version = None
+    _gaps = {}              # version -> time.monotonic() first noticed missing
+    _applied_version = None # Published by the poller thread after applying (see version())
+    _last_prune = 0.0
+
+    # Journal versions are allocated at INSERT time but become visible at COMMIT,
+    # so a lower version can appear after a higher one. Missing versions are
+    # re-checked until they show up or GAP_TIMEOUT passes (rolled back writes).
+    GAP_TIMEOUT = 30.0
+    PRUNE_INTERVAL = 3600.0
+
+    @classmethod
+    def start(cls):
+        """Starts polling (no-op if already running or the journal is disabled)."""
+        if not Config.CHANGE_JOURNAL_ENABLED:
+            return
+        with cls._lock:
+            if cls._thread is not None and cls._thread.is_alive():
+                return
+            cls._stop.clear()
+            cls._thread = threading.Thread(target=cls._run, name="change-poller", daemon=True)
+            cls._thread.start()
+
+    @classmethod
+    def stop(cls):
+        cls._stop.set()
+
+    @classmethod
+    def subscribe(cls, tables, callback):
+        """
+        Calls callback(changes) from the poller thread whenever another client
+        changed one of `tables`. changes: list of (table, row_id or None, operation).
+        Bound methods are held weakly, so a discarded controller unsubscribes itself.
+        """
+        ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+        with cls._lock:
+            cls._subscribers.append(({t.lower() for t in tables}, ref))
+
+    @staticmethod
+    def changed_rows(changes, table, operations=None):
+        """
+        Ids of the `table` rows in `changes` (limited to `operations` if given):
+        an empty set when there are none, None when one of them cannot be
+        narrowed to a live row (a table-level entry or a DELETE).
+        Lets subscribers evict only the caches of the rows they hold.
+        """
+        ids = set()
+        for changed_table, row_id, op in changes:
+            if changed_table.lower() != table.lower() or (operations and op not in operations):
+                continue
+            if row_id is None or op == 'DELETE':
+                return None
+            ids.add(row_id)
+        return ids
+
+    @classmethod
+    def version(cls):
+        """
+        Journal version this client's caches are current at: every change up
+        to it has been applied (None before the first poll). Pending gaps
+        count as not applied yet.
+        Safe from any thread: _last_version and _gaps belong to the poller
+        thread, which publishes the result in one assignment.
+        """
+        return cls._applied_version
+
+    @classmethod
+    def _publish_version(cls):
+        """Poller thread only: called after each poll has been applied."""
+        last = cls._last_version
+        if last is not None and cls._gaps:
+            last = min(min(cls._gaps) - 1, last)
+        cls._applied_version = last
+
+    @classmethod
+    def _run(cls):
+        while not cls._stop.wait(Config.CHANGE_POLL_INTERVAL if cls._last_version is not None else 0):
+            try:
+                cls._maybe_prune()
+                # Polling is a plain read: a replica is fine, entries just arrive a little later
+                with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                    if cls._last_version is None:
+                        # Caches start empty, nothing before now needs applying
+                        cursor.execute("SELECT COALESCE(MAX(version), 0) AS version FROM Change_Journal")
+                        cls._last_version = cursor.fetchone()['version']
+                    else:
+                        cls.poll(cursor)
+                cls._publish_version()
+            except Exception as e:
+                print(f"Change poller error: {e}")
+
+    @classmethod
+    def poll(cls, cursor):
+        """Fetches the entries after the last seen version and applies them."""
+        now = time.monotonic()
+        for version, noticed in list(cls._gaps.items()):
+            if now - noticed > cls.GAP_TIMEOUT:
+                del cls._gaps[version]
+        since = min(cls._gaps) - 1 if cls._gaps else cls._last_version
+
+        cursor.execute(
+            "SELECT version, table_name, row_id, operation, client_id FROM Change_Journal "
+            "WHERE version > %s ORDER BY version", (since,)
+        )
+        changes = []
+        for row in cursor.fetchall():
+            version = row['version']
+            if version <= cls._last_version:
+                if cls._gaps.pop(version, None) is None:
+                    continue  # Already applied
+            else:
+                for missing in range(cls._last_version + 1, version):
+                    cls._gaps.setdefault(missing, now)
+                cls._last_version = version
+            if row['client_id'] != ChangeJournal.CLIENT_ID:
+                changes.append((row['table_name'], row['row_id'], row['operation']))
+        if changes:
+            cls.apply(changes)
+
+    @classmethod
+    def apply(cls, changes):
+        """Evicts the local cache entries affected by `changes`."""
+        deleted = {table for table, _, op in changes if op == 'DELETE'}
+        updated = {table for table, _, op in changes if op != 'DELETE'} - deleted
+        if deleted:
+            QueryCache.invalidate_tables(*deleted, cascade=True)
+        if updated:
+            QueryCache.invalidate_tables(*updated)
+        for table in deleted | updated:
+            CountService.invalidate(table)
+
+        changed_tables = {table.lower() for table, _, _ in changes}
+        with cls._lock:
+            # Drop subscribers whose controller has been garbage collected
+            cls._subscribers = [(tables, ref) for tables, ref in cls._subscribers if ref() is not None]
+            subscribers = list(cls._subscribers)
+        for tables, ref in subscribers:
+            callback = ref()
+            if callback is not None and tables & changed_tables:
+                try:
+                    callback([c for c in changes if c[0].lower() in tables])
+                except Exception as e:
+                    print(f"Change subscriber error: {e}")
+
+    @classmethod
+    def _maybe_prune(cls):
+        """Hourly drops entries past the retention."""
+        now = time.monotonic()
+        if cls._last_prune and now - cls._last_prune < cls.PRUNE_INTERVAL:
+            return
+        cls._last_prune = now
+        with DatabaseConnection.get_cursor(autocommit=True) as cursor:
+            cursor.execute(
+                "DELETE FROM Change_Journal WHERE changed_at < NOW() - INTERVAL %s SECOND LIMIT 10000",
+                (Config.CHANGE_JOURNAL_RETENTION,)
+            )
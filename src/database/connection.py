@@ -1,7 +1,12 @@
-import mysql.connector
-from mysql.connector import pooling
+import threading
+import time
 from contextlib import contextmanager
 from config import Config
+from database.backend import create_backend
+from database.instrumentation import InstrumentedCursor, QueryStats, RoundTrips
+from database.pool import ElasticConnectionPool
+from database.replica_router import Replica, ReplicaRouter
+from database.statement_cache import StatementCache
 
 
 class DatabaseConnection:
@@ -9,58 +14,281 @@ class DatabaseConnection:
     Manages a pool of database connections to ensure efficient reuse.
     """
     _pool = None
+    _backend = None
+
+    _pool_lock = threading.Lock()
+
+    # Read replicas (optional, Config.DB_REPLICA_HOSTS)
+    _router = None
+    _router_initialized = False
+    _last_write = threading.local()      # Per-thread time.monotonic() of the last write (see mark_write)
+    _force_primary = threading.local()   # Per-thread primary_reads() nesting depth
+
+    _unit_of_work = threading.local()    # Per-thread active UnitOfWork (see unit_of_work.py)
+
+    @classmethod
+    def get_backend(cls):
+        """The database backend selected by Config.DB_BACKEND (see database/backend.py)."""
+        if cls._backend is None:
+            with cls._pool_lock:
+                if cls._backend is None:
+                    cls._backend = create_backend()
+        return cls._backend
+
+    @classmethod
+    def use_backend(cls, backend):
+        """
+        Switches to another backend, e.g. an in-memory SQLite database in tests.
+        Connections of the previous pool are left to close on their own.
+
+        Usage:
+            DatabaseConnection.use_backend(create_backend("sqlite"))
+        """
+        with cls._pool_lock:
+            cls._backend = backend
+            cls._pool = None
+            cls._router = None
+            cls._router_initialized = False
+
+    @classmethod
+    def _connect(cls, host=None, port=None):
+        """Opens a new raw connection (to the primary unless host/port are given)."""
+        return cls.get_backend().connect(host, port)
+
+    @classmethod
+    def _create_pool(cls, name, connect, min_size):
+        return ElasticConnectionPool(
+            connect,
+            min_size=min_size,
+            max_size=Config.DB_POOL_MAX_SIZE,
+            timeout=Config.DB_POOL_TIMEOUT,
+            idle_timeout=Config.DB_POOL_IDLE_TIMEOUT,
+            ping_interval=Config.DB_POOL_PING_INTERVAL,
+            name=name,
+            autocommit=True
+        )
 
     @classmethod
     def get_pool(cls):
         """Initializes and returns the connection pool singleton."""
         if cls._pool is None:
-            try:
-                cls._pool = pooling.MySQLConnectionPool(
-                    pool_name="student_management_pool",
-                    pool_size=5,
-                    host=Config.DB_HOST,
-                    port=Config.DB_PORT,
-                    user=Config.DB_USER,
-                    password=Config.DB_PASSWORD,
-                    database=Config.DB_NAME
-                )
-            except mysql.connector.Error as err:
-                print(f"Error creating connection pool: {err}")
-                raise
+            backend = cls.get_backend()
+            with cls._pool_lock:
+                if cls._pool is None:
+                    try:
+                        cls._pool = cls._create_pool("student_management_pool", cls._connect, Config.DB_POOL_MIN_SIZE)
+                    except backend.Error as err:
+                        print(f"Error creating connection pool: {err}")
+                        raise
         return cls._pool
 
     @classmethod
-    def get_connection(cls):
-        """Gets a connection from the pool."""
+    def warm_up(cls, background=True):
+        """
+        Opens the pool's Config.DB_POOL_MIN_SIZE connections (and the replica
+        pools) ahead of the first query, so the TCP, TLS and authentication
+        handshakes do not add to the first screen's load time. main.py calls
+        this at startup in WAN mode (Config.DB_WAN_MODE).
+        Returns the warm-up thread, or None when run in the foreground.
+        """
+        def _warm_up():
+            try:
+                cls.get_pool()
+                cls.get_router()
+            except Exception as e:
+                print(f"Connection warm-up failed: {e}")
+
+        if not background:
+            _warm_up()
+            return None
+        thread = threading.Thread(target=_warm_up, name="db-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def get_router(cls):
+        """Replica router built from Config.DB_REPLICA_HOSTS, or None when no replicas are configured."""
+        if not cls._router_initialized:
+            backend = cls.get_backend()
+            with cls._pool_lock:
+                if not cls._router_initialized:
+                    hosts = ReplicaRouter.parse_hosts(Config.DB_REPLICA_HOSTS, Config.DB_PORT)
+                    if hosts and backend.supports_replicas:
+                        def pool_factory(host, port):
+                            return cls._create_pool(
+                                f"replica_pool[{host}:{port}]",
+                                lambda: cls._connect(host, port),
+                                min(1, Config.DB_POOL_MIN_SIZE)
+                            )
+                        cls._router = ReplicaRouter(
+                            [Replica(host, port, pool_factory) for host, port in hosts],
+                            max_lag=Config.DB_REPLICA_MAX_LAG,
+                            check_interval=Config.DB_REPLICA_CHECK_INTERVAL
+                        )
+                    cls._router_initialized = True
+        return cls._router
+
+    @classmethod
+    def get_connection(cls, timeout=None, readonly=False):
+        """
+        Gets a connection from the pool. Blocks in a fair queue while the pool
+        is at its maximum size and raises PoolTimeoutError after `timeout`
+        seconds (defaults to Config.DB_POOL_TIMEOUT).
+
+        readonly=True may return a replica connection (see read replicas below).
+        Any other checkout goes to the primary.
+        """
+        if readonly and not cls._reads_pinned_to_primary():
+            router = cls.get_router()
+            if router is not None:
+                connection = router.get_connection(timeout=timeout)
+                if connection is not None:
+                    return connection
+
         pool = cls.get_pool()
-        return pool.get_connection()
+        return pool.get_connection(timeout=timeout)
+
+    # --- Read-your-writes -------------------------------------------------
+    @classmethod
+    def mark_write(cls):
+        """
+        Starts the read-your-writes window of the current thread: its reads go
+        to the primary for Config.DB_READ_YOUR_WRITES_WINDOW seconds. Called by
+        the repository layer after each write (BaseRepository.invalidate_tables),
+        so other threads keep reading from the replicas.
+        """
+        cls._last_write.at = time.monotonic()
+
+    @classmethod
+    def _reads_pinned_to_primary(cls):
+        if getattr(cls._force_primary, 'depth', 0) > 0:
+            return True
+        last = getattr(cls._last_write, 'at', None)
+        return last is not None and time.monotonic() - last < Config.DB_READ_YOUR_WRITES_WINDOW
 
     @classmethod
     @contextmanager
-    def get_cursor(cls, dictionary=True):
+    def primary_reads(cls):
         """
-        A context manager to safely handle database connections, cursors, and transactions.
-        It automatically commits on success, rolls back on error, and always
-        returns the connection to the pool.
+        Forces reads on this thread to the primary, e.g. to re-read data that
+        must reflect a write made moments ago by another client.
 
         Usage:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute("UPDATE ...") # Writes are automatically committed.
+            with DatabaseConnection.primary_reads():
+                grades = grade_repo.get_by_class(class_id)
         """
+        cls._force_primary.depth = getattr(cls._force_primary, 'depth', 0) + 1
+        try:
+            yield
+        finally:
+            cls._force_primary.depth -= 1
+
+    @classmethod
+    def pool_stats(cls):
+        """Current pool size, connections in use and caller wait times."""
+        stats = cls._pool.stats() if cls._pool else {}
+        if cls._router is not None:
+            stats = dict(stats, replicas=cls._router.stats())
+        return stats
+
+    @classmethod
+    def statement_cache(cls, connection):
+        """Prepared statement cache of a pooled connection, or None if disabled in Config."""
+        if Config.DB_STATEMENT_CACHE_SIZE <= 0:
+            return None
+        return StatementCache.for_connection(connection, Config.DB_STATEMENT_CACHE_SIZE)
+
+    @classmethod
+    def statement_cache_stats(cls):
+        """Prepared statement cache hits and misses across all connections."""
+        return StatementCache.stats()
+
+    @staticmethod
+    def cursor(connection, **kwargs):
+        """
+        Cursor for hand-written statements on a checked-out connection. Each
+        execute() is timed and recorded under the calling repository method
+        (see database/instrumentation.py).
+        """
+        return InstrumentedCursor(connection.cursor(**kwargs), connection)
+
+    @staticmethod
+    def query_stats(limit=None):
+        """Per-method query latency histogram as a printable table."""
+        return QueryStats.dump(limit=limit)
+
+    @staticmethod
+    def round_trip_stats(limit=None):
+        """Round trips to the server per user action as a printable table."""
+        return RoundTrips.dump(limit=limit)
+
+    @classmethod
+    def current_unit_of_work(cls):
+        return getattr(cls._unit_of_work, 'current', None)
+
+    @classmethod
+    def _set_unit_of_work(cls, uow):
+        cls._unit_of_work.current = uow
+
+    @classmethod
+    @contextmanager
+    def session(cls, readonly=False, autocommit=False):
+        """
+        Checks out a pooled connection and manages its transaction.
+
+        Pooled connections run in autocommit mode, so a transaction is only
+        opened (START TRANSACTION ... COMMIT) for regular write blocks:
+            readonly=True   -> no transaction, no commit/rollback round trips.
+                               Each SELECT is its own read-only snapshot.
+            autocommit=True -> a single write statement that commits on its own.
+
+        Inside a UnitOfWork block the unit's connection is yielded as is: the
+        unit owns the transaction and returns the connection to the pool.
+        """
+        uow = cls.current_unit_of_work()
+        if uow is not None:
+            yield uow.connection
+            return
+
         connection = None
+        transactional = not (readonly or autocommit)
         try:
-            connection = cls.get_connection()
-            cursor = connection.cursor(dictionary=dictionary)
-            yield cursor
-            connection.commit()  # Commit transaction if block executes successfully
+            connection = cls.get_connection(readonly=readonly)
+            if transactional:
+                connection.start_transaction()
+            yield connection
+            if transactional:
+                connection.commit()  # Commit transaction if block executes successfully
         except Exception as e:
-            if connection:
+            if connection and transactional:
                 connection.rollback()  # Rollback on any error within the block
             raise e  # Re-raise the exception to the caller
         finally:
             if connection:
                 connection.close()  # This returns the connection to the pool
 
+    @classmethod
+    @contextmanager
+    def get_cursor(cls, dictionary=True, readonly=False, autocommit=False):
+        """
+        A context manager to safely handle database connections, cursors, and transactions.
+        It automatically commits on success, rolls back on error, and always
+        returns the connection to the pool. See session() for readonly/autocommit.
+
+        Usage:
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute("UPDATE ...") # Writes are automatically committed.
+
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute("SELECT ...") # No commit round trip.
+        """
+        with cls.session(readonly=readonly, autocommit=autocommit) as connection:
+            cursor = cls.cursor(connection, dictionary=dictionary)
+            try:
+                yield cursor
+            finally:
+                cursor.flush_stats()
+
 # This block allows the file to be run directly to test the database connection.
 if __name__ == "__main__":
     print("Attempting to test database connection...")
@@ -68,7 +296,7 @@ if __name__ == "__main__":
     try:
         connection = DatabaseConnection.get_connection()
         if connection.is_connected():
-            print(f"Successfully connected to database '{Config.DB_NAME}' on {Config.DB_HOST}:{Config.DB_PORT}.")
+            print(f"Successfully connected to database '{Config.DB_NAME}' on {Config.DB_HOST}:{Config.DB_PORT} ({Config.DB_BACKEND}).")
     except Exception as e:
         print(f"Failed to connect to the database. Error: {e}")
     finally:
@@ -0,0 +1,66 @@
+"""
+Total-count service for paginated admin lists.
+
+"Page X of Y" barely changes between clicks, so totals are cached per
+(entity, search term) for a short TTL instead of being recounted with every
+page. Writes that add or remove rows invalidate the entity's counts.
+"""
+from config import Config
+from utils.cache import Cache
+
+
+class CountService:
+    KEY_PREFIX = "count"
+
+    @classmethod
+    def _key(cls, entity, search_query=None):
+        return f"{cls.KEY_PREFIX}:{entity.lower()}:{search_query or ''}"
+
+    @classmethod
+    def get_count(cls, repo, search_query=None):
+        """
+        Returns the total row count of `repo`'s list (LIST_FROM + search filters).
+
+        Unfiltered counts on tables larger than Config.COUNT_ESTIMATE_THRESHOLD
+        use the InnoDB row estimate from information_schema instead of COUNT(*).
+        """
+        key = cls._key(repo.LIST_TABLE, search_query)
+        total = Cache.get(key)
+        if total is not None:
+            return total
+
+        total = None
+        if not search_query and Config.COUNT_ESTIMATE_THRESHOLD > 0:
+            estimate = cls.estimate_rows(repo, repo.LIST_TABLE)
+            if estimate is not None and estimate >= Config.COUNT_ESTIMATE_THRESHOLD:
+                total = estimate
+
+        if total is None:
+            filters, params = repo._search_filters(search_query)
+            sql = f"SELECT COUNT(*) AS total {repo.LIST_FROM}{repo._where(filters)}"
+            row = repo.execute_query(sql, tuple(params), fetch_one=True)
+            total = row['total'] if row else 0
+
+        Cache.set(key, total, Config.COUNT_CACHE_TTL)
+        return total
+
+    @staticmethod
+    def estimate_rows(repo, table):
+        """Approximate row count of a table from information_schema (None if unavailable)."""
+        if not repo.db.get_backend().supports_row_estimates:
+            return None
+        sql = """
+            SELECT TABLE_ROWS AS estimate FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """
+        try:
+            row = repo.execute_query(sql, (table,), fetch_one=True)
+            return int(row['estimate']) if row and row['estimate'] is not None else None
+        except Exception as e:
+            print(f"Error estimating row count for {table}: {e}")
+            return None
+
+    @classmethod
+    def invalidate(cls, entity):
+        """Drops every cached count (all search terms) of an entity."""
+        Cache.invalidate_prefix(f"{cls.KEY_PREFIX}:{entity.lower()}:")
@@ -0,0 +1,356 @@
+"""
+Per-query instrumentation for the repository layer.
+
+Every statement is timed and tagged "<RepositoryClass>.<method>" together with
+its row count and the time spent waiting for a pooled connection. Timings are
+aggregated into an in-process histogram per tag, and statements slower than
+Config.SLOW_QUERY_THRESHOLD_MS are written to the slow-query log with their
+parameters redacted.
+
+Round trips to the server (statements, transaction control, pings) are also
+counted per user action, i.e. per RoundTrips.action() block opened by the
+views around a screen load, which matters more than statement latency against a hosted database.
+
+Usage:
+    print(QueryStats.dump())          # Table of the hottest repository methods
+    QueryStats.snapshot()             # Same data as a dict
+    print(RoundTrips.dump())          # Round trips per user action
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from config import Config
+
+_REPOSITORIES_DIR = os.sep + "repositories" + os.sep
+_DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+slow_query_logger = logging.getLogger("database.slow_query")
+_logger_configured = False
+_logger_lock = threading.Lock()
+
+
+def _get_slow_query_logger():
+    """Attaches a handler on first use: the file in Config.SLOW_QUERY_LOG_FILE, or stderr."""
+    global _logger_configured
+    if not _logger_configured:
+        with _logger_lock:
+            if not _logger_configured:
+                if Config.SLOW_QUERY_LOG_FILE:
+                    log_dir = os.path.dirname(Config.SLOW_QUERY_LOG_FILE)
+                    if log_dir:
+                        os.makedirs(log_dir, exist_ok=True)
+                    handler = logging.FileHandler(Config.SLOW_QUERY_LOG_FILE, encoding="utf-8")
+                else:
+                    handler = logging.StreamHandler()
+                handler.setFormatter(logging.Formatter("%(asctime)s [SLOW QUERY] %(message)s"))
+                slow_query_logger.addHandler(handler)
+                slow_query_logger.setLevel(logging.WARNING)
+                slow_query_logger.propagate = False
+                _logger_configured = True
+    return slow_query_logger
+
+
+def caller_tag(default="unknown"):
+    """
+    Finds the repository method that issued the current statement by walking
+    up the stack to the first frame defined in database/repositories/.
+    Returns "<RepositoryClass>.<method>".
+    """
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _REPOSITORIES_DIR in filename:
+            owner = frame.f_locals.get('self')
+            cls_name = type(owner).__name__ if owner is not None else os.path.basename(filename)[:-3]
+            return f"{cls_name}.{frame.f_code.co_name}"
+        if fallback is None and not filename.startswith(_DATABASE_DIR):
+            fallback = frame.f_code.co_name
+        frame = frame.f_back
+    return fallback or default
+
+
+def redact_params(params):
+    """Replaces parameter values with their type (and length for strings) for logging."""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {_redact(v)}" for k, v in params.items()) + "}"
+    return "(" + ", ".join(_redact(v) for v in params) + ")"
+
+
+def _redact(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+class QueryStats:
+    """Thread-safe per-method latency histogram."""
+    # Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+    _lock = threading.Lock()
+    _methods = {}
+
+    @classmethod
+    def record(cls, tag, sql, params, elapsed, rows=0, wait=0.0):
+        """
+        Args:
+            tag: "<RepositoryClass>.<method>"
+            elapsed: Seconds spent executing the statement (and fetching its rows)
+            rows: Rows returned or affected
+            wait: Seconds the caller waited for a pooled connection
+        """
+        RoundTrips.add()
+        if not Config.QUERY_STATS_ENABLED:
+            return
+        elapsed_ms = elapsed * 1000.0
+        with cls._lock:
+            entry = cls._methods.get(tag)
+            if entry is None:
+                entry = cls._methods[tag] = {
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'wait_ms': 0.0,
+                    'buckets': [0] * (len(cls.BUCKETS_MS) + 1),
+                }
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['rows'] += rows or 0
+            entry['wait_ms'] += wait * 1000.0
+            entry['buckets'][bisect_left(cls.BUCKETS_MS, elapsed_ms)] += 1
+
+        if elapsed_ms >= Config.SLOW_QUERY_THRESHOLD_MS:
+            statement = " ".join(sql.split()) if isinstance(sql, str) else str(sql)
+            _get_slow_query_logger().warning(
+                f"{tag} took {elapsed_ms:.1f} ms (rows={rows}, conn_wait={wait * 1000.0:.1f} ms): "
+                f"{statement} params={redact_params(params)}"
+            )
+
+    @classmethod
+    def snapshot(cls):
+        """Copy of the per-method stats, with averages and approximate percentiles."""
+        with cls._lock:
+            data = {tag: dict(entry, buckets=list(entry['buckets'])) for tag, entry in cls._methods.items()}
+        for entry in data.values():
+            entry['avg_ms'] = entry['total_ms'] / entry['count'] if entry['count'] else 0.0
+            entry['p50_ms'] = cls._percentile(entry['buckets'], entry['count'], 0.50)
+            entry['p95_ms'] = cls._percentile(entry['buckets'], entry['count'], 0.95)
+        return data
+
+    @classmethod
+    def _percentile(cls, buckets, count, fraction):
+        """Upper bound of the bucket containing the given percentile (None = above the last bound)."""
+        if not count:
+            return 0.0
+        target = fraction * count
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= target:
+                return cls.BUCKETS_MS[i] if i < len(cls.BUCKETS_MS) else None
+        return None
+
+    @classmethod
+    def dump(cls, sort_by='total_ms', limit=None):
+        """Formats the stats as a text table, most expensive methods first."""
+        rows = sorted(cls.snapshot().items(), key=lambda item: item[1][sort_by], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        lines = [f"{'METHOD':<50} {'CALLS':>7} {'TOTAL ms':>10} {'AVG ms':>8} {'P95 ms':>8} {'MAX ms':>8} {'ROWS':>8} {'WAIT ms':>8}"]
+        for tag, e in rows:
+            p95 = f">{cls.BUCKETS_MS[-1]}" if e['p95_ms'] is None else str(e['p95_ms'])
+            lines.append(
+                f"{tag:<50} {e['count']:>7} {e['total_ms']:>10.1f} {e['avg_ms']:>8.2f} {p95:>8} "
+                f"{e['max_ms']:>8.1f} {e['rows']:>8} {e['wait_ms']:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._methods.clear()
+
+
+class RoundTrips:
+    """
+    Counts round trips to the database server per user action.
+
+    A user action is a block of work on one thread, e.g. loading a screen,
+    opened by its caller with RoundTrips.action() (see the dashboard views).
+    Nested actions also count towards the enclosing one. Round trips made outside any action are not counted.
+    """
+    _lock = threading.Lock()
+    _actions = {}
+    _current = threading.local()  # Counter of the innermost action on this thread
+
+    @classmethod
+    def add(cls, count=1):
+        """Counts `count` round trips towards the current thread's action."""
+        counter = getattr(cls._current, 'counter', None)
+        if counter is not None:
+            counter[0] += count
+
+    @classmethod
+    @contextmanager
+    def action(cls, name):
+        """
+        Usage:
+            with RoundTrips.action("StudentDashboard.load"):
+                data = controller.get_dashboard_academic_summary()
+        """
+        outer = getattr(cls._current, 'counter', None)
+        counter = cls._current.counter = [0]
+        try:
+            yield counter
+        finally:
+            cls._current.counter = outer
+            if outer is not None:
+                outer[0] += counter[0]
+            cls._record(name, counter[0])
+
+    @classmethod
+    def _record(cls, name, trips):
+        if not Config.QUERY_STATS_ENABLED:
+            return
+        with cls._lock:
+            entry = cls._actions.get(name)
+            if entry is None:
+                entry = cls._actions[name] = {'count': 0, 'trips': 0, 'max': 0, 'last': 0}
+            entry['count'] += 1
+            entry['trips'] += trips
+            entry['max'] = max(entry['max'], trips)
+            entry['last'] = trips
+
+    @classmethod
+    def snapshot(cls):
+        with cls._lock:
+            data = {name: dict(entry) for name, entry in cls._actions.items()}
+        for entry in data.values():
+            entry['avg'] = entry['trips'] / entry['count'] if entry['count'] else 0.0
+        return data
+
+    @classmethod
+    def dump(cls, limit=None):
+        """Formats the counters as a text table, chattiest actions first."""
+        rows = sorted(cls.snapshot().items(), key=lambda item: item[1]['avg'], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        lines = [f"{'ACTION':<60} {'CALLS':>7} {'AVG TRIPS':>10} {'MAX':>6} {'LAST':>6}"]
+        for name, e in rows:
+            lines.append(f"{name:<60} {e['count']:>7} {e['avg']:>10.1f} {e['max']:>6} {e['last']:>6}")
+        return "\n".join(lines)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._actions.clear()
+
+
+class InstrumentedCursor:
+    """
+    Cursor proxy used by the hand-written cursor paths (get_cursor and manual
+    transactions). Times execute()/executemany() and records them under the
+    calling repository method.
+
+    rowcount is -1 right after an unbuffered SELECT, so a statement with a
+    result set is recorded once its rows are read: when a fetch finds the end,
+    or at the next execute(), close() or flush_stats(). Rows are counted as they are fetched
+    and the fetch time is added to the statement's. Other statements are
+    recorded at once with their affected row count.
+    """
+
+    def __init__(self, cursor, connection):
+        self._cursor = cursor
+        self._connection = connection
+        self._wait_reported = False
+        self._pending = None  # [tag, operation, params, elapsed, rows, wait] of an unread result set
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def _wait(self):
+        # Attribute the connection wait to the first statement only
+        if self._wait_reported:
+            return 0.0
+        self._wait_reported = True
+        return getattr(self._connection, 'wait_time', 0.0)
+
+    def flush_stats(self):
+        """Records a statement whose result set was left partly unread."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            QueryStats.record(*pending)
+
+    def _executed(self, operation, params, elapsed):
+        if self._cursor.description is not None:
+            self._pending = [caller_tag(), operation, params, elapsed, 0, self._wait()]
+        else:
+            QueryStats.record(caller_tag(), operation, params, elapsed,
+                              max(self._cursor.rowcount or 0, 0), self._wait())
+
+    def _fetched(self, start, rows, exhausted):
+        pending = self._pending
+        if pending is not None:
+            pending[3] += time.perf_counter() - start
+            pending[4] += rows
+            if exhausted:
+                self.flush_stats()
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self.flush_stats()
+        start = time.perf_counter()
+        try:
+            result = self._cursor.execute(operation, params, *args, **kwargs)
+        except Exception:
+            QueryStats.record(caller_tag(), operation, params, time.perf_counter() - start, 0, self._wait())
+            raise
+        self._executed(operation, params, time.perf_counter() - start)
+        return result
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self.flush_stats()
+        start = time.perf_counter()
+        try:
+            result = self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        except Exception:
+            QueryStats.record(caller_tag(), operation, None, time.perf_counter() - start, 0, self._wait())
+            raise
+        self._executed(operation, None, time.perf_counter() - start)
+        return result
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, 0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, size=1):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._fetched(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, len(rows), True)
+        return rows
+
+    def close(self):
+        self.flush_stats()
+        return self._cursor.close()
@@ -0,0 +1,303 @@
+"""
+Versioned, idempotent schema migrations.
+
+Each Migration is applied once and recorded in Schema_Migrations. Steps check
+the live schema before changing it, so a half-applied migration (MySQL DDL
+commits on its own) or a database prepared by hand with
+docs/sql_script/*.sql is simply completed on the next run:
+    CreateTable - skipped if the table exists
+    AddColumn  - skipped if the column exists
+    AddIndex   - skipped if an index with the same name exists, or one whose
+                 leading columns already cover the new one (e.g. the index
+                 InnoDB creates for a foreign key)
+    DeleteOrphans - skipped if no row references a missing parent row
+    AddForeignKey - skipped if the column already references the same column
+
+Usage:
+    cd src && python -m database.migrations      # apply pending migrations
+    MigrationRunner.apply()                      # same, from code
+
+New migrations go at the end of MIGRATIONS with the next version number;
+applied migrations must not be edited.
+"""
+from collections import namedtuple
+
+from config import Config
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS Schema_Migrations (
+        version INT PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+Migration = namedtuple("Migration", "version description steps")
+
+
+class CreateTable:
+    def __init__(self, table, definition):
+        self.table = table
+        self.definition = definition
+
+    def is_applied(self, backend, cursor):
+        return bool(backend.table_columns(cursor, self.table))
+
+    def sql(self):
+        return f"CREATE TABLE {self.table} ({self.definition})"
+
+
+class AddColumn:
+    def __init__(self, table, column, definition):
+        self.table = table
+        self.column = column
+        self.definition = definition
+
+    def is_applied(self, backend, cursor):
+        return self.column in backend.table_columns(cursor, self.table)
+
+    def sql(self):
+        return f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.definition}"
+
+
+class AddIndex:
+    def __init__(self, table, name, columns, unique=False):
+        self.table = table
+        self.name = name
+        self.columns = tuple(columns)
+        self.unique = unique
+
+    def is_applied(self, backend, cursor):
+        indexes = backend.table_indexes(cursor, self.table)
+        if self.name in indexes:
+            return True
+        # Non-unique indexes are redundant when another index starts with the same columns
+        return not self.unique and any(
+            existing[:len(self.columns)] == self.columns for existing in indexes.values()
+        )
+
+    def sql(self):
+        unique = "UNIQUE " if self.unique else ""
+        return f"CREATE {unique}INDEX {self.name} ON {self.table} ({', '.join(self.columns)})"
+
+
+class DeleteOrphans:
+    """Deletes rows whose `column` points at a missing parent row, so a foreign key can be added."""
+    def __init__(self, table, column, ref_table, ref_column):
+        self.table = table
+        self.column = column
+        self.ref_table = ref_table
+        self.ref_column = ref_column
+
+    def _where(self):
+        return (f"{self.column} IS NOT NULL AND NOT EXISTS "
+                f"(SELECT 1 FROM {self.ref_table} p WHERE p.{self.ref_column} = {self.table}.{self.column})")
+
+    def is_applied(self, backend, cursor):
+        cursor.execute(f"SELECT COUNT(*) FROM {self.table} WHERE {self._where()}")
+        return cursor.fetchone()[0] == 0
+
+    def sql(self):
+        return f"DELETE FROM {self.table} WHERE {self._where()}"
+
+
+class AddForeignKey:
+    def __init__(self, table, name, column, ref_table, ref_column, on_delete):
+        self.table = table
+        self.name = name
+        self.column = column
+        self.ref_table = ref_table
+        self.ref_column = ref_column
+        self.on_delete = on_delete
+
+    def is_applied(self, backend, cursor):
+        return (self.column, self.ref_table, self.ref_column) in backend.table_foreign_keys(cursor, self.table)
+
+    def sql(self):
+        return (f"ALTER TABLE {self.table} ADD CONSTRAINT {self.name} FOREIGN KEY ({self.column}) "
+                f"REFERENCES {self.ref_table}({self.ref_column}) ON DELETE {self.on_delete}")
+
+
+MIGRATIONS = [
+    Migration(1, "User profile and notification columns", [
+        # Previously docs/sql_script/reset_passwordtoken.sql and update_address.sql
+        AddColumn("Users", "reset_token", "VARCHAR(255) NULL"),
+        AddColumn("Users", "reset_token_expiry", "DATETIME NULL"),
+        AddColumn("Users", "address", "VARCHAR(255) NULL"),
+        AddColumn("Users", "dob", "DATE NULL"),
+        # Personal notifications (AnnouncementRepository.add_notification)
+        AddColumn("Announcements", "user_id", "INT NULL"),
+    ]),
+    Migration(2, "Baseline indexes (docs/sql_script/optimize_indexes.sql)", [
+        AddIndex("Students", "idx_student_code", ["student_code"]),
+        AddIndex("Students", "idx_student_dept", ["dept_id"]),
+        AddIndex("Students", "idx_student_user", ["user_id"]),
+        AddIndex("Users", "idx_user_email", ["email"]),
+        AddIndex("Users", "idx_user_username", ["username"]),
+        AddIndex("Users", "idx_user_role", ["role"]),
+        AddIndex("Course_Classes", "idx_class_course", ["course_id"]),
+        AddIndex("Course_Classes", "idx_class_lecturer", ["lecturer_id"]),
+        AddIndex("Course_Classes", "idx_class_semester", ["semester_id"]),
+        AddIndex("Grades", "idx_grade_student", ["student_id"]),
+        AddIndex("Grades", "idx_grade_class", ["class_id"]),
+        AddIndex("Announcements", "idx_ann_date", ["created_date"]),
+    ]),
+    Migration(3, "Composite indexes for enrollment lookups and personal notifications", [
+        # GradeRepository.get_id_by_enrollment: WHERE student_id = ? AND class_id = ?
+        AddIndex("Grades", "idx_grade_enrollment", ["student_id", "class_id"]),
+        # AnnouncementRepository.get_recent: WHERE user_id ... ORDER BY created_date DESC LIMIT n
+        AddIndex("Announcements", "idx_ann_user_date", ["user_id", "created_date"]),
+    ]),
+    Migration(4, "Archive tables for closed semesters", [
+        # Same columns, in the same order, as the hot tables (plus archived_at) so
+        # reads can UNION ALL both: a later migration adding a column to Grades or
+        # Course_Classes must add it here too. Archived grades reference the
+        # archived class rows moved with them.
+        CreateTable("Archived_Course_Classes", """
+            class_id INT PRIMARY KEY,
+            course_id INT NOT NULL,
+            lecturer_id INT,
+            semester_id INT NOT NULL,
+            room VARCHAR(20),
+            schedule VARCHAR(100),
+            max_capacity INT DEFAULT 50,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_arch_class_semester (semester_id),
+            FOREIGN KEY (course_id) REFERENCES Courses(course_id) ON DELETE CASCADE,
+            FOREIGN KEY (lecturer_id) REFERENCES Lecturers(lecturer_id) ON DELETE SET NULL,
+            FOREIGN KEY (semester_id) REFERENCES Semesters(semester_id) ON DELETE CASCADE
+        """),
+        CreateTable("Archived_Grades", """
+            grade_id INT PRIMARY KEY,
+            student_id INT NOT NULL,
+            class_id INT NOT NULL,
+            attendance_score DECIMAL(4,2),
+            midterm DECIMAL(4,2),
+            final DECIMAL(4,2),
+            total DECIMAL(4,2),
+            letter_grade VARCHAR(2),
+            updated_at DATETIME,
+            is_locked BOOLEAN DEFAULT FALSE,
+            INDEX idx_arch_grade_enrollment (student_id, class_id),
+            INDEX idx_arch_grade_class (class_id),
+            FOREIGN KEY (student_id) REFERENCES Students(student_id) ON DELETE CASCADE,
+            FOREIGN KEY (class_id) REFERENCES Archived_Course_Classes(class_id) ON DELETE CASCADE
+        """),
+    ]),
+    Migration(5, "Change journal for cross-client cache invalidation", [
+        # Appended to in the writer's own transaction, see database/change_journal.py
+        CreateTable("Change_Journal", """
+            version BIGINT AUTO_INCREMENT PRIMARY KEY,
+            table_name VARCHAR(64) NOT NULL,
+            row_id BIGINT NULL,
+            operation VARCHAR(10) NOT NULL,
+            client_id CHAR(32) NOT NULL,
+            changed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_journal_changed_at (changed_at)
+        """),
+    ]),
+    Migration(6, "Foreign key from personal notifications to their recipient", [
+        # Migration 1 added Announcements.user_id without the key schema.sql declares;
+        # notifications of users deleted since then are dropped, as the cascade would have
+        DeleteOrphans("Announcements", "user_id", "Users", "user_id"),
+        AddForeignKey("Announcements", "fk_ann_user", "user_id", "Users", "user_id", on_delete="CASCADE"),
+    ]),
+]
+
+
+class MigrationRunner:
+    @classmethod
+    def applied_versions(cls, cursor):
+        cursor.execute(CREATE_TABLE_SQL)
+        cursor.execute("SELECT version FROM Schema_Migrations")
+        return {row[0] for row in cursor.fetchall()}
+
+    @classmethod
+    def pending(cls):
+        """Migrations not yet applied to the configured database, in version order."""
+        from database.connection import DatabaseConnection
+        connection = DatabaseConnection.get_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                done = cls.applied_versions(cursor)
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+        return [m for m in sorted(MIGRATIONS, key=lambda m: m.version) if m.version not in done]
+
+    @classmethod
+    def ensure_current(cls):
+        """
+        Startup check (main.py): raises RuntimeError naming the pending
+        migrations, or applies them when Config.DB_AUTO_MIGRATE is on. Transcript and schedule reads need the archive tables of
+        migration 4 and, with Config.CHANGE_JOURNAL_ENABLED, every write the
+        change journal of migration 5, so the app must not start on an older
+        schema.
+        """
+        if Config.DB_AUTO_MIGRATE:
+            return cls.apply()
+        pending = cls.pending()
+        if pending:
+            names = ", ".join(f"{m.version} ({m.description})" for m in pending)
+            raise RuntimeError(
+                f"Database schema is out of date, pending migration(s): {names}. "
+                f"Run 'cd src && python -m database.migrations' or set DB_AUTO_MIGRATE=1."
+            )
+        return []
+
+    @classmethod
+    def apply(cls, connection=None, backend=None, migrations=None):
+        """
+        Applies every pending migration in version order. Uses `connection`
+        (a raw or pooled connection in autocommit mode) or checks one out,
+        and `backend` or the configured one. Returns the list of versions
+        applied by this call.
+        """
+        from database.connection import DatabaseConnection
+        if backend is None:
+            backend = DatabaseConnection.get_backend()
+        if connection is None:
+            connection = DatabaseConnection.get_connection()
+            try:
+                return cls.apply(connection, backend, migrations)
+            finally:
+                connection.close()
+
+        cursor = connection.cursor()
+        applied = []
+        try:
+            done = cls.applied_versions(cursor)
+            for migration in sorted(migrations or MIGRATIONS, key=lambda m: m.version):
+                if migration.version in done:
+                    continue
+                for step in migration.steps:
+                    cls._apply_step(backend, cursor, step)
+                cursor.execute(
+                    "INSERT IGNORE INTO Schema_Migrations (version, description) VALUES (%s, %s)",
+                    (migration.version, migration.description)
+                )
+                applied.append(migration.version)
+        finally:
+            cursor.close()
+        return applied
+
+    @staticmethod
+    def _apply_step(backend, cursor, step):
+        if step.is_applied(backend, cursor):
+            return
+        try:
+            cursor.execute(step.sql())
+        except backend.Error:
+            # Another client may have applied the same step meanwhile
+            if not step.is_applied(backend, cursor):
+                raise
+
+
+if __name__ == "__main__":
+    versions = MigrationRunner.apply()
+    descriptions = {m.version: m.description for m in MIGRATIONS}
+    for version in versions:
+        print(f"Applied migration {version}: {descriptions[version]}")
+    print(f"{len(versions)} migration(s) applied to '{Config.DB_NAME}' ({Config.DB_BACKEND}).")
@@ -0,0 +1,270 @@
+"""
+Optional on-disk second tier of the query cache for reference data.
+
+Every launch otherwise starts with an empty Cache, so the first visit to the
+Courses or Classes screens (or a dialog with a department / semester picker)
+reads the same reference rows again. With Config.PERSISTENT_CACHE_PATH set,
+cached reads that touch only Config.PERSISTENT_CACHE_TABLES are also written
+to a local SQLite file, each with the Change_Journal version it is known to
+be current at (see ChangePoller.version).
+
+At startup the file is loaded into the query cache, then a background thread
+asks the server which tables changed after the oldest stored version, one
+range scan on the journal's primary key, and drops the entries those changes
+make stale. While the app runs, every query-cache invalidation also removes
+the entries from disk.
+
+Entries older than half of Config.CHANGE_JOURNAL_RETENTION are not loaded:
+the journal rows that would prove them current may have been pruned.
+
+Values are stored as JSON, never pickled: the file's location comes from the
+environment, and unpickling a file someone else can write runs their code.
+Tuples, dates, times and Decimals are tagged so they load back as the same
+types the database driver returned (see _to_json).
+
+Usage:
+    PersistentCache.start()       # main.py, when PERSISTENT_CACHE_PATH is set
+"""
+import base64
+import datetime
+import decimal
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import Config
+from database.change_journal import ChangePoller
+from database.connection import DatabaseConnection
+from database.query_cache import QueryCache, _with_dependents, tables_in
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        cache_key TEXT PRIMARY KEY,
+        query TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        stored_at REAL NOT NULL,
+        value TEXT NOT NULL
+    )
+"""
+
+
+def _to_json(value):
+    """Query cache value -> JSON-compatible structure; tuples and driver types become {"__t": type, "v": ...}."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise TypeError("Only dictionaries with string keys can be stored")
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, tuple):
+        return {"__t": "tuple", "v": [_to_json(v) for v in value]}
+    if isinstance(value, datetime.datetime):  # Before date: datetime is a date subclass
+        return {"__t": "datetime", "v": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__t": "date", "v": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"__t": "time", "v": value.isoformat()}
+    if isinstance(value, datetime.timedelta):  # MySQL TIME columns
+        return {"__t": "timedelta", "v": [value.days, value.seconds, value.microseconds]}
+    if isinstance(value, decimal.Decimal):
+        return {"__t": "decimal", "v": str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"__t": "bytes", "v": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Cannot store a {type(value).__name__} in the persistent cache")
+
+
+_DECODERS = {
+    "tuple": tuple,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "timedelta": lambda v: datetime.timedelta(days=v[0], seconds=v[1], microseconds=v[2]),
+    "decimal": decimal.Decimal,
+    "bytes": base64.b64decode,
+}
+
+
+def _from_json_object(obj):
+    """json.loads object_hook: restores the values tagged by _to_json."""
+    if len(obj) == 2 and obj.get("__t") in _DECODERS and "v" in obj:
+        return _DECODERS[obj["__t"]](obj["v"])
+    return obj
+
+
+def _dumps(value):
+    return json.dumps(_to_json(value), separators=(",", ":"))
+
+
+def _loads(text):
+    return json.loads(text, object_hook=_from_json_object)
+
+
+class PersistentCache:
+    FORMAT = 2  # Bump when the stored value format changes; older files are discarded (1 = pickle)
+
+    _connection = None
+    _lock = threading.Lock()
+    _keys = set()       # Keys currently on disk
+    _tables = frozenset()
+
+    @classmethod
+    def open(cls, path=None):
+        """Opens (or creates) the cache file and hooks it into QueryCache. Returns False when disabled."""
+        path = path or Config.PERSISTENT_CACHE_PATH
+        if not path or not Config.CHANGE_JOURNAL_ENABLED:
+            return False
+        with cls._lock:
+            if cls._connection is None:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+                if connection.execute("PRAGMA user_version").fetchone()[0] != cls.FORMAT:
+                    connection.execute("DROP TABLE IF EXISTS cache_entries")
+                    connection.execute(f"PRAGMA user_version = {cls.FORMAT}")
+                connection.execute(CREATE_TABLE_SQL)
+                cls._connection = connection
+                cls._tables = frozenset(t.strip().lower() for t in Config.PERSISTENT_CACHE_TABLES.split(",") if t.strip())
+                cls._keys = {row[0] for row in connection.execute("SELECT cache_key FROM cache_entries")}
+        QueryCache.persistent = cls
+        return True
+
+    @classmethod
+    def close(cls):
+        QueryCache.persistent = None
+        with cls._lock:
+            if cls._connection is not None:
+                cls._connection.close()
+                cls._connection = None
+            cls._keys = set()
+
+    @classmethod
+    def start(cls, background=True):
+        """
+        open(), warm() and revalidate() (in a daemon thread unless
+        background=False). Returns the thread, or None.
+        """
+        if not cls.open():
+            return None
+        cls.warm()
+        if not background:
+            cls.revalidate()
+            return None
+        thread = threading.Thread(target=cls.revalidate, name="persistent-cache", daemon=True)
+        thread.start()
+        return thread
+
+    # --- QueryCache hooks ----------------------------------------------------
+    @classmethod
+    def version(cls):
+        """Journal version a read starting now will be at least as new as (None = unknown)."""
+        return ChangePoller.version()
+
+    @classmethod
+    def store(cls, key, sql, value, version):
+        """Writes a cached read to disk if it only touches persistent tables."""
+        tables = tables_in(sql)
+        if version is None or value is None or not tables or not tables <= cls._tables:
+            return
+        try:
+            text = _dumps(value)
+            with cls._lock:
+                if cls._connection is None:
+                    return
+                cls._connection.execute(
+                    "INSERT OR REPLACE INTO cache_entries (cache_key, query, version, stored_at, value) "
+                    "VALUES (?, ?, ?, ?, ?)", (key, sql, version, time.time(), text)
+                )
+                cls._keys.add(key)
+        except Exception as e:
+            print(f"Persistent cache write error: {e}")
+
+    @classmethod
+    def discard(cls, keys):
+        """Removes invalidated entries from disk (no I/O for keys that were never stored)."""
+        with cls._lock:
+            keys = [key for key in keys if key in cls._keys]
+            if not keys or cls._connection is None:
+                return
+            try:
+                cls._connection.executemany("DELETE FROM cache_entries WHERE cache_key = ?", [(k,) for k in keys])
+                cls._keys.difference_update(keys)
+            except Exception as e:
+                print(f"Persistent cache write error: {e}")
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            if cls._connection is not None:
+                cls._connection.execute("DELETE FROM cache_entries")
+            cls._keys = set()
+
+    # --- Startup ---------------------------------------------------------------
+    @classmethod
+    def _entries(cls):
+        with cls._lock:
+            if cls._connection is None:
+                return []
+            return cls._connection.execute(
+                "SELECT cache_key, query, version, stored_at, value FROM cache_entries"
+            ).fetchall()
+
+    @classmethod
+    def warm(cls):
+        """Loads the stored entries into the query cache. Returns how many were loaded."""
+        oldest = time.time() - Config.CHANGE_JOURNAL_RETENTION / 2
+        loaded, expired = 0, []
+        for key, sql, _, stored_at, text in cls._entries():
+            if stored_at < oldest:
+                expired.append(key)
+                continue
+            try:
+                value = _loads(text)
+            except Exception:
+                expired.append(key)
+                continue
+            QueryCache.set(key, sql, value, Config.QUERY_CACHE_TTL)  # version=None: not written back
+            loaded += 1
+        cls.discard(expired)
+        return loaded
+
+    @classmethod
+    def revalidate(cls):
+        """
+        Drops the stored entries (on disk and in memory) whose tables changed
+        after their version. Returns the number of entries dropped.
+        """
+        entries = [(key, sql, version) for key, sql, version, _, _ in cls._entries()]
+        if not entries:
+            return 0
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                # Range scan on the primary key from the oldest stored version
+                cursor.execute(
+                    "SELECT table_name, operation, MAX(version) AS version FROM Change_Journal "
+                    "WHERE version > %s GROUP BY table_name, operation",
+                    (min(version for _, _, version in entries),)
+                )
+                changes = cursor.fetchall()
+        except Exception as e:
+            # Keep serving the warmed entries; the change poller and TTLs still apply
+            print(f"Persistent cache revalidation error: {e}")
+            return 0
+
+        latest = {}  # table -> newest version that changed its rows
+        for row in changes:
+            tables = {row['table_name'].lower()}
+            if row['operation'] == 'DELETE':
+                tables = _with_dependents(tables)  # ON DELETE CASCADE / SET NULL
+            for table in tables:
+                latest[table] = max(latest.get(table, 0), row['version'])
+
+        stale = [key for key, sql, version in entries
+                 if any(latest.get(table, 0) > version for table in tables_in(sql))]
+        if stale:
+            QueryCache.invalidate_keys(stale)  # Also discards them here
+        return len(stale)
@@ -0,0 +1,78 @@
+"""
+Checks the query plans of hot repository reads for full table scans.
+
+Every repository lists its hot reads in PLAN_CHECKS as (method name, sample
+args). The check calls each of them with BaseRepository._explain_plans set,
+so execute_query/execute_iter run EXPLAIN instead of the statement, and
+reports every table the optimizer would read in full.
+
+Usage:
+    cd src && python -m database.plan_check                     # configured database
+    cd src && DB_BACKEND=sqlite python -m database.plan_check   # fresh schema + migrations
+
+Run it against a seeded database: on near-empty tables MySQL prefers a full
+scan over any index, which would be reported as a failure.
+Exits with status 1 if any check reads a table in full.
+"""
+import importlib
+import pkgutil
+import sys
+
+from config import Config
+from database import repositories
+from database.query_cache import QueryCache
+from database.repository import BaseRepository
+
+
+def _repository_classes():
+    for module in pkgutil.iter_modules(repositories.__path__):
+        importlib.import_module(f"{repositories.__name__}.{module.name}")
+    found = []
+    pending = list(BaseRepository.__subclasses__())
+    while pending:
+        cls = pending.pop(0)
+        found.append(cls)
+        pending.extend(cls.__subclasses__())
+    return sorted(found, key=lambda cls: cls.__name__)
+
+
+def run_checks():
+    """Returns [(check name, sql, [PlanStep, ...]), ...] for every registered hot read."""
+    results = []
+    QueryCache.clear()  # Cached reads would return without reaching execute_query
+    try:
+        for cls in _repository_classes():
+            repo = cls()
+            for method, args in cls.PLAN_CHECKS:
+                plans = BaseRepository._explain_plans.plans = []
+                getattr(repo, method)(*args)
+                name = f"{cls.__name__}.{method}{args!r}"
+                for _, sql, steps in plans:
+                    results.append((name, sql, steps))
+    finally:
+        BaseRepository._explain_plans.plans = None
+        QueryCache.clear()
+    return results
+
+
+def report(results):
+    """Prints one line per checked statement; returns the number of statements with a full scan."""
+    failures = 0
+    for name, sql, steps in results:
+        scans = [step for step in steps if step.full_scan]
+        if scans:
+            failures += 1
+            print(f"FULL SCAN  {name}: {', '.join(step.table for step in scans)}")
+            print("    " + " ".join(sql.split()))
+            for step in steps:
+                print(f"    - {step.detail}")
+        else:
+            print(f"OK         {name}")
+    return failures
+
+
+if __name__ == "__main__":
+    results = run_checks()
+    failures = report(results)
+    print(f"{len(results)} statement(s) checked on '{Config.DB_NAME}' ({Config.DB_BACKEND}), {failures} with full table scans.")
+    sys.exit(1 if failures else 0)
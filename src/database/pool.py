@@ -0,0 +1,354 @@
+"""
+Elastic connection pool with a fair wait queue and idle reaping.
+
+Replaces mysql.connector.pooling.MySQLConnectionPool, which has a fixed size
+and raises PoolError as soon as every connection is checked out.
+"""
+import threading
+import time
+from collections import deque
+
+from mysql.connector.errors import PoolError
+
+from database.instrumentation import RoundTrips
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection became available within the checkout timeout."""
+    pass
+
+
+class PooledConnection:
+    """
+    Thin proxy around a raw connection. Everything is delegated to the raw
+    connection except close(), which returns it to the pool instead.
+    Transaction control is counted as round trips (see instrumentation.py).
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._checked_out = False
+        self.last_used = time.monotonic()
+        self.wait_time = 0.0  # Seconds the last caller waited to get this connection
+        self._autocommit = pool.autocommit
+        self.statement_cache = None  # Prepared statements bound to this connection (see statement_cache.py)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    @property
+    def autocommit(self):
+        # Tracked locally: reading it from mysql.connector costs a round trip
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        self._raw.autocommit = value
+        self._autocommit = value
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def start_transaction(self, *args, **kwargs):
+        RoundTrips.add()
+        return self._raw.start_transaction(*args, **kwargs)
+
+    def commit(self):
+        RoundTrips.add()
+        return self._raw.commit()
+
+    def rollback(self):
+        RoundTrips.add()
+        return self._raw.rollback()
+
+    def close(self):
+        """Returns the connection to the pool (safe to call twice)."""
+        if self._checked_out:
+            self._pool._release(self)
+
+
+class _Waiter:
+    __slots__ = ("event", "conn", "cancelled")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+        self.cancelled = False  # Timed out; set under the pool lock
+
+
+class ElasticConnectionPool:
+    """
+    Grows from min_size up to max_size on demand. When every connection is in
+    use, callers queue up (first come, first served) and wait up to `timeout`
+    seconds for one to be released. Connections idle for longer than
+    `idle_timeout` are closed, but the pool never shrinks below min_size.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=10.0,
+                 idle_timeout=300.0, ping_interval=30.0, name="pool", autocommit=False):
+        """
+        Args:
+            connect: Zero-argument callable returning a new raw connection
+            min_size: Connections kept open even when idle
+            max_size: Hard upper bound on open connections
+            timeout: Default seconds a caller waits in the queue
+            idle_timeout: Seconds before a surplus idle connection is closed
+            ping_interval: Ping connections idle for longer than this before use (0 = always)
+            name: Label used in log messages and stats
+            autocommit: Autocommit mode `connect` opens connections in; restored on release
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds: min={min_size}, max={max_size}")
+
+        self.name = name
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.autocommit = autocommit
+
+        self._lock = threading.Lock()
+        self._idle = deque()      # Most recently used on the right
+        self._waiters = deque()   # FIFO queue of _Waiter
+        self._size = 0            # Open connections (idle + in use + being created)
+        self._in_use = 0
+        self._last_reap = time.monotonic()
+
+        # Statistics
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._created = 0
+        self._reaped = 0
+
+        for _ in range(min_size):
+            self._size += 1
+            try:
+                self._idle.append(self._new_connection())
+            except Exception:
+                self._size -= 1
+                raise
+
+    # ------------------------------------------------------------------
+    # Checkout / release
+    # ------------------------------------------------------------------
+    def get_connection(self, timeout=None):
+        """
+        Checks out a connection, waiting in line if the pool is at max_size.
+        Raises PoolTimeoutError if none is released within `timeout` seconds.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        self._maybe_reap()
+
+        waiter = None
+        pooled = None
+        create = False
+        with self._lock:
+            # Only skip the queue if nobody is already waiting (fairness)
+            if self._idle and not self._waiters:
+                pooled = self._idle.pop()
+            elif self._size < self.max_size and not self._waiters:
+                self._size += 1
+                create = True
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+
+        if create:
+            try:
+                pooled = self._new_connection()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                raise
+
+        if waiter is not None:
+            waiter.event.wait(timeout)
+            with self._lock:
+                if waiter.conn is None:
+                    # Timed out before anyone handed us a connection. A replacement
+                    # being opened for us (already dequeued) goes to the next caller
+                    waiter.cancelled = True
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"[{self.name}] No connection available after {timeout:.1f}s "
+                        f"(size={self._size}, max={self.max_size}, waiting={len(self._waiters)})"
+                    )
+                pooled = waiter.conn
+
+        pooled = self._validate(pooled)
+        waited = time.monotonic() - start
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            if waiter is not None:
+                self._waits += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        pooled.wait_time = waited
+        pooled._checked_out = True
+        return pooled
+
+    def _release(self, pooled):
+        pooled._checked_out = False
+        pooled.last_used = time.monotonic()
+
+        healthy = True
+        try:
+            # Drain a result set a caller left unread (cursor not fully fetched or
+            # not closed), otherwise the next caller's statement fails with
+            # "Unread result found"
+            if getattr(pooled.raw, 'unread_result', False):
+                pooled.raw.consume_results()
+            # Never hand a half-finished transaction to the next caller
+            if pooled.raw.in_transaction:
+                pooled.raw.rollback()
+            if pooled.autocommit != self.autocommit:
+                pooled.autocommit = self.autocommit
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            self._in_use -= 1
+            if not healthy:
+                self._size -= 1
+            elif self._waiters:
+                # Hand over directly to the longest waiting caller
+                waiter = self._waiters.popleft()
+                waiter.conn = pooled
+                waiter.event.set()
+                return
+            else:
+                self._idle.append(pooled)
+                return
+
+        # Unhealthy connection dropped: a waiter may now create a new one
+        self._close_raw(pooled)
+        self._serve_waiter_with_new_connection()
+
+    def _serve_waiter_with_new_connection(self):
+        with self._lock:
+            if not self._waiters or self._size >= self.max_size:
+                return
+            waiter = self._waiters.popleft()
+            self._size += 1
+        try:
+            pooled = self._new_connection()
+        except Exception as e:
+            print(f"[{self.name}] Failed to open replacement connection: {e}")
+            with self._lock:
+                self._size -= 1
+                if not waiter.cancelled:
+                    self._waiters.appendleft(waiter)
+            return
+        with self._lock:
+            if waiter.cancelled:
+                # The waiter timed out meanwhile: serve the next one, or keep it idle
+                if not self._waiters:
+                    self._idle.append(pooled)
+                    return
+                waiter = self._waiters.popleft()
+            waiter.conn = pooled
+        waiter.event.set()
+
+    # ------------------------------------------------------------------
+    # Health checks
+    # ------------------------------------------------------------------
+    def _new_connection(self):
+        raw = self._connect()
+        with self._lock:
+            self._created += 1
+        return PooledConnection(self, raw)
+
+    def _validate(self, pooled):
+        """Pings a connection that has been idle for a while; replaces it if dead."""
+        if time.monotonic() - pooled.last_used < self.ping_interval:
+            return pooled
+        try:
+            RoundTrips.add()
+            pooled.raw.ping(reconnect=False)
+            return pooled
+        except Exception:
+            self._close_raw(pooled)
+            try:
+                return PooledConnection(self, self._connect())
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                self._serve_waiter_with_new_connection()
+                raise
+
+    @staticmethod
+    def _close_raw(pooled):
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
+
+    def _maybe_reap(self):
+        # Amortized: scan at most every idle_timeout / 2 seconds
+        if time.monotonic() - self._last_reap >= self.idle_timeout / 2:
+            self.reap_idle()
+
+    def reap_idle(self):
+        """Closes idle connections unused for idle_timeout, keeping min_size open."""
+        now = time.monotonic()
+        victims = []
+        with self._lock:
+            self._last_reap = now
+            # Oldest idle connections sit on the left
+            while (self._idle and self._size > self.min_size
+                   and now - self._idle[0].last_used >= self.idle_timeout):
+                victims.append(self._idle.popleft())
+                self._size -= 1
+            self._reaped += len(victims)
+        for pooled in victims:
+            self._close_raw(pooled)
+        return len(victims)
+
+    def close_all(self):
+        """
+        Closes every idle connection. Connections in use are not affected: they
+        return to the pool on release, to be closed by reap_idle() or a later close_all().
+        """
+        with self._lock:
+            victims = list(self._idle)
+            self._idle.clear()
+            self._size -= len(victims)
+        for pooled in victims:
+            self._close_raw(pooled)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def stats(self):
+        """Returns a snapshot of pool size, usage and wait times."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': len(self._waiters),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'created': self._created,
+                'reaped': self._reaped,
+                'wait_time_total': self._wait_total,
+                'wait_time_max': self._wait_max,
+                'wait_time_avg': self._wait_total / self._checkouts if self._checkouts else 0.0,
+            }
@@ -0,0 +1,198 @@
+"""
+Repository-level query result cache with table-dependency invalidation.
+
+Read results are stored in utils.cache.Cache under a key derived from the SQL
+text and its parameters. Each entry records the tables its statement reads,
+and any write that touches one of those tables (directly or through an
+ON DELETE CASCADE / SET NULL foreign key) evicts it.
+
+Opt in per call:
+    self.execute_query(sql, params, fetch_all=True, cache_ttl=300)
+
+A fetch_one read that finds no row is cached as a negative result (for at
+most Config.CACHE_NEGATIVE_TTL seconds) and invalidated like any other entry.
+
+Reference data can also be kept on disk across launches (see
+database/persistent_cache.py).
+"""
+import hashlib
+import re
+import threading
+
+from utils.cache import MISSING, Cache, key_namespace
+
+# Table names following FROM / JOIN / INTO / UPDATE (subqueries included)
+_TABLE_RE = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)`?", re.IGNORECASE)
+_DELETE_RE = re.compile(r"\s*DELETE\b", re.IGNORECASE)
+
+# parent -> child tables whose rows change when a parent row is deleted (schema.sql, migrations.py)
+_FOREIGN_KEYS = {
+    'users': ('students', 'lecturers', 'academic_officers', 'announcements'),
+    'departments': ('students', 'lecturers', 'courses'),
+    'courses': ('courses', 'course_classes', 'archived_course_classes'),
+    'semesters': ('course_classes', 'archived_course_classes'),
+    'lecturers': ('course_classes', 'archived_course_classes'),
+    'students': ('grades', 'archived_grades'),
+    'course_classes': ('grades',),
+    'archived_course_classes': ('archived_grades',),
+    'academic_officers': ('announcements',),
+}
+
+
+def tables_in(sql):
+    """Lower-cased names of the tables a statement references."""
+    return {name.lower() for name in _TABLE_RE.findall(sql)}
+
+
+def _copy(value):
+    """Copies cached rows so callers can modify them freely (rows are flat dicts)."""
+    if isinstance(value, list):
+        return [dict(row) if isinstance(row, dict) else row for row in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _with_dependents(tables):
+    """Adds every table reachable through the foreign keys in _FOREIGN_KEYS."""
+    result = set(tables)
+    pending = list(result)
+    while pending:
+        for child in _FOREIGN_KEYS.get(pending.pop(), ()):
+            if child not in result:
+                result.add(child)
+                pending.append(child)
+    return result
+
+
+class QueryCache:
+    KEY_PREFIX = "query"
+
+    _lock = threading.Lock()
+    _dependents = {}  # table -> set of cache keys that read it
+    _tables_of = {}   # cache key -> tables it read (to forget evicted keys)
+
+    persistent = None  # On-disk tier, set by PersistentCache.open()
+
+    @classmethod
+    def key(cls, sql, params):
+        digest = hashlib.sha1(f"{sql}\x00{params!r}".encode("utf-8")).hexdigest()
+        return f"{cls.KEY_PREFIX}:{digest}"
+
+    @classmethod
+    def get(cls, key):
+        """Cached result (a copy, callers may mutate it) or None."""
+        value = cls.lookup(key)
+        return None if value is MISSING else value
+
+    @classmethod
+    def lookup(cls, key):
+        """Like get(), but returns Cache.MISSING on a miss and None for a cached empty result."""
+        value = Cache.lookup(key)
+        return value if value is MISSING or value is None else _copy(value)
+
+    @classmethod
+    def get_or_load(cls, key, sql, load, ttl):
+        """
+        After a lookup() miss: run load() and set() its result. Concurrent
+        misses of the same statement share one load() (Cache.single_flight),
+        e.g. the dashboard and the grades view both reading a cold transcript.
+        """
+        def load_once():
+            value = Cache.lookup(key, count=False)  # Filled by a flight that just finished
+            if value is MISSING:
+                version = cls.version()  # Taken before the read, so a concurrent write is never missed
+                value = Cache.timed(key, load)
+                cls.set(key, sql, value, ttl, version)
+            return value
+
+        value = Cache.single_flight(key, load_once)
+        return _copy(value) if value is not None else None
+
+    @classmethod
+    def set(cls, key, sql, value, ttl, version=None):
+        """
+        Caches a result; None (no row) is kept as a negative entry (see Cache.set).
+        version: cls.version() taken before the read; the result then also goes
+        to the on-disk tier (if open and the tables qualify).
+        """
+        Cache.set(key, _copy(value), ttl)
+        tables = tables_in(sql)
+        with cls._lock:
+            cls._tables_of[key] = tables
+            for table in tables:
+                cls._dependents.setdefault(table, set()).add(key)
+        persistent = cls.persistent
+        if version is not None and persistent is not None:
+            persistent.store(key, sql, value, version)
+
+    @classmethod
+    def version(cls):
+        """Change journal version for set(), or None when the on-disk tier is off."""
+        persistent = cls.persistent
+        return persistent.version() if persistent is not None else None
+
+    @classmethod
+    def _forget(cls, keys):
+        """Drops keys from the dependency index (caller holds _lock)."""
+        for key in keys:
+            for table in cls._tables_of.pop(key, ()):
+                dependents = cls._dependents.get(table)
+                if dependents is not None:
+                    dependents.discard(key)
+                    if not dependents:
+                        del cls._dependents[table]
+
+    @classmethod
+    def _on_evicted(cls, keys):
+        """Cache eviction listener: LRU-evicted or expired entries leave the index too."""
+        keys = [key for key in keys if key_namespace(key).startswith(cls.KEY_PREFIX + ":")]
+        if keys:
+            with cls._lock:
+                cls._forget(keys)
+
+    @classmethod
+    def invalidate_tables(cls, *tables, cascade=False):
+        """
+        Evicts every cached result that read one of `tables`.
+        cascade=True also evicts the tables whose rows a DELETE changes through foreign keys.
+        """
+        tables = {t.lower() for t in tables}
+        if cascade:
+            tables = _with_dependents(tables)
+        keys = set()
+        with cls._lock:
+            for table in tables:
+                keys |= cls._dependents.pop(table, set())
+        cls.invalidate_keys(keys)
+
+    @classmethod
+    def invalidate_keys(cls, keys):
+        """Evicts the given cache keys (and their on-disk copies)."""
+        with cls._lock:
+            cls._forget(keys)
+        for key in keys:
+            Cache.clear(key)
+        persistent = cls.persistent
+        if persistent is not None:
+            persistent.discard(keys)
+
+    @classmethod
+    def invalidate_statement(cls, sql):
+        """Evicts the results depending on the tables a write statement touches."""
+        tables = tables_in(sql)
+        if tables:
+            cls.invalidate_tables(*tables, cascade=_DELETE_RE.match(sql) is not None)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._dependents.clear()
+            cls._tables_of.clear()
+        Cache.invalidate_prefix(f"{cls.KEY_PREFIX}:")
+        persistent = cls.persistent
+        if persistent is not None:
+            persistent.clear()
+
+
+Cache.add_eviction_listener(QueryCache._on_evicted)
@@ -0,0 +1,130 @@
+"""
+Routes read-only work to MySQL read replicas.
+
+Each replica has its own connection pool. Replicas are used round-robin and
+skipped while their replication lag exceeds the configured maximum, while
+their lag is unknown, or while they cannot be reached. When no replica
+qualifies the caller falls back to the primary.
+"""
+import itertools
+import threading
+import time
+
+
+class Replica:
+    def __init__(self, host, port, pool_factory):
+        self.host = host
+        self.port = port
+        self._pool_factory = pool_factory
+        self._pool = None
+        self.lag = None             # Seconds behind the primary at the last check
+        self.healthy = False
+        self.checked_at = None      # time.monotonic() of the last lag check
+        self.lock = threading.Lock()
+
+    @property
+    def name(self):
+        return f"{self.host}:{self.port}"
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = self._pool_factory(self.host, self.port)
+        return self._pool
+
+
+class ReplicaRouter:
+    def __init__(self, replicas, max_lag=5.0, check_interval=5.0):
+        """
+        Args:
+            replicas: List of Replica
+            max_lag: Seconds behind the primary before a replica is skipped
+            check_interval: Seconds between replication lag checks per replica
+        """
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._round_robin = itertools.cycle(range(len(replicas)))
+        self._rr_lock = threading.Lock()
+        self.fallbacks = 0  # Reads that had to go to the primary
+
+    @staticmethod
+    def parse_hosts(spec, default_port):
+        """'db-r1,db-r2:3307' -> [('db-r1', default_port), ('db-r2', 3307)]"""
+        hosts = []
+        for item in (spec or "").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            host, _, port = item.partition(":")
+            hosts.append((host, int(port) if port else default_port))
+        return hosts
+
+    def get_connection(self, timeout=None):
+        """Connection from a healthy replica, or None if the caller should use the primary."""
+        with self._rr_lock:
+            start = next(self._round_robin)
+        count = len(self.replicas)
+        for i in range(count):
+            replica = self.replicas[(start + i) % count]
+            if not self._is_usable(replica):
+                continue
+            try:
+                return replica.pool.get_connection(timeout=timeout)
+            except Exception as e:
+                print(f"Replica {replica.name} unavailable, skipping: {e}")
+                replica.healthy = False
+                replica.checked_at = time.monotonic()
+        self.fallbacks += 1
+        return None
+
+    def _is_usable(self, replica):
+        now = time.monotonic()
+        if replica.checked_at is None or now - replica.checked_at >= self.check_interval:
+            # One thread refreshes the lag; the others use the previous result
+            if replica.lock.acquire(blocking=False):
+                try:
+                    self._check_lag(replica)
+                finally:
+                    replica.lock.release()
+        return replica.healthy
+
+    def _check_lag(self, replica):
+        replica.checked_at = time.monotonic()
+        conn = None
+        try:
+            conn = replica.pool.get_connection()
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except Exception:
+                cursor.execute("SHOW SLAVE STATUS")  # MySQL < 8.0.22
+            row = cursor.fetchone()
+            cursor.close()
+            lag = None
+            if row:
+                lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+            # NULL lag means replication is stopped or broken
+            replica.lag = lag
+            replica.healthy = lag is not None and lag <= self.max_lag
+        except Exception as e:
+            print(f"Replica {replica.name} lag check failed: {e}")
+            replica.lag = None
+            replica.healthy = False
+        finally:
+            if conn:
+                conn.close()
+
+    def stats(self):
+        return {
+            'fallbacks': self.fallbacks,
+            'replicas': [
+                {
+                    'name': r.name,
+                    'healthy': r.healthy,
+                    'lag': r.lag,
+                    'pool': r.pool.stats() if r._pool else {},
+                }
+                for r in self.replicas
+            ],
+        }
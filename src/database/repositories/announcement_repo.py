@@ -1,7 +1,10 @@
+from config import Config
 from database.repository import BaseRepository
 from models.academic.announcement import Announcement
 
 class AnnouncementRepository(BaseRepository):
+    PLAN_CHECKS = (("get_recent", (1,)), ("get_recent", ()), ("get_by_id", (1,)))
+
     def get_all(self, search_query=None):
         sql = "SELECT * FROM Announcements"
         params = []
@@ -13,13 +16,16 @@ class AnnouncementRepository(BaseRepository):
         return [Announcement.from_db_row(r) for r in self.execute_query(sql, tuple(params), fetch_all=True)]
 
     def get_recent(self, user_id=None, limit=3):
+        """Latest announcements for the dashboards; cached until Announcements changes."""
         if user_id:
             # Lấy thông báo chung (user_id NULL) HOẶC thông báo riêng của user
             sql = "SELECT * FROM Announcements WHERE user_id IS NULL OR user_id = %s ORDER BY created_date DESC LIMIT %s"
-            return [Announcement.from_db_row(r) for r in self.execute_query(sql, (user_id, limit), fetch_all=True)]
+            rows = self.execute_query(sql, (user_id, limit), fetch_all=True, cache_ttl=Config.QUERY_CACHE_USER_TTL)
+            return [Announcement.from_db_row(r) for r in rows]
         
         sql = "SELECT * FROM Announcements WHERE user_id IS NULL ORDER BY created_date DESC LIMIT %s"
-        return [Announcement.from_db_row(r) for r in self.execute_query(sql, (limit,), fetch_all=True)]
+        rows = self.execute_query(sql, (limit,), fetch_all=True, cache_ttl=Config.QUERY_CACHE_USER_TTL)
+        return [Announcement.from_db_row(r) for r in rows]
 
     def get_by_id(self, ann_id):
         sql = "SELECT * FROM Announcements WHERE announcement_id = %s"
@@ -41,6 +47,14 @@ class AnnouncementRepository(BaseRepository):
             return True, "Notification sent"
         except Exception as e: return False, str(e)
 
+    def add_notifications(self, user_ids, title, content):
+        """Creates the same notification for several users with one multi-row INSERT"""
+        try:
+            self.execute_many("INSERT INTO Announcements (user_id, title, content, created_date) VALUES (%s, %s, %s, NOW())",
+                              [(user_id, title, content) for user_id in user_ids])
+            return True, "Notifications sent"
+        except Exception as e: return False, str(e)
+
     def update(self, ann):
         try:
             self.execute_query("UPDATE Announcements SET title=%s, content=%s WHERE announcement_id=%s",
@@ -1,39 +1,42 @@
+from config import Config
 from database.repository import BaseRepository
 from models.academic.course_class import CourseClass
 
 class ClassRepository(BaseRepository):
-    def get_all_details(self, page=None, per_page=None, search_query=None):
-        sql = """
-            SELECT SQL_CALC_FOUND_ROWS cc.*, c.course_name, c.course_code, u.full_name as lecturer_name,
-                   (SELECT COUNT(*) FROM Grades WHERE class_id = cc.class_id) as current_enrolled
+    LIST_TABLE = "Course_Classes"
+    LIST_COLUMNS = """cc.*, c.course_name, c.course_code, u.full_name as lecturer_name,
+                   (SELECT COUNT(*) FROM Grades WHERE class_id = cc.class_id) as current_enrolled"""
+    LIST_FROM = """
             FROM Course_Classes cc
             JOIN Courses c ON cc.course_id = c.course_id
             LEFT JOIN Lecturers l ON cc.lecturer_id = l.lecturer_id
             LEFT JOIN Users u ON l.user_id = u.user_id
-        """
-        params = []
-        if search_query:
-            sql += " WHERE (c.course_name LIKE %s OR c.course_code LIKE %s OR u.full_name LIKE %s) "
-            term = f"%{search_query}%"
-            params.extend([term, term, term])
-            
-        sql += " ORDER BY c.course_name ASC"
+    """
+    # course_name is not unique, class_id breaks ties
+    LIST_KEY = (("c.course_name", "course_name"), ("cc.class_id", "class_id"))
+    PLAN_CHECKS = (("get_by_id", (1,)), ("get_schedule_by_lecturer", (1,)), ("get_schedule_by_student", (1,)))
 
-        if page is not None and per_page is not None:
-            offset = (page - 1) * per_page
-            sql += " LIMIT %s OFFSET %s"
-            params.extend([per_page, offset])
-            
-        conn = self.db.get_connection()
-        try:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute(sql, tuple(params))
-            rows = cursor.fetchall()
-            cursor.execute("SELECT FOUND_ROWS() as total")
-            total = cursor.fetchone()['total']
-            return [CourseClass.from_db_row(row) for row in rows], total
-        finally:
-            conn.close()
+    def _search_filters(self, search_query):
+        if not search_query:
+            return [], []
+        term = f"%{search_query}%"
+        return ["c.course_name LIKE %s OR c.course_code LIKE %s OR u.full_name LIKE %s"], [term, term, term]
+
+    def get_all_details(self, page=None, per_page=None, search_query=None):
+        rows, total = self.fetch_offset_page(page, per_page, search_query)
+        return [CourseClass.from_db_row(row) for row in rows], total
+
+    def get_page(self, per_page=50, cursor=None, search_query=None):
+        """Keyset-paginated class list ordered by (course name, class id)."""
+        page = self.fetch_keyset_page(per_page, cursor, search_query)
+        page['data'] = [CourseClass.from_db_row(row) for row in page['data']]
+        return page
+
+    def iter_all_details(self, search_query=None, batch_size=500):
+        """Streams every matching class with flat memory use (unlike get_all_details(page=None))."""
+        sql, params = self._list_query(search_query)
+        for row in self.execute_iter(sql, tuple(params), batch_size):
+            yield CourseClass.from_db_row(row)
 
     def get_all(self):
         return self.get_all_details()
@@ -55,6 +58,7 @@ class ClassRepository(BaseRepository):
         try:
             self.execute_query("INSERT INTO Course_Classes (course_id, semester_id, room, schedule, max_capacity) VALUES (%s, %s, %s, %s, %s)",
                                (cls_obj.course_id, cls_obj.semester_id, cls_obj.room, cls_obj.schedule, cls_obj.max_capacity))
+            self.invalidate_counts()
             return True, "Class scheduled"
         except Exception as e: return False, str(e)
 
@@ -68,12 +72,14 @@ class ClassRepository(BaseRepository):
     def assign_lecturer(self, class_id, lecturer_id):
         try:
             self.execute_query("UPDATE Course_Classes SET lecturer_id=%s WHERE class_id=%s", (lecturer_id, class_id))
+            self.invalidate_counts()  # Class search matches lecturer names
             return True, "Lecturer assigned"
         except Exception as e: return False, str(e)
 
     def delete(self, class_id):
         try:
             self.execute_query("DELETE FROM Course_Classes WHERE class_id=%s", (class_id,))
+            self.invalidate_counts()
             return True, "Class deleted"
         except Exception as e: return False, "Cannot delete (Active grades)"
 
@@ -90,8 +96,29 @@ class ClassRepository(BaseRepository):
         """
         return self.execute_query(sql, (lecturer_id,), fetch_all=True)
 
-    def get_schedule_by_student(self, student_id):
-        """Retrieves student's schedule based on registered classes (in Grades table)"""
+    def concerns_lecturer(self, lecturer_id, class_ids=(), grade_ids=()):
+        """True if any of the given classes (or the classes of the given grades) is taught by the lecturer"""
+        conditions, params = [], [lecturer_id]
+        if class_ids:
+            conditions.append(f"class_id IN ({', '.join(['%s'] * len(class_ids))})")
+            params.extend(class_ids)
+        if grade_ids:
+            conditions.append(
+                f"class_id IN (SELECT class_id FROM Grades WHERE grade_id IN ({', '.join(['%s'] * len(grade_ids))}))"
+            )
+            params.extend(grade_ids)
+        if not conditions:
+            return False
+        sql = f"SELECT COUNT(*) as count FROM Course_Classes WHERE lecturer_id = %s AND ({' OR '.join(conditions)})"
+        res = self.execute_query(sql, params, fetch_one=True)
+        return bool(res and res['count'])
+
+    def get_schedule_by_student(self, student_id, refresh=False):
+        """
+        Retrieves student's schedule based on registered classes (in Grades table),
+        including classes of archived semesters (see semester_repo.py).
+        Cached, see get_by_student in grade_repo
+        """
         sql = """
             SELECT cc.schedule, cc.room, c.course_name, c.course_code, 
                    u.full_name as lecturer_name, l.lecturer_code
@@ -101,9 +128,19 @@ class ClassRepository(BaseRepository):
             LEFT JOIN Lecturers l ON cc.lecturer_id = l.lecturer_id
             LEFT JOIN Users u ON l.user_id = u.user_id
             WHERE g.student_id = %s
+            UNION ALL
+            SELECT cc.schedule, cc.room, c.course_name, c.course_code,
+                   u.full_name as lecturer_name, l.lecturer_code
+            FROM Archived_Grades g
+            JOIN Archived_Course_Classes cc ON g.class_id = cc.class_id
+            JOIN Courses c ON cc.course_id = c.course_id
+            LEFT JOIN Lecturers l ON cc.lecturer_id = l.lecturer_id
+            LEFT JOIN Users u ON l.user_id = u.user_id
+            WHERE g.student_id = %s
         """ # SQL query to get student's schedule
         # Returns a list of dictionaries (as this is aggregated data for display, no need to map to complex Models yet)
-        return self.execute_query(sql, (student_id,), fetch_all=True)
+        return self.execute_query(sql, (student_id, student_id), fetch_all=True,
+                                  cache_ttl=Config.QUERY_CACHE_USER_TTL, refresh_cache=refresh)
 
     def count_all(self):
         try:
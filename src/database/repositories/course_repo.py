@@ -1,38 +1,39 @@
+from config import Config
 from database.repository import BaseRepository
 from models.academic.course import Course
 
 class CourseRepository(BaseRepository):
-    def get_all(self, page=None, per_page=None, search_query=None):
-        sql = """
-            SELECT SQL_CALC_FOUND_ROWS c.*, p.course_code as prerequisite_code 
+    LIST_TABLE = "Courses"
+    LIST_COLUMNS = "c.*, p.course_code as prerequisite_code"
+    LIST_FROM = """
             FROM Courses c
             LEFT JOIN Courses p ON c.prerequisite_id = p.course_id
-        """
-        params = []
-        
-        if search_query:
-            sql += " WHERE (c.course_code LIKE %s OR c.course_name LIKE %s) "
-            term = f"%{search_query}%"
-            params.extend([term, term])
-            
-        sql += " ORDER BY c.course_code ASC"
-        
-        # Add LIMIT OFFSET if pagination is enabled
-        if page is not None and per_page is not None:
-            offset = (page - 1) * per_page
-            sql += " LIMIT %s OFFSET %s"
-            params.extend([per_page, offset])
-            
-        conn = self.db.get_connection()
-        try:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute(sql, tuple(params))
-            rows = cursor.fetchall()
-            cursor.execute("SELECT FOUND_ROWS() as total")
-            total = cursor.fetchone()['total']
-            return [Course.from_db_row(row) for row in rows], total
-        finally:
-            conn.close()
+    """
+    LIST_KEY = (("c.course_code", "course_code"),)
+    PLAN_CHECKS = (("get_by_id", (1,)),)
+
+    def _search_filters(self, search_query):
+        if not search_query:
+            return [], []
+        term = f"%{search_query}%"
+        return ["c.course_code LIKE %s OR c.course_name LIKE %s"], [term, term]
+
+    def get_all(self, page=None, per_page=None, search_query=None):
+        if page is None or per_page is None:
+            # Whole catalog (pickers, imports): only cached when the on-disk tier is on
+            # (database/persistent_cache.py), which warms it at startup
+            cache_ttl = Config.QUERY_CACHE_TTL if Config.PERSISTENT_CACHE_PATH else None
+            sql, params = self._list_query(search_query)
+            rows = self.execute_query(sql, tuple(params), fetch_all=True, cache_ttl=cache_ttl)
+            return [Course.from_db_row(row) for row in rows], len(rows)
+        rows, total = self.fetch_offset_page(page, per_page, search_query)
+        return [Course.from_db_row(row) for row in rows], total
+
+    def get_page(self, per_page=50, cursor=None, search_query=None):
+        """Keyset-paginated course list ordered by course code."""
+        page = self.fetch_keyset_page(per_page, cursor, search_query)
+        page['data'] = [Course.from_db_row(row) for row in page['data']]
+        return page
 
     def get_by_id(self, course_id):
         sql = "SELECT * FROM Courses WHERE course_id = %s"
@@ -53,6 +54,7 @@ class CourseRepository(BaseRepository):
                 course.description, 
                 course.prerequisite_id
             ))
+            self.invalidate_counts()
             return True, "Course created"
         except Exception as e: return False, str(e)
 
@@ -68,14 +70,21 @@ class CourseRepository(BaseRepository):
                 course.prerequisite_id, 
                 course.course_id
             ))
+            self.invalidate_counts()
             return True, "Course updated"
         except Exception as e: return False, str(e)
 
     def delete(self, course_id):
-        check = self.execute_query("SELECT COUNT(*) as c FROM Course_Classes WHERE course_id=%s", (course_id,), fetch_one=True)
+        # Archived classes count too: deleting the course would cascade to them and their grades
+        check = self.execute_query(
+            "SELECT (SELECT COUNT(*) FROM Course_Classes WHERE course_id=%s)"
+            " + (SELECT COUNT(*) FROM Archived_Course_Classes WHERE course_id=%s) as c",
+            (course_id, course_id), fetch_one=True
+        )
         if check and check['c'] > 0: return False, "Cannot delete: Course has active classes"
         try:
             self.execute_query("DELETE FROM Courses WHERE course_id=%s", (course_id,))
+            self.invalidate_counts()
             return True, "Course deleted"
         except Exception as e: return False, str(e)
 
@@ -17,7 +17,7 @@ class DashboardRepository:
         """
         stats = {'students': 0, 'lecturers': 0, 'courses': 0, 'classes': 0}
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(query)
                 results = cursor.fetchall()
                 for row in results:
@@ -1,14 +1,18 @@
+from config import Config
 from database.repository import BaseRepository
 from models.academic.department import Department
 
 class DepartmentRepository(BaseRepository):
+    PLAN_CHECKS = (("get_by_id", (1,)),)
+
     def get_all(self):
         sql = "SELECT * FROM Departments ORDER BY dept_name ASC"
-        return [Department.from_db_row(row) for row in self.execute_query(sql, fetch_all=True)]
+        rows = self.execute_query(sql, fetch_all=True, cache_ttl=Config.QUERY_CACHE_TTL)
+        return [Department.from_db_row(row) for row in rows]
 
     def get_by_id(self, dept_id):
         sql = "SELECT * FROM Departments WHERE dept_id = %s"
-        row = self.execute_query(sql, (dept_id,), fetch_one=True)
+        row = self.execute_query(sql, (dept_id,), fetch_one=True, cache_ttl=Config.QUERY_CACHE_TTL)
         return Department.from_db_row(row) if row else None
 
     def add(self, dept):
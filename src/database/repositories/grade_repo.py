@@ -1,23 +1,66 @@
+from config import Config
 from database.repository import BaseRepository
 from models.academic.grade import Grade
 
+# Transcript of one student: current grades plus those of archived semesters
+# (params: student_id twice)
+TRANSCRIPT_SQL = """
+    SELECT g.*, c.course_name, c.credits, c.course_code
+    FROM Grades g
+    JOIN Course_Classes cc ON g.class_id = cc.class_id
+    JOIN Courses c ON cc.course_id = c.course_id
+    WHERE g.student_id = %s
+    UNION ALL
+    SELECT g.*, c.course_name, c.credits, c.course_code
+    FROM Archived_Grades g
+    JOIN Archived_Course_Classes cc ON g.class_id = cc.class_id
+    JOIN Courses c ON cc.course_id = c.course_id
+    WHERE g.student_id = %s
+"""
+
 class GradeRepository(BaseRepository):
-    def get_by_student(self, student_id):
-        """Retrieves the transcript of a student (including course information)"""
-        sql = """ # SQL query to get grades for a student
-            SELECT g.*, c.course_name, c.credits, c.course_code
+    PLAN_CHECKS = (
+        ("get_by_student", (1,)),
+        ("get_by_class", (1,)),
+        ("get_id_by_enrollment", (1, 1)),
+        ("get_by_id", (1,)),
+    )
+
+    def get_by_student(self, student_id, refresh=False):
+        """
+        Retrieves the transcript of a student (including course information),
+        with the grades of archived semesters (see semester_repo.py).
+        Cached until a write to Grades, Course_Classes or Courses; refresh=True rereads it.
+        """
+        return self.fetch_models(Grade, TRANSCRIPT_SQL, (student_id, student_id),
+                                 cache_ttl=Config.QUERY_CACHE_USER_TTL, refresh_cache=refresh)
+
+    def iter_by_student(self, student_id, batch_size=500):
+        """Streaming variant of get_by_student: yields Grade objects one at a time."""
+        yield from self.execute_iter(TRANSCRIPT_SQL, (student_id, student_id), batch_size, model=Grade)
+
+    def iter_all(self, batch_size=1000):
+        """Streams every grade record, archived semesters included, with course and student codes (e.g. for exports)."""
+        sql = """
+            SELECT g.*, c.course_name, c.credits, c.course_code, s.student_code
             FROM Grades g
             JOIN Course_Classes cc ON g.class_id = cc.class_id
             JOIN Courses c ON cc.course_id = c.course_id
-            WHERE g.student_id = %s
+            JOIN Students s ON g.student_id = s.student_id
+            UNION ALL
+            SELECT g.*, c.course_name, c.credits, c.course_code, s.student_code
+            FROM Archived_Grades g
+            JOIN Archived_Course_Classes cc ON g.class_id = cc.class_id
+            JOIN Courses c ON cc.course_id = c.course_id
+            JOIN Students s ON g.student_id = s.student_id
+            ORDER BY grade_id
         """
-        results = self.execute_query(sql, (student_id,), fetch_all=True)
-        return [Grade.from_db_row(r) for r in results]
+        yield from self.execute_iter(sql, batch_size=batch_size, model=Grade)
 
     def get_by_class(self, class_id):
         """Retrieves the grade list for a class (for lecturers to enter grades)"""
         sql = """ # SQL query to get grades for a specific class
-            SELECT g.*, s.student_code, u.full_name, u.email
+            SELECT g.*, s.student_code, s.user_id, u.full_name, u.email
             FROM Grades g
             JOIN Students s ON g.student_id = s.student_id
             JOIN Users u ON s.user_id = u.user_id
@@ -32,7 +75,8 @@ class GradeRepository(BaseRepository):
     def update_scores(self, grade_obj):
         """Updates scores"""
         # Check grade lock status
-        check = self.execute_query("SELECT is_locked FROM Grades WHERE grade_id=%s", (grade_obj.grade_id,), fetch_one=True)
+        # Read from the primary: a lagging replica could miss a lock applied moments ago
+        check = self.execute_query("SELECT is_locked FROM Grades WHERE grade_id=%s", (grade_obj.grade_id,), fetch_one=True, readonly=False)
         if check and check['is_locked']: # If grades are locked, return error
             return False, "Grades are locked."
         # Automatically recalculate total and letter before saving
@@ -55,6 +99,35 @@ class GradeRepository(BaseRepository):
             return True, "Saved"
         except Exception as e: return False, str(e)
 
+    def update_scores_bulk(self, grade_objs):
+        """
+        Saves the scores of many grades with multi-row UPDATEs instead of one
+        lock check and one UPDATE per grade. Locked grades are skipped by the
+        statement itself (is_locked = 0 condition).
+        Returns (success, message, ids of the grades saved).
+        """
+        rows = []
+        for grade_obj in grade_objs:
+            grade_obj.calculate_total()
+            rows.append((
+                grade_obj.grade_id,
+                grade_obj.attendance_score,
+                grade_obj.midterm,
+                grade_obj.final,
+                grade_obj.total,
+                grade_obj.letter_grade
+            ))
+        if not rows:
+            return True, "Saved", []
+        try:
+            saved_ids = self.bulk_update(
+                "Grades", "grade_id",
+                ("attendance_score", "midterm", "final", "total", "letter_grade"),
+                rows, where="t.is_locked = 0"
+            )
+            return True, "Saved", saved_ids
+        except Exception as e: return False, str(e), []
+
     def lock_grades(self, class_id):
         """Locks grades for the entire class"""
         try:
@@ -68,13 +141,27 @@ class GradeRepository(BaseRepository):
         res = self.execute_query(sql, (student_id, class_id), fetch_one=True)
         return res['grade_id'] if res else None
 
+    def concerns_student(self, student_id, grade_ids=(), class_ids=()):
+        """True if any of the given grades or classes is one of the student's enrollments"""
+        conditions, params = [], [student_id]
+        if grade_ids:
+            conditions.append(f"grade_id IN ({', '.join(['%s'] * len(grade_ids))})")
+            params.extend(grade_ids)
+        if class_ids:
+            conditions.append(f"class_id IN ({', '.join(['%s'] * len(class_ids))})")
+            params.extend(class_ids)
+        if not conditions:
+            return False
+        sql = f"SELECT COUNT(*) as count FROM Grades WHERE student_id = %s AND ({' OR '.join(conditions)})"
+        res = self.execute_query(sql, params, fetch_one=True)
+        return bool(res and res['count'])
+
     # Required BaseRepo methods (pass or raise if not used)
     def get_all(self): pass
 
     def get_by_id(self, grade_id):
         sql = "SELECT * FROM Grades WHERE grade_id = %s"
-        row = self.execute_query(sql, (grade_id,), fetch_one=True)
-        return Grade.from_db_row(row) if row else None
+        return self.fetch_model(Grade, sql, (grade_id,))
 
     def add(self, entity): pass 
     def update(self, entity): pass
@@ -2,49 +2,42 @@ from database.repository import BaseRepository
 from models.lecturer import Lecturer
 
 class LecturerRepository(BaseRepository):
-    def get_all(self, page=None, per_page=None, search_query=None):
-        """Get lecturers (optional pagination)"""
-        sql = """
-            SELECT SQL_CALC_FOUND_ROWS l.*, u.*, d.dept_name 
+    LIST_TABLE = "Lecturers"
+    LIST_COLUMNS = "l.*, u.*, d.dept_name"
+    LIST_FROM = """
             FROM Lecturers l
             JOIN Users u ON l.user_id = u.user_id
             LEFT JOIN Departments d ON l.dept_id = d.dept_id
-        """
-        params = []
-        if search_query:
-            sql += " WHERE (l.lecturer_code LIKE %s OR u.full_name LIKE %s OR u.email LIKE %s) "
-            term = f"%{search_query}%"
-            params.extend([term, term, term])
-            
-        sql += " ORDER BY l.lecturer_code ASC"
+    """
+    LIST_KEY = (("l.lecturer_code", "lecturer_code"),)
+    PLAN_CHECKS = (("get_by_id", (1,)), ("get_by_user_id", (1,)), ("get_schedule_by_lecturer", (1,)))
 
-        if page is not None and per_page is not None:
-            offset = (page - 1) * per_page
-            sql += " LIMIT %s OFFSET %s"
-            params.extend([per_page, offset])
-            
-        # Execute with manual connection to get FOUND_ROWS
-        conn = self.db.get_connection()
-        try:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute(sql, tuple(params))
-            results = cursor.fetchall()
-            
-            cursor.execute("SELECT FOUND_ROWS() as total")
-            total = cursor.fetchone()['total']
-            
-            return [Lecturer.from_db_row(row) for row in results], total
-        finally:
-            conn.close()
+    def _search_filters(self, search_query):
+        if not search_query:
+            return [], []
+        term = f"%{search_query}%"
+        return ["l.lecturer_code LIKE %s OR u.full_name LIKE %s OR u.email LIKE %s"], [term, term, term]
+
+    def get_all(self, page=None, per_page=None, search_query=None):
+        """Get lecturers (optional pagination)"""
+        return self.fetch_offset_page(page, per_page, search_query, model=Lecturer)
+
+    def get_page(self, per_page=50, cursor=None, search_query=None):
+        """Keyset-paginated lecturer list ordered by lecturer code."""
+        return self.fetch_keyset_page(per_page, cursor, search_query, model=Lecturer)
+
+    def iter_all(self, search_query=None, batch_size=500):
+        """Streams every matching lecturer with flat memory use."""
+        sql, params = self._list_query(search_query)
+        yield from self.execute_iter(sql, tuple(params), batch_size, model=Lecturer)
 
     def get_by_id(self, lecturer_id):
         sql = "SELECT l.*, u.*, d.dept_name FROM Lecturers l JOIN Users u ON l.user_id = u.user_id LEFT JOIN Departments d ON l.dept_id = d.dept_id WHERE l.lecturer_id = %s"
-        row = self.execute_query(sql, (lecturer_id,), fetch_one=True)
-        return Lecturer.from_db_row(row)
+        return self.fetch_model(Lecturer, sql, (lecturer_id,))
 
     def add(self, lecturer, password_hash):
         conn = self.db.get_connection()
-        cursor = conn.cursor()
+        cursor = self.db.cursor(conn)
         try:
             conn.start_transaction()
             # 1. Insert User
@@ -54,7 +47,11 @@ class LecturerRepository(BaseRepository):
             # 2. Insert Lecturer
             cursor.execute("INSERT INTO Lecturers (user_id, lecturer_code, dept_id, degree) VALUES (%s, %s, %s, %s)",
                            (user_id, lecturer.lecturer_code, lecturer.dept_id, lecturer.degree))
+            self.publish_change("Users", "INSERT", [user_id], conn)
+            self.publish_change("Lecturers", "INSERT", [cursor.lastrowid], conn)
             conn.commit()
+            self.invalidate_tables("Users", "Lecturers")
+            self.invalidate_counts()
             return True, "Lecturer created successfully"
         except Exception as e:
             conn.rollback()
@@ -65,14 +62,18 @@ class LecturerRepository(BaseRepository):
 
     def update(self, lecturer):
         conn = self.db.get_connection()
-        cursor = conn.cursor()
+        cursor = self.db.cursor(conn)
         try:
             conn.start_transaction()
             cursor.execute("UPDATE Users SET full_name=%s, email=%s, phone=%s WHERE user_id=%s",
                            (lecturer.full_name, lecturer.email, lecturer.phone, lecturer.user_id))
             cursor.execute("UPDATE Lecturers SET dept_id=%s, degree=%s WHERE lecturer_id=%s",
                            (lecturer.dept_id, lecturer.degree, lecturer.lecturer_id))
+            self.publish_change("Users", "UPDATE", [lecturer.user_id], conn)
+            self.publish_change("Lecturers", "UPDATE", [lecturer.lecturer_id], conn)
             conn.commit()
+            self.invalidate_tables("Users", "Lecturers")
+            self.invalidate_counts()
             return True, "Lecturer updated successfully"
         except Exception as e:
             conn.rollback()
@@ -82,7 +83,12 @@ class LecturerRepository(BaseRepository):
             conn.close()
     
     def delete(self, lecturer_id):
-        res = self.execute_query("SELECT COUNT(*) as count FROM Course_Classes WHERE lecturer_id=%s", (lecturer_id,), fetch_one=True)
+        # Archived classes count too: deleting the lecturer would clear their lecturer_id
+        res = self.execute_query(
+            "SELECT (SELECT COUNT(*) FROM Course_Classes WHERE lecturer_id=%s)"
+            " + (SELECT COUNT(*) FROM Archived_Course_Classes WHERE lecturer_id=%s) as count",
+            (lecturer_id, lecturer_id), fetch_one=True
+        )
         if res['count'] > 0: return False, "Cannot delete: Lecturer assigned to classes."
         
         lec = self.get_by_id(lecturer_id)
@@ -90,6 +96,7 @@ class LecturerRepository(BaseRepository):
         
         try:
             self.execute_query("DELETE FROM Users WHERE user_id = %s", (lec.user_id,))
+            self.invalidate_counts()
             return True, "Lecturer deleted"
         except Exception as e:
             return False, str(e)
@@ -103,8 +110,7 @@ class LecturerRepository(BaseRepository):
             LEFT JOIN Departments d ON l.dept_id = d.dept_id
             WHERE u.user_id = %s
         """
-        row = self.execute_query(sql, (user_id,), fetch_one=True)
-        return Lecturer.from_db_row(row) if row else None
+        return self.fetch_model(Lecturer, sql, (user_id,))
 
     def get_schedule_by_lecturer(self, lecturer_id):
         """Get list of classes assigned to lecturer"""
@@ -1,7 +1,17 @@
+from config import Config
+from database.count_service import CountService
 from database.repository import BaseRepository
+from database.unit_of_work import UnitOfWork
 from models.academic.semester import Semester
 
+# Columns shared by the hot and archive tables (migration 4 in database/migrations.py)
+CLASS_COLUMNS = "class_id, course_id, lecturer_id, semester_id, room, schedule, max_capacity"
+GRADE_COLUMNS = ("grade_id, student_id, class_id, attendance_score, midterm, final, total, "
+                 "letter_grade, updated_at, is_locked")
+
 class SemesterRepository(BaseRepository):
+    PLAN_CHECKS = (("get_by_id", (1,)),)
+
     def get_all(self, search_query=None):
         sql = "SELECT * FROM Semesters"
         params = []
@@ -9,17 +19,18 @@ class SemesterRepository(BaseRepository):
             sql += " WHERE name LIKE %s"
             params.append(f"%{search_query}%")
         sql += " ORDER BY start_date DESC"
-        return [Semester.from_db_row(row) for row in self.execute_query(sql, tuple(params), fetch_all=True)]
+        rows = self.execute_query(sql, tuple(params), fetch_all=True, cache_ttl=Config.QUERY_CACHE_TTL)
+        return [Semester.from_db_row(row) for row in rows]
 
     def get_by_id(self, semester_id):
         sql = "SELECT * FROM Semesters WHERE semester_id = %s"
-        row = self.execute_query(sql, (semester_id,), fetch_one=True)
+        row = self.execute_query(sql, (semester_id,), fetch_one=True, cache_ttl=Config.QUERY_CACHE_TTL)
         return Semester.from_db_row(row) if row else None
 
     def get_active(self):
         """Get the current active semester (OPEN)"""
         sql = "SELECT * FROM Semesters WHERE status = 'OPEN' ORDER BY start_date DESC LIMIT 1"
-        row = self.execute_query(sql, fetch_one=True)
+        row = self.execute_query(sql, fetch_one=True, cache_ttl=Config.QUERY_CACHE_TTL)
         return Semester.from_db_row(row) if row else None
 
     def add(self, sem):
@@ -37,9 +48,101 @@ class SemesterRepository(BaseRepository):
         except Exception as e: return False, str(e)
 
     def delete(self, sem_id):
-        check = self.execute_query("SELECT COUNT(*) as c FROM Course_Classes WHERE semester_id=%s", (sem_id,), fetch_one=True)
+        # Archived classes count too: deleting the semester would cascade to their grades
+        check = self.execute_query(
+            "SELECT (SELECT COUNT(*) FROM Course_Classes WHERE semester_id=%s)"
+            " + (SELECT COUNT(*) FROM Archived_Course_Classes WHERE semester_id=%s) as c",
+            (sem_id, sem_id), fetch_one=True
+        )
         if check['c'] > 0: return False, "Cannot delete: Classes exist in semester"
         try:
             self.execute_query("DELETE FROM Semesters WHERE semester_id=%s", (sem_id,))
             return True, "Semester deleted"
-        except Exception as e: return False, str(e)
\ No newline at end of file
+        except Exception as e: return False, str(e)
+
+    # --- Archiving -----------------------------------------------------------
+    # CLOSED semesters move from Course_Classes / Grades to Archived_Course_Classes /
+    # Archived_Grades, so the hot tables only hold the semesters still in use.
+    # Transcripts and student schedules read both (GradeRepository.get_by_student,
+    # ClassRepository.get_schedule_by_student).
+    def archive(self, semester_id):
+        """
+        Moves a CLOSED semester's classes and grades to the archive tables in one transaction.
+        Only the student transcript and schedule reads (grade_repo.TRANSCRIPT_SQL,
+        ClassRepository.get_schedule_by_student) include archived rows: lecturer
+        schedules, grading, the admin class list and class counts no longer show
+        the semester's classes until restore() moves them back.
+        """
+        sem = self.get_by_id(semester_id)
+        if not sem: return False, "Semester not found"
+        if sem.status != 'CLOSED': return False, "Only CLOSED semesters can be archived."
+        try:
+            with UnitOfWork():
+                self.execute_query(
+                    f"INSERT INTO Archived_Course_Classes ({CLASS_COLUMNS}) "
+                    f"SELECT {CLASS_COLUMNS} FROM Course_Classes WHERE semester_id = %s", (semester_id,)
+                )
+                self.execute_query(
+                    f"INSERT INTO Archived_Grades ({GRADE_COLUMNS}) "
+                    f"SELECT {GRADE_COLUMNS} FROM Grades "
+                    f"WHERE class_id IN (SELECT class_id FROM Course_Classes WHERE semester_id = %s)", (semester_id,)
+                )
+                self.execute_query(
+                    "DELETE FROM Grades WHERE class_id IN (SELECT class_id FROM Course_Classes WHERE semester_id = %s)",
+                    (semester_id,)
+                )
+                self.execute_query("DELETE FROM Course_Classes WHERE semester_id = %s", (semester_id,))
+            CountService.invalidate("Course_Classes")
+            return True, "Semester archived"
+        except Exception as e:
+            print(f"Error archiving semester {semester_id}: {e}")
+            return False, str(e)
+
+    def restore(self, semester_id):
+        """Moves an archived semester back to the hot tables, e.g. when it is reopened."""
+        try:
+            with UnitOfWork():
+                self.execute_query(
+                    f"INSERT INTO Course_Classes ({CLASS_COLUMNS}) "
+                    f"SELECT {CLASS_COLUMNS} FROM Archived_Course_Classes WHERE semester_id = %s", (semester_id,)
+                )
+                self.execute_query(
+                    f"INSERT INTO Grades ({GRADE_COLUMNS}) "
+                    f"SELECT {GRADE_COLUMNS} FROM Archived_Grades "
+                    f"WHERE class_id IN (SELECT class_id FROM Archived_Course_Classes WHERE semester_id = %s)", (semester_id,)
+                )
+                # Archived_Grades rows go with their classes (ON DELETE CASCADE)
+                self.execute_query("DELETE FROM Archived_Course_Classes WHERE semester_id = %s", (semester_id,))
+                self.invalidate_tables("Archived_Grades")
+                self.publish_change("Archived_Grades", "DELETE")
+            CountService.invalidate("Course_Classes")
+            return True, "Semester restored"
+        except Exception as e:
+            print(f"Error restoring semester {semester_id}: {e}")
+            return False, str(e)
+
+    def is_archived(self, semester_id):
+        row = self.execute_query("SELECT COUNT(*) as c FROM Archived_Course_Classes WHERE semester_id = %s",
+                                 (semester_id,), fetch_one=True)
+        return bool(row and row['c'])
+
+    def archive_closed(self):
+        """Archives every CLOSED semester that still has classes in the hot tables. Returns the archived ids."""
+        rows = self.execute_query("""
+            SELECT DISTINCT s.semester_id
+            FROM Semesters s
+            JOIN Course_Classes cc ON cc.semester_id = s.semester_id
+            WHERE s.status = 'CLOSED'
+        """, fetch_all=True)
+        archived = []
+        for row in rows:
+            success, _ = self.archive(row['semester_id'])
+            if success:
+                archived.append(row['semester_id'])
+        return archived
+
+
+# Archives semesters closed before auto-archiving existed: cd src && python -m database.repositories.semester_repo
+if __name__ == "__main__":
+    semester_ids = SemesterRepository().archive_closed()
+    print(f"Archived {len(semester_ids)} closed semester(s): {semester_ids}")
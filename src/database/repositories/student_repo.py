@@ -1,56 +1,47 @@
+from config import Config
 from database.repository import BaseRepository
+from database.unit_of_work import UnitOfWork
 from models.student import Student
 from utils.cache import cache_result
 
 class StudentRepository(BaseRepository):
-    def get_all(self, page=1, per_page=50, search_query=None):
-        """
-        Server-side pagination that also returns the total count of items
-        using SQL_CALC_FOUND_ROWS to avoid a separate COUNT(*) query.
-        Returns a tuple: (list_of_students, total_count)
-        """
-        offset = (page - 1) * per_page
-        sql = """
-            SELECT SQL_CALC_FOUND_ROWS s.*, u.*, d.dept_name 
+    LIST_TABLE = "Students"
+    LIST_COLUMNS = "s.*, u.*, d.dept_name"
+    LIST_FROM = """
             FROM Students s
             JOIN Users u ON s.user_id = u.user_id
             LEFT JOIN Departments d ON s.dept_id = d.dept_id
-        """
-        params = []
-        if search_query:
-            sql += " WHERE (s.student_code LIKE %s OR u.full_name LIKE %s OR u.email LIKE %s) "
-            term = f"%{search_query}%"
-            params.extend([term, term, term])
-            
-        sql += " ORDER BY s.student_code ASC LIMIT %s OFFSET %s"
-        params.extend([per_page, offset])
+    """
+    LIST_KEY = (("s.student_code", "student_code"),)
+    PLAN_CHECKS = (("get_by_id", (1,)), ("get_by_user_id", (1,)))
 
-        total_count_sql = "SELECT FOUND_ROWS() as total"
+    def _search_filters(self, search_query):
+        if not search_query:
+            return [], []
+        term = f"%{search_query}%"
+        return ["s.student_code LIKE %s OR u.full_name LIKE %s OR u.email LIKE %s"], [term, term, term]
 
-        conn = None
+    def get_all(self, page=1, per_page=50, search_query=None):
+        """
+        Server-side pagination. Only the page query runs on each call; the
+        total comes from the cached count service.
+        Returns a tuple: (list_of_students, total_count)
+        """
         try:
-            # Manually manage connection to ensure FOUND_ROWS() works on the same connection
-            conn = self.db.get_connection()
-            cursor = conn.cursor(dictionary=True)
-
-            # Execute the main query to get the page data
-            cursor.execute(sql, tuple(params))
-            results = cursor.fetchall()
-            students = [Student.from_db_row(row) for row in results]
-
-            # Execute the second query to get the total count
-            cursor.execute(total_count_sql)
-            total_count = cursor.fetchone()['total']
-
-            # Return both data and total count
-            return students, total_count
+            return self.fetch_offset_page(page, per_page, search_query, model=Student)
         except Exception as e:
             print(f"Error fetching paginated students: {e}")
             return [], 0 # Return empty result on error
-        finally:
-            if conn:
-                conn.close() # This returns the connection to the pool
     
+    def get_page(self, per_page=50, cursor=None, search_query=None):
+        """Keyset-paginated student list ordered by student code (see BaseRepository.fetch_keyset_page)."""
+        return self.fetch_keyset_page(per_page, cursor, search_query, model=Student)
+
+    def iter_all(self, search_query=None, batch_size=500):
+        """Streams every matching student (e.g. for exports) with flat memory use."""
+        sql, params = self._list_query(search_query)
+        yield from self.execute_iter(sql, tuple(params), batch_size, model=Student)
+
     def get_all_for_admin(self, page=1, per_page=50):
         """Optimized method for admin panel with pagination"""
         return self.get_all(page, per_page)
@@ -63,57 +54,60 @@ class StudentRepository(BaseRepository):
             LEFT JOIN Departments d ON s.dept_id = d.dept_id
             WHERE s.student_id = %s
         """
-        row = self.execute_query(sql, (student_id,), fetch_one=True)
-        return Student.from_db_row(row)
+        return self.fetch_model(Student, sql, (student_id,))
 
     def add(self, student_obj, password_hash):
         """
         Transaction: Insert User -> Lấy ID -> Insert Student
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
         try:
-            conn.start_transaction()
-            
-            # 1. Insert User
-            user_sql = """ # 1. Insert User
-                INSERT INTO Users (username, password, full_name, email, phone, role, status)
-                VALUES (%s, %s, %s, %s, %s, 'Student', 'ACTIVE')
-            """
-            cursor.execute(user_sql, (
-                student_obj.student_code, 
-                password_hash, 
-                student_obj.full_name, 
-                student_obj.email, 
-                student_obj.phone
-            ))
-            user_id = cursor.lastrowid
-
-            # 2. Insert Student 
-            student_sql = """
-                INSERT INTO Students (user_id, student_code, dept_id, major, academic_year, academic_status)
-                VALUES (%s, %s, %s, %s, %s, 'ACTIVE')
-            """
-            cursor.execute(student_sql, (
-                user_id, 
-                student_obj.student_code, 
-                student_obj.dept_id, 
-                student_obj.major, 
-                student_obj.academic_year
-            ))
-            
-            conn.commit()
+            # Both inserts share one connection and commit together; a caller's
+            # own UnitOfWork (e.g. an import) absorbs this one as a savepoint
+            with UnitOfWork() as uow:
+                cursor = self.db.cursor(uow.connection)
+
+                # 1. Insert User
+                user_sql = """ # 1. Insert User
+                    INSERT INTO Users (username, password, full_name, email, phone, role, status)
+                    VALUES (%s, %s, %s, %s, %s, 'Student', 'ACTIVE')
+                """
+                cursor.execute(user_sql, (
+                    student_obj.student_code, 
+                    password_hash, 
+                    student_obj.full_name, 
+                    student_obj.email, 
+                    student_obj.phone
+                ))
+                user_id = cursor.lastrowid
+
+                # 2. Insert Student 
+                student_sql = """
+                    INSERT INTO Students (user_id, student_code, dept_id, major, academic_year, academic_status)
+                    VALUES (%s, %s, %s, %s, %s, 'ACTIVE')
+                """
+                cursor.execute(student_sql, (
+                    user_id, 
+                    student_obj.student_code, 
+                    student_obj.dept_id, 
+                    student_obj.major, 
+                    student_obj.academic_year
+                ))
+                student_id = cursor.lastrowid
+                cursor.close()
+
+                # Journaled in the same transaction
+                self.publish_change("Users", "INSERT", [user_id])
+                self.publish_change("Students", "INSERT", [student_id])
+
+            self.invalidate_tables("Users", "Students")
+            self.invalidate_counts()
             return True, "Student created successfully"
         except Exception as e:
-            conn.rollback()
             return False, str(e)
-        finally:
-            cursor.close()
-            conn.close()
 
     def update(self, student_obj):
         conn = self.db.get_connection() # Get database connection
-        cursor = conn.cursor()
+        cursor = self.db.cursor(conn)
         try:
             conn.start_transaction()
 
@@ -124,8 +118,12 @@ class StudentRepository(BaseRepository):
             # 2. Update Student info (Added major, academic_year)
             stu_sql = "UPDATE Students SET dept_id=%s, academic_status=%s, major=%s, academic_year=%s WHERE student_id=%s"
             cursor.execute(stu_sql, (student_obj.dept_id, student_obj.academic_status, student_obj.major, student_obj.academic_year, student_obj.student_id))
+            self.publish_change("Users", "UPDATE", [student_obj.user_id], conn)
+            self.publish_change("Students", "UPDATE", [student_obj.student_id], conn)
             
             conn.commit()
+            self.invalidate_tables("Users", "Students")
+            self.invalidate_counts()  # Name/email changes move rows in and out of searches
             return True, "Student updated successfully"
         except Exception as e:
             conn.rollback()
@@ -135,9 +133,10 @@ class StudentRepository(BaseRepository):
             conn.close()
 
     def delete(self, student_id):
-        # Check grade constraints
-        check_sql = "SELECT COUNT(*) as count FROM Grades WHERE student_id=%s"
-        res = self.execute_query(check_sql, (student_id,), fetch_one=True)
+        # Check grade constraints (archived grades too: deleting the user would cascade to them)
+        check_sql = ("SELECT (SELECT COUNT(*) FROM Grades WHERE student_id=%s)"
+                     " + (SELECT COUNT(*) FROM Archived_Grades WHERE student_id=%s) as count")
+        res = self.execute_query(check_sql, (student_id, student_id), fetch_one=True)
         if res['count'] > 0:
             return False, "Cannot delete: Student has grade records."
 
@@ -148,6 +147,7 @@ class StudentRepository(BaseRepository):
         sql = "DELETE FROM Users WHERE user_id = %s"
         try:
             self.execute_query(sql, (student.user_id,))
+            self.invalidate_counts()
             return True, "Student deleted successfully"
         except Exception as e:
             return False, str(e)
@@ -161,8 +161,8 @@ class StudentRepository(BaseRepository):
             LEFT JOIN Departments d ON s.dept_id = d.dept_id
             WHERE u.user_id = %s
         """
-        row = self.execute_query(sql, (user_id,), fetch_one=True)
-        return Student.from_db_row(row) if row else None
+        # Cached for non-students too (as "no row"), e.g. admins opening student views
+        return self.fetch_model(Student, sql, (user_id,), cache_ttl=Config.QUERY_CACHE_USER_TTL)
     
     def update_contact_info(self, student_obj):
         """Only update contact information (FR-06)"""
@@ -178,32 +178,33 @@ class StudentRepository(BaseRepository):
         """
         students_list: List of dictionaries [{'code': 'S001', 'name': 'A', ...}]
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        from utils.security import Security
+        if not students_list:
+            return True, "Successfully imported 0 students."
         try:
-            conn.start_transaction()
-            count = 0
-            for s in students_list: # Iterate through student data
-                from utils.security import Security
-                hashed_pw = Security.hash_password(s['code']) 
-                
-                cursor.execute(
-                    "INSERT INTO Users (username, password, full_name, email, role, status) VALUES (%s, %s, %s, %s, 'Student', 'ACTIVE')",
-                    (s['code'], hashed_pw, s['name'], s['email'])
+            # OPTIMIZATION: Two multi-row INSERTs per chunk instead of two round trips per student
+            with UnitOfWork():
+                user_rows = [
+                    (s['code'], Security.hash_password(s['code']), s['name'], s['email'], 'Student', 'ACTIVE')
+                    for s in students_list
+                ]
+                # Ids are read back by username: they are not consecutive with auto_increment_increment > 1
+                user_ids = self.bulk_insert(
+                    "Users", ("username", "password", "full_name", "email", "role", "status"), user_rows,
+                    id_column="user_id", key_column="username"
                 )
-                user_id = cursor.lastrowid
-                
-                cursor.execute(
-                    "INSERT INTO Students (user_id, student_code, dept_id, major, academic_year, academic_status) VALUES (%s, %s, %s, %s, %s, 'ACTIVE')",
-                    (user_id, s['code'], default_dept_id, s.get('major', 'General'), default_year)
+                if len(user_ids) != len(user_rows):
+                    raise RuntimeError("Could not resolve the generated user ids.")
+
+                student_rows = [
+                    (user_id, s['code'], default_dept_id, s.get('major', 'General'), default_year, 'ACTIVE')
+                    for user_id, s in zip(user_ids, students_list)
+                ]
+                self.bulk_insert(
+                    "Students", ("user_id", "student_code", "dept_id", "major", "academic_year", "academic_status"), student_rows
                 )
-                count += 1
-            
-            conn.commit()
-            return True, f"Successfully imported {count} students."
+
+            self.invalidate_counts()
+            return True, f"Successfully imported {len(student_rows)} students."
         except Exception as e:
-            conn.rollback()
             return False, str(e)
-        finally:
-            cursor.close()
-            conn.close()
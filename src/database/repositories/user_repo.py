@@ -2,6 +2,8 @@ from database.repository import BaseRepository
 from models.user import User
 
 class UserRepository(BaseRepository):
+    PLAN_CHECKS = (("get_by_email", ("plan-check@example.com",)), ("get_by_id", (1,)))
+
     def get_by_email(self, email):
         """Get user by email for login check"""
         # Need to retrieve sensitive fields like password, failed_attempts for logic processing
@@ -1,31 +1,511 @@
+import threading
+import time
 from abc import ABC, abstractmethod
+from config import Config
+from database import bulk
 from database.connection import DatabaseConnection
-import mysql.connector
+from database.change_journal import ChangeJournal, parse_write
+from database.count_service import CountService
+from database.instrumentation import QueryStats, caller_tag
+from database.query_cache import QueryCache
+from database.row_mapper import RowMapper
+from database.unit_of_work import UnitOfWork
+from utils.cache import MISSING
+from utils.pagination import PaginationHelper
 
 class BaseRepository(ABC): 
+    # Admin list definition, shared by offset, keyset and streaming reads.
+    # LIST_KEY is a unique sort key: ((sql column, row field), ...)
+    # LIST_TABLE names the entity for cached totals and row estimates.
+    LIST_TABLE = None
+    LIST_COLUMNS = None
+    LIST_FROM = None
+    LIST_KEY = ()
+
+    # Hot reads checked for full table scans by database/plan_check.py:
+    # ((method name, sample args), ...)
+    PLAN_CHECKS = ()
+
+    # Set by plan_check.py on its thread: reads are EXPLAINed instead of executed
+    _explain_plans = threading.local()
+
+    # Set by prefetch() on its thread: cacheable reads are collected instead of executed
+    _prefetch = threading.local()
+
     def __init__(self):
         self.db = DatabaseConnection
 
-    def execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
+    def execute_query(self, query, params=None, fetch_one=False, fetch_all=False, readonly=None,
+                      cache_ttl=None, refresh_cache=False, raw=False):
+        """
+        Runs a single statement. Calls that fetch rows are treated as reads
+        (no commit/rollback round trips) unless `readonly` says otherwise.
+        A single statement commits on its own, so writes skip START TRANSACTION too,
+        except when the change journal is on: the write and its journal entry
+        then commit together.
+        When Config.DB_STATEMENT_CACHE_SIZE > 0 the statement is prepared once per
+        pooled connection and reused.
+        Every statement is timed and recorded under the calling repository
+        method (see database/instrumentation.py).
+
+        cache_ttl: Seconds to keep the rows of a read in the query cache. Writes
+        made through this repository layer evict the cached reads of the tables
+        they touch (see database/query_cache.py).
+        Concurrent misses of the same cached read wait for a single query.
+        A fetch_one that finds no row is cached too, for a shorter TTL
+        (Config.CACHE_NEGATIVE_TTL).
+        refresh_cache: Skip the cached rows and store fresh ones (e.g. a "Refresh" button).
+        raw: Read through a tuple cursor and return (column_names, rows) instead of
+        dictionaries (see fetch_models).
+        """
+        if readonly is None:
+            readonly = fetch_one or fetch_all
+        plans = getattr(self._explain_plans, 'plans', None)
+        if plans is not None and (fetch_one or fetch_all):
+            return self._explain(plans, query, params, fetch_one, raw)
+        cache_key = None
+        if cache_ttl and (fetch_one or fetch_all):
+            cache_key = QueryCache.key(query, (params, fetch_one, raw))
+            cached = MISSING if refresh_cache else QueryCache.lookup(cache_key)
+            if cached is not MISSING:
+                return ((), None) if cached is None and raw else cached
+            reads = getattr(self._prefetch, 'reads', None)
+            if reads is not None:
+                reads.append((cache_key, query, params, fetch_one, raw, cache_ttl))
+                empty = None if fetch_one else []
+                return ((), empty) if raw else empty
+
+        tag = caller_tag()
+        # A journaled write runs in a transaction with its journal entry (see
+        # _journal_statement), so other clients never miss or see phantom changes
+        journaled = not (fetch_one or fetch_all) and Config.CHANGE_JOURNAL_ENABLED and parse_write(query)
+
+        def run():
+            with self.db.session(readonly=readonly, autocommit=not journaled) as connection:
+                start = time.perf_counter()
+                result, rows = self._run_statement(connection, query, params, fetch_one, fetch_all, raw)
+                QueryStats.record(tag, query, params, time.perf_counter() - start, rows, connection.wait_time)
+                if journaled:
+                    self._journal_statement(connection, query, result)
+            if raw and fetch_one and result[1] is None and cache_key is not None:
+                return None  # No row: cached as a negative entry, without its columns
+            return result
+
         try:
-            with self.db.get_cursor(dictionary=True) as cursor:
-                cursor.execute(query, params or ())
-                
-                if fetch_one:
-                    return cursor.fetchone()
-                
-                if fetch_all:
-                    return cursor.fetchall()
-                
-                return cursor.lastrowid
-                
-        except mysql.connector.Error as e:
-            print(f"Database Error: {e}")
+            if cache_key is None:
+                result = run()
+                if not (fetch_one or fetch_all):
+                    self.invalidate_statement(query)
+                return result
+            if refresh_cache:
+                version = QueryCache.version()
+                result = run()
+                QueryCache.set(cache_key, query, result, cache_ttl, version)
+            else:
+                # Single flight: concurrent misses of the same read share one query
+                result = QueryCache.get_or_load(cache_key, query, run, cache_ttl)
+            return ((), None) if result is None and raw else result
+        except self.db.get_backend().Error as e:
+            print(f"Database Error in {tag}: {e}")
             raise e
         except Exception as e:
-            print(f"System Error: {e}")
+            print(f"System Error in {tag}: {e}")
             raise e
 
+    def _run_statement(self, connection, query, params, fetch_one, fetch_all, raw=False):
+        """Executes one statement for execute_query. Returns (result, row count)."""
+        statements = self.db.statement_cache(connection)
+        if statements is not None:
+            # Server-side prepared statement, reused across calls on this connection
+            cursor = statements.execute(query, params or ())
+            if raw and (fetch_one or fetch_all):
+                rows = cursor.fetchall()  # Prepared cursors already return tuples
+                if fetch_one:
+                    return (cursor.column_names, rows[0] if rows else None), min(len(rows), 1)
+                return (cursor.column_names, rows), len(rows)
+            if fetch_one or fetch_all:
+                rows = statements.fetch_dicts(cursor)
+                if fetch_one:
+                    return (rows[0] if rows else None), min(len(rows), 1)
+                return rows, len(rows)
+            return cursor.lastrowid, max(cursor.rowcount, 0)
+
+        cursor = connection.cursor(dictionary=not raw)
+        try:
+            cursor.execute(query, params or ())
+
+            if fetch_one:
+                row = cursor.fetchone()
+                if row is not None:
+                    cursor.fetchall()  # Unbuffered cursor: read the rest so close() finds no pending result
+                return ((cursor.column_names, row) if raw else row), 1 if row else 0
+
+            if fetch_all:
+                rows = cursor.fetchall()
+                return ((cursor.column_names, rows) if raw else rows), len(rows)
+
+            return cursor.lastrowid, max(cursor.rowcount, 0)
+        finally:
+            cursor.close()
+
+    def execute_iter(self, query, params=None, batch_size=500, model=None):
+        """
+        Generator that streams the rows of a SELECT as dictionaries, or as
+        `model` instances mapped from a tuple cursor (see fetch_models).
+        Uses an unbuffered cursor and fetchmany(batch_size), so at most one
+        batch is held in memory. The connection stays checked out until the
+        generator is exhausted or closed.
+
+        Usage:
+            for row in repo.execute_iter("SELECT * FROM Grades", batch_size=1000):
+                ...
+        """
+        plans = getattr(self._explain_plans, 'plans', None)
+        if plans is not None:
+            self._explain(plans, query, params, False, False)
+            return
+        tag = caller_tag()
+        count = 0
+        elapsed = 0.0  # Time spent in the driver only, not in the consumer's loop body
+        try:
+            with self.db.session(readonly=True) as connection:
+                start = time.perf_counter()
+                cursor = connection.cursor(dictionary=model is None, buffered=False)
+                cursor.execute(query, params or ())
+                elapsed += time.perf_counter() - start
+                to_model = RowMapper.plan(model, tuple(cursor.column_names)) if model is not None else None
+                exhausted = False
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        rows = cursor.fetchmany(batch_size)
+                        elapsed += time.perf_counter() - start
+                        if not rows:
+                            exhausted = True
+                            break
+                        count += len(rows)
+                        if to_model is not None:
+                            yield from map(to_model, rows)
+                        else:
+                            yield from rows
+                finally:
+                    QueryStats.record(tag, query, params, elapsed, count, connection.wait_time)
+                    if not exhausted:
+                        # Consumer stopped early: drain unread rows so the connection
+                        # goes back to the pool without a pending result set
+                        while cursor.fetchmany(batch_size):
+                            pass
+                    cursor.close()
+        except self.db.get_backend().Error as e:
+            print(f"Database Error in {tag}: {e}")
+            raise e
+
+    def _explain(self, plans, query, params, fetch_one, raw):
+        """Records the query plan of a read for plan_check.py and returns an empty result."""
+        with self.db.session(readonly=True) as connection:
+            cursor = connection.cursor()
+            try:
+                plans.append((caller_tag(), query, self.db.get_backend().explain(cursor, query, params)))
+            finally:
+                cursor.close()
+        empty = None if fetch_one else []
+        return ((), empty) if raw else empty
+
+    @classmethod
+    def prefetch(cls, *calls):
+        """
+        Loads the cached reads of several independent repository calls in a
+        single round trip (one multi-statement query on MySQL), so the calls
+        themselves are then answered from the query cache.
+
+        Each call is run once in collect mode: reads with a cache_ttl that
+        miss the cache are recorded and return empty results, anything else
+        runs as usual. Only pass calls whose reads do not depend on each other.
+
+        Usage:
+            BaseRepository.prefetch(
+                lambda: grade_repo.get_by_student(student_id),
+                lambda: class_repo.get_schedule_by_student(student_id),
+            )
+            transcript = grade_repo.get_by_student(student_id)  # cache hit
+        """
+        reads = cls._prefetch.reads = []
+        try:
+            for call in calls:
+                call()
+        finally:
+            cls._prefetch.reads = None
+
+        pending = {}
+        for read in reads:
+            pending.setdefault(read[0], read)  # Same statement requested twice
+        if not pending:
+            return
+        reads = list(pending.values())
+
+        tag = caller_tag()
+        backend = DatabaseConnection.get_backend()
+        version = QueryCache.version()
+        try:
+            with DatabaseConnection.session(readonly=True) as connection:
+                start = time.perf_counter()
+                results = backend.fetch_batch(connection, [(query, params) for _, query, params, _, _, _ in reads])
+                elapsed = time.perf_counter() - start
+                QueryStats.record(tag, "; ".join(read[1] for read in reads), None, elapsed,
+                                  sum(len(rows) for _, rows in results), connection.wait_time)
+        except backend.Error as e:
+            # The calls fall back to their own queries
+            print(f"Database Error in {tag} (prefetch): {e}")
+            return
+
+        for (cache_key, query, _, fetch_one, raw, cache_ttl), (columns, rows) in zip(reads, results):
+            if fetch_one:
+                rows = rows[:1]
+            if not raw:
+                rows = [dict(zip(columns, row)) for row in rows]
+                result = (rows[0] if rows else None) if fetch_one else rows
+            elif fetch_one:
+                result = (columns, rows[0]) if rows else None
+            else:
+                result = (columns, rows)
+            QueryCache.set(cache_key, query, result, cache_ttl, version)
+
+    def fetch_models(self, model, query, params=None, cache_ttl=None, refresh_cache=False):
+        """
+        Runs a SELECT on a tuple cursor and maps the rows to `model` instances.
+        The column-index plan is built once per (model, column list), so no
+        per-row dictionaries are created (see database/row_mapper.py).
+        Cached reads keep the compact tuple rows, not the models.
+        """
+        columns, rows = self.execute_query(query, params, fetch_all=True, raw=True,
+                                           cache_ttl=cache_ttl, refresh_cache=refresh_cache)
+        return RowMapper.map_rows(model, columns, rows)
+
+    def fetch_model(self, model, query, params=None, cache_ttl=None, refresh_cache=False):
+        """Single-row fetch_models(): the first row as a `model`, or None."""
+        columns, row = self.execute_query(query, params, fetch_one=True, raw=True,
+                                          cache_ttl=cache_ttl, refresh_cache=refresh_cache)
+        return RowMapper.plan(model, tuple(columns))(row) if row is not None else None
+
+    def execute_many(self, query, seq_params, chunk_size=None):
+        """
+        Runs one statement for many parameter sets in a single transaction
+        (or the active UnitOfWork). INSERT ... VALUES statements are sent as
+        multi-row INSERTs, Config.DB_BULK_CHUNK_SIZE rows at a time.
+        Returns the number of affected rows.
+        """
+        with self.db.session() as connection:
+            cursor = self.db.cursor(connection)
+            try:
+                affected = bulk.execute_many(cursor, query, seq_params, chunk_size or Config.DB_BULK_CHUNK_SIZE)
+            finally:
+                cursor.close()
+            self._journal_statement(connection, query)
+        self.invalidate_statement(query)
+        return affected
+
+    def bulk_insert(self, table, columns, rows, chunk_size=None, update_columns=None,
+                    id_column=None, key_column=None):
+        """
+        Multi-row INSERT of `rows` (tuples ordered like `columns`) in one transaction.
+        With `update_columns`, existing keys are updated instead (ON DUPLICATE KEY UPDATE).
+        Returns the generated `id_column` values in row order, looked up by the
+        UNIQUE `key_column` (empty without them and for upserts), see database/bulk.py.
+        """
+        with self.db.session() as connection:
+            cursor = self.db.cursor(connection)
+            try:
+                ids = bulk.bulk_insert(cursor, table, columns, rows,
+                                       chunk_size or Config.DB_BULK_CHUNK_SIZE, update_columns,
+                                       id_column, key_column)
+            finally:
+                cursor.close()
+            ChangeJournal.record(connection, table, 'UPDATE' if update_columns else 'INSERT', ids or None)
+        self.invalidate_tables(table)
+        return ids
+
+    def bulk_update(self, table, key_column, columns, rows, chunk_size=None, where=None):
+        """
+        Updates many rows by key in one transaction. rows: tuples of (key, *values of columns).
+        Returns the keys of the rows updated (rows that exist and match `where`), see database/bulk.py.
+        """
+        with self.db.session() as connection:
+            cursor = self.db.cursor(connection)
+            try:
+                updated = bulk.bulk_update(cursor, table, key_column, columns, rows,
+                                           chunk_size or Config.DB_BULK_CHUNK_SIZE, where)
+            finally:
+                cursor.close()
+            if updated:
+                ChangeJournal.record(connection, table, 'UPDATE', updated)
+        if updated:
+            self.invalidate_tables(table)
+        return updated
+
+    def _search_filters(self, search_query):
+        """Returns ([sql conditions], [params]) for a list search. Override per repository."""
+        return [], []
+
+    @staticmethod
+    def _where(conditions):
+        return " WHERE " + " AND ".join(f"({c})" for c in conditions) if conditions else ""
+
+    def _list_query(self, search_query=None):
+        """Builds the list SELECT (filtered by search, ordered by LIST_KEY) and its parameters."""
+        filters, params = self._search_filters(search_query)
+        sql = f"SELECT {self.LIST_COLUMNS} {self.LIST_FROM}"
+        sql += self._where(filters)
+        sql += " ORDER BY " + ", ".join(f"{column} ASC" for column, _ in self.LIST_KEY)
+        return sql, list(params)
+
+    def _fetch_rows(self, sql, params, model=None):
+        """Dictionary rows, or `model` instances through the tuple-cursor mapping when given."""
+        if model is not None:
+            return self.fetch_models(model, sql, params)
+        return self.execute_query(sql, params, fetch_all=True)
+
+    def fetch_offset_page(self, page=None, per_page=None, search_query=None, model=None):
+        """
+        LIMIT/OFFSET page of the list plus its total. The total comes from
+        CountService, so turning pages only runs the page query.
+        Returns a tuple: (list_of_rows, total_count), rows mapped to `model` if given
+        """
+        sql, params = self._list_query(search_query)
+        if page is None or per_page is None:
+            rows = self._fetch_rows(sql, tuple(params), model)
+            return rows, len(rows)
+
+        offset = (page - 1) * per_page
+        sql += " LIMIT %s OFFSET %s"
+        params.extend([per_page, offset])
+        rows = self._fetch_rows(sql, tuple(params), model)
+        return rows, self.count_list(search_query)
+
+    def count_list(self, search_query=None):
+        """Total rows of the list for a search term, cached briefly (see CountService)."""
+        return CountService.get_count(self, search_query)
+
+    def invalidate_counts(self):
+        """Call after writes that add or remove rows of LIST_TABLE (deferred to the commit inside a UnitOfWork)."""
+        UnitOfWork.on_commit(lambda: CountService.invalidate(self.LIST_TABLE))
+
+    def invalidate_tables(self, *tables):
+        """
+        Evicts cached reads of `tables` and pins this thread's reads to the
+        primary for a while (DatabaseConnection.mark_write). Call after writes
+        made with a manual cursor; execute_query and the bulk methods do it
+        themselves. Inside a UnitOfWork both are repeated after the commit, so
+        other threads cannot re-cache the pre-commit rows.
+        """
+        QueryCache.invalidate_tables(*tables)
+        self.db.mark_write()
+        if self.db.current_unit_of_work() is not None:
+            UnitOfWork.on_commit(lambda: self._written(QueryCache.invalidate_tables, *tables))
+
+    def invalidate_statement(self, query):
+        """invalidate_tables() for the tables a write statement touches."""
+        QueryCache.invalidate_statement(query)
+        self.db.mark_write()
+        if self.db.current_unit_of_work() is not None:
+            UnitOfWork.on_commit(lambda: self._written(QueryCache.invalidate_statement, query))
+
+    def _written(self, invalidate, *args):
+        """After-commit part of invalidate_tables / invalidate_statement."""
+        invalidate(*args)
+        self.db.mark_write()
+
+    def _journal_statement(self, connection, query, lastrowid=None):
+        """Journals the table written by `query` (with the new row id for single-row INSERTs)."""
+        write = parse_write(query)
+        if write is not None:
+            table, operation = write
+            row_ids = [lastrowid] if operation == 'INSERT' and lastrowid else None
+            ChangeJournal.record(connection, table, operation, row_ids)
+
+    def publish_change(self, table, operation, row_ids=None, connection=None):
+        """
+        Journals a write made with a manual cursor so other clients evict their
+        caches (see database/change_journal.py). Pass the writer's `connection`
+        before its COMMIT to journal atomically; otherwise the active UnitOfWork
+        (or a new autocommit session) is used.
+        """
+        if connection is not None:
+            ChangeJournal.record(connection, table, operation, row_ids)
+            return
+        with self.db.session(autocommit=True) as connection:
+            ChangeJournal.record(connection, table, operation, row_ids)
+
+    def fetch_keyset_page(self, per_page=50, cursor=None, search_query=None, model=None):
+        """
+        Keyset (seek) pagination over LIST_KEY. Unlike LIMIT/OFFSET, the cost of a
+        page does not grow with its depth: the query seeks directly past the
+        boundary row carried in the cursor.
+
+        Args:
+            per_page: Rows per page
+            cursor: Opaque token (next_cursor / prev_cursor of a previous page), None for the first page
+            search_query: Optional search term, see _search_filters
+            model: Map rows to this model (tuple cursor) instead of returning dicts
+
+        Returns:
+            dict with 'data' (row dicts or models), 'total_items', 'next_cursor', 'prev_cursor', 'has_next', 'has_prev'
+        """
+        direction, boundary = PaginationHelper.decode_cursor(cursor) if cursor else ('next', None)
+        return self._keyset_page(per_page, direction, boundary, search_query, model)
+
+    def _keyset_page(self, per_page, direction, boundary, search_query, model):
+        """
+        One page of fetch_keyset_page. Without a boundary, 'next' is the
+        first page and 'prev' the last one.
+        """
+        columns = [column for column, _ in self.LIST_KEY]
+        fields = [field for _, field in self.LIST_KEY]
+
+        filters, filter_params = self._search_filters(search_query)
+        conditions = list(filters)
+        params = list(filter_params)
+        if boundary is not None:
+            seek_sql, seek_params = PaginationHelper.seek_condition(columns, boundary, direction)
+            conditions.append(seek_sql)
+            params.extend(seek_params)
+
+        order = "DESC" if direction == 'prev' else "ASC"
+        sql = f"SELECT {self.LIST_COLUMNS} {self.LIST_FROM}{self._where(conditions)}"
+        sql += " ORDER BY " + ", ".join(f"{column} {order}" for column in columns)
+        sql += " LIMIT %s"
+        params.append(per_page + 1)  # One extra row tells us whether another page exists
+
+        rows = self._fetch_rows(sql, tuple(params), model)
+        total = self.count_list(search_query)
+
+        if not rows and boundary is not None:
+            # The rows past the boundary were deleted meanwhile: step back to the
+            # page next to it, i.e. the last page going forward, the first going back
+            fallback = 'prev' if direction == 'next' else 'next'
+            return self._keyset_page(per_page, fallback, None, search_query, model)
+
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if direction == 'prev':
+            rows.reverse()
+            has_prev, has_next = has_more, boundary is not None
+        else:
+            has_prev, has_next = boundary is not None, has_more
+
+        def key_of(row):
+            if model is not None:
+                return tuple(getattr(row, field) for field in fields)
+            return tuple(row[field] for field in fields)
+
+        return {
+            'data': rows,
+            'total_items': total,
+            'next_cursor': PaginationHelper.encode_cursor('next', key_of(rows[-1])) if has_next and rows else None,
+            'prev_cursor': PaginationHelper.encode_cursor('prev', key_of(rows[0])) if has_prev and rows else None,
+            'has_next': has_next and bool(rows),
+            'has_prev': has_prev and bool(rows),
+        }
+
     @abstractmethod
     def get_all(self):
         pass
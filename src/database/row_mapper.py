@@ -0,0 +1,91 @@
+"""
+Maps tuple rows to models through a column-index plan.
+
+Dictionary cursors build one dict per row, and from_db_row then filtered
+those dicts and setattr'd every JOIN column. Here a plan is built once per
+(model, column list): which column index feeds which constructor field,
+defaults for fields the statement does not select, and a namedtuple type
+for the extra JOIN columns (course_name, credits, ...). Mapping a row is
+then two C-level itemgetter calls and one model constructor call.
+
+Models opt in by defining:
+    ROW_FIELDS    field names, in the order from_values() receives them
+    ROW_DEFAULTS  values for fields missing from the statement
+    from_values(values, extra)   classmethod building the instance
+"""
+import threading
+from collections import namedtuple
+from operator import itemgetter
+
+
+def _getter(indices):
+    """itemgetter that always returns a tuple, even for a single index."""
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda row: (row[index],)
+    return itemgetter(*indices)
+
+
+class RowMapper:
+    _plans = {}  # (model, column names) -> row builder
+    _lock = threading.Lock()
+
+    @classmethod
+    def plan(cls, model, columns):
+        """Returns a function mapping one tuple row (ordered like `columns`) to a `model`."""
+        key = (model, columns)
+        builder = cls._plans.get(key)
+        if builder is None:
+            builder = cls._build_plan(model, columns)
+            with cls._lock:
+                cls._plans[key] = builder
+        return builder
+
+    @staticmethod
+    def _build_plan(model, columns):
+        positions = {}
+        for i, name in enumerate(columns):
+            positions.setdefault(name, i)  # "s.*, u.*" repeats user_id; first wins
+
+        fields = model.ROW_FIELDS
+        indices = []
+        pad = []
+        for field in fields:
+            if field in positions:
+                indices.append(positions[field])
+            else:
+                # Missing fields read their default from a pad appended to the row
+                indices.append(len(columns) + len(pad))
+                pad.append(model.ROW_DEFAULTS.get(field))
+        pad = tuple(pad)
+        get_values = _getter(indices)
+
+        field_set = set(fields)
+        extra_names = [name for name, i in positions.items() if name not in field_set]
+        from_values = model.from_values
+
+        if not extra_names:
+            if pad:
+                return lambda row: from_values(get_values(row + pad), None)
+            return lambda row: from_values(get_values(row), None)
+
+        extra_type = namedtuple(f"{model.__name__}Extra", extra_names, rename=True)
+        make_extra = extra_type._make
+        get_extra = _getter([positions[name] for name in extra_names])
+        if pad:
+            return lambda row: from_values(get_values(row + pad), make_extra(get_extra(row)))
+        return lambda row: from_values(get_values(row), make_extra(get_extra(row)))
+
+    @classmethod
+    def map_rows(cls, model, columns, rows):
+        """Maps a list of tuple rows in one pass."""
+        if not rows:
+            return []
+        return list(map(cls.plan(model, tuple(columns)), rows))
+
+    @classmethod
+    def map_dict(cls, model, row):
+        """Maps a single dictionary row (compatibility path for from_db_row)."""
+        if not row:
+            return None
+        return cls.plan(model, tuple(row))(tuple(row.values()))
@@ -0,0 +1,521 @@
+"""
+Embedded SQLite backend for tests and benchmarks (Config.DB_BACKEND = "sqlite").
+
+Runs the repository layer without a MySQL server: the schema is loaded from
+docs/sql_script/*.sql and every statement is rewritten from the MySQL dialect
+this code base uses into SQLite, e.g.
+    %s placeholders            -> ?
+    # comments, "strings"       -> removed / 'strings'
+    ENUM('A', 'B')              -> TEXT CHECK (col IN ('A', 'B'))
+    INT AUTO_INCREMENT PRIMARY KEY -> INTEGER PRIMARY KEY AUTOINCREMENT
+    INDEX idx (col) in CREATE TABLE -> separate CREATE INDEX
+    NOW(), NOW() - INTERVAL n SECOND -> datetime('now', 'localtime', ...)
+    SQL_CALC_FOUND_ROWS / FOUND_ROWS() -> emulated with a COUNT(*) of the statement
+    ON DUPLICATE KEY UPDATE c = VALUES(c) -> ON CONFLICT DO UPDATE SET c = excluded.c
+    UPDATE t JOIN (...) v ON ... SET ...  -> UPDATE t SET ... FROM (...) v WHERE ...
+    DELETE ... LIMIT n          -> DELETE ... WHERE rowid IN (SELECT ... LIMIT n)
+    SELECT ... FOR UPDATE       -> SELECT ... (writers are serialized per database)
+
+SQLITE_PATH=":memory:" (default) keeps the database in memory, shared by all
+pooled connections of the process; shared-cache tables lock per transaction,
+so use a file path for multi-threaded benchmarks.
+
+Usage:
+    DB_BACKEND=sqlite python -m pytest
+    DatabaseConnection.use_backend(create_backend("sqlite"))
+"""
+import datetime
+import decimal
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import urllib.parse
+from collections import namedtuple
+
+from database.backend import DatabaseBackend, PlanStep
+from database.migrations import MigrationRunner
+
+# MySQL returns datetime / date / Decimal objects, so SQLite does too
+sqlite3.register_adapter(decimal.Decimal, float)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+
+
+def _converter(parse):
+    def convert(value):
+        text = value.decode()
+        try:
+            return parse(text)
+        except ValueError:
+            return text
+    return convert
+
+
+sqlite3.register_converter("DATETIME", _converter(datetime.datetime.fromisoformat))
+sqlite3.register_converter("TIMESTAMP", _converter(datetime.datetime.fromisoformat))
+sqlite3.register_converter("DATE", _converter(datetime.date.fromisoformat))
+sqlite3.register_converter("DECIMAL", _converter(decimal.Decimal))
+
+
+# --- Dialect translation ---------------------------------------------------
+
+# String literals are masked before rewriting, comments dropped
+_LITERAL_RE = re.compile(
+    r"'(?:[^'\\]|\\.|'')*'"       # 'single quoted'
+    r'|"(?:[^"\\]|\\.|"")*"'      # "double quoted" (a string in MySQL)
+    r"|--[^\n]*|#[^\n]*"          # line comments
+    r"|/\*.*?\*/",                # block comments
+    re.DOTALL
+)
+_MASK_RE = re.compile(r"\x00(\d+)\x00")
+
+_ENUM_RE = re.compile(r"(`?\w+`?)\s+ENUM\s*\(([^)]*)\)", re.IGNORECASE)
+_AUTO_PK_RE = re.compile(
+    r"\b(?:BIG|SMALL|TINY|MEDIUM)?INT(?:\(\d+\))?(?:\s+UNSIGNED)?(?:\s+NOT\s+NULL)?\s+AUTO_INCREMENT\s+PRIMARY\s+KEY",
+    re.IGNORECASE
+)
+_INLINE_INDEX_RE = re.compile(r",\s*(UNIQUE\s+)?(?:INDEX|KEY)\s+`?(\w+)`?\s*\(([^)]*)\)", re.IGNORECASE)
+_TABLE_OPTIONS_RE = re.compile(r"\)\s*(?:ENGINE|DEFAULT\s+CHARSET|CHARACTER\s+SET|COLLATE)\b[^)]*$", re.IGNORECASE)
+_CREATE_TABLE_RE = re.compile(r"^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?", re.IGNORECASE)
+_ALTER_TABLE_RE = re.compile(r"^\s*ALTER\s+TABLE\s+`?(\w+)`?\s+(.*)$", re.IGNORECASE | re.DOTALL)
+_INTERVAL_RE = re.compile(
+    r"(?:NOW\(\)|CURRENT_TIMESTAMP(?:\(\))?)\s*([+-])\s*INTERVAL\s+(%s|\?|\d+)\s+(SECOND|MINUTE|HOUR|DAY|MONTH|YEAR)\b",
+    re.IGNORECASE
+)
+_UPDATE_JOIN_RE = re.compile(r"^\s*UPDATE\s+(`?\w+`?)\s+(\w+)\s+JOIN\s*\(", re.IGNORECASE)
+_UPDATE_JOIN_TAIL_RE = re.compile(r"^\s*(\w+)\s+ON\s+(.*?)\s+SET\s+(.*?)(?:\s+WHERE\s+(.*))?\s*$", re.IGNORECASE | re.DOTALL)
+_DELETE_LIMIT_RE = re.compile(r"^\s*DELETE\s+FROM\s+(`?\w+`?)\s+(WHERE\s+.*?)\s+LIMIT\s+(\S+)\s*$", re.IGNORECASE | re.DOTALL)
+_UPSERT_RE = re.compile(r"\s*\bON\s+DUPLICATE\s+KEY\s+UPDATE\s+", re.IGNORECASE)
+_UPSERT_VALUES_RE = re.compile(r"\bVALUES\s*\(\s*(`?\w+`?)\s*\)", re.IGNORECASE)
+_TRAILING_LIMIT_RE = re.compile(r"\s+LIMIT\s+[^()]*$", re.IGNORECASE)
+
+# Simple token rewrites applied to every statement (strings masked)
+_REWRITES = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"%%"), "%"),
+    (re.compile(r"^\s*START\s+TRANSACTION\b.*$", re.IGNORECASE | re.DOTALL), "BEGIN"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\bSQL_CALC_FOUND_ROWS\b\s*", re.IGNORECASE), ""),
+    (re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE), ""),
+    (re.compile(r"\bNOW\(\)|\bCURRENT_TIMESTAMP\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+    (re.compile(r"\bCURDATE\(\)|\bCURRENT_DATE\(\)", re.IGNORECASE), "date('now', 'localtime')"),
+    (re.compile(r"\bDATABASE\(\)", re.IGNORECASE), "'main'"),
+    (re.compile(r"\bIF\s*\(", re.IGNORECASE), "IIF("),
+    (re.compile(r"\bGREATEST\s*\(", re.IGNORECASE), "MAX("),
+    (re.compile(r"\bLEAST\s*\(", re.IGNORECASE), "MIN("),
+    (re.compile(r"^\s*TRUNCATE\s+(?:TABLE\s+)?", re.IGNORECASE), "DELETE FROM "),
+    (re.compile(r"^\s*SET\s+FOREIGN_KEY_CHECKS\s*=\s*(\d)\s*$", re.IGNORECASE), r"PRAGMA foreign_keys = \1"),
+    (re.compile(r"^\s*SHOW\s+TABLES\s+LIKE\s+(.*)$", re.IGNORECASE | re.DOTALL),
+     r"SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE \1"),
+    (re.compile(r"^\s*SHOW\s+(?:FULL\s+)?COLUMNS\s+FROM\s+`?(\w+)`?\s+LIKE\s+(.*)$", re.IGNORECASE | re.DOTALL),
+     r"SELECT name AS Field, type AS Type FROM pragma_table_info('\1') WHERE name LIKE \2"),
+    (re.compile(r"^\s*SHOW\s+(?:INDEX|INDEXES|KEYS)\s+FROM\s+`?(\w+)`?\s*$", re.IGNORECASE),
+     r"SELECT '\1' AS `Table`, name AS Key_name FROM pragma_index_list('\1')"),
+    (re.compile(r"^\s*DROP\s+INDEX\s+`?(\w+)`?\s+ON\s+`?\w+`?\s*$", re.IGNORECASE), r"DROP INDEX IF EXISTS \1"),
+]
+
+# One translated statement. count_sql/count_params emulate SQL_CALC_FOUND_ROWS
+# (count_params: how many trailing parameters belong to the stripped LIMIT).
+Statement = namedtuple("Statement", "sql is_insert count_sql count_params uses_found_rows")
+
+
+def _mask(sql):
+    """Replaces string literals by \\x00N\\x00 markers and drops comments."""
+    literals = []
+
+    def replace(match):
+        token = match.group(0)
+        if token[0] in "-#/":
+            return " "
+        if token[0] == '"':
+            token = "'" + token[1:-1].replace('""', '"').replace("'", "''") + "'"
+        literals.append(token.replace("\\'", "''"))
+        return f"\x00{len(literals) - 1}\x00"
+
+    return _LITERAL_RE.sub(replace, sql), literals
+
+
+def _unmask(sql, literals):
+    return _MASK_RE.sub(lambda m: literals[int(m.group(1))], sql)
+
+
+def _split_top_level(text, separator=","):
+    """Splits on `separator` outside parentheses (text must be masked)."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _closing_paren(text, start):
+    """Index of the parenthesis closing the one opened just before `start`."""
+    depth = 1
+    for i in range(start, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise sqlite3.ProgrammingError("Unbalanced parentheses")
+
+
+def _create_table(sql):
+    table = _CREATE_TABLE_RE.match(sql).group(1)
+    sql = _ENUM_RE.sub(lambda m: f"{m.group(1)} TEXT CHECK ({m.group(1)} IN ({m.group(2)}))", sql)
+    sql = _AUTO_PK_RE.sub("INTEGER PRIMARY KEY AUTOINCREMENT", sql)
+    sql = re.sub(r"\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP", "", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bDEFAULT\s+CURRENT_TIMESTAMP\b", "DEFAULT (datetime('now', 'localtime'))", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\s+UNSIGNED\b|\s+(?:CHARACTER\s+SET|COLLATE)\s+\w+", "", sql, flags=re.IGNORECASE)
+    sql = _TABLE_OPTIONS_RE.sub(")", sql)
+
+    indexes = []
+    def move_index(match):
+        unique, name, columns = match.groups()
+        indexes.append(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        return ""
+    sql = _INLINE_INDEX_RE.sub(move_index, sql)
+    return [sql] + indexes
+
+
+def _alter_table(sql):
+    """Splits multi-clause ALTER TABLE (SQLite takes one ADD COLUMN per statement)."""
+    table, clauses = _ALTER_TABLE_RE.match(sql).groups()
+    statements = []
+    for clause in _split_top_level(clauses):
+        add_index = re.match(r"ADD\s+(UNIQUE\s+)?(?:INDEX|KEY)\s+`?(\w+)`?\s*\(([^)]*)\)$", clause, re.IGNORECASE)
+        if add_index:
+            unique, name, columns = add_index.groups()
+            statements.append(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        elif re.match(r"ADD\s+(?!CONSTRAINT|FOREIGN|PRIMARY|INDEX|KEY|UNIQUE)", clause, re.IGNORECASE):
+            clause = re.sub(r"\s+(?:AFTER\s+`?\w+`?|FIRST)\s*$", "", clause, flags=re.IGNORECASE)
+            if not re.match(r"ADD\s+COLUMN\b", clause, re.IGNORECASE):
+                clause = "ADD COLUMN " + clause[3:].lstrip()
+            statements.append(f"ALTER TABLE {table} {clause}")
+        elif re.match(r"(?:DROP\s+(?:COLUMN\s+)?`?\w+`?|RENAME\s+.*)$", clause, re.IGNORECASE):
+            statements.append(f"ALTER TABLE {table} {clause}")
+        else:
+            raise sqlite3.NotSupportedError(f"ALTER TABLE clause not supported by the SQLite backend: {clause}")
+    return statements
+
+
+def _update_join(sql, match):
+    """UPDATE t a JOIN (derived) v ON cond SET a.x = v.x [WHERE w] -> UPDATE ... FROM."""
+    table, alias = match.groups()
+    end = _closing_paren(sql, match.end())
+    derived = sql[match.end() - 1:end + 1]
+    tail = _UPDATE_JOIN_TAIL_RE.match(sql[end + 1:])
+    if not tail:
+        raise sqlite3.NotSupportedError("UPDATE ... JOIN form not supported by the SQLite backend")
+    derived_alias, condition, assignments, where = tail.groups()
+    # SQLite assignment targets cannot be qualified
+    assignments = re.sub(rf"(^|,)\s*{alias}\.", r"\1 ", assignments).strip()
+    sql = f"UPDATE {table} AS {alias} SET {assignments} FROM {derived} AS {derived_alias} WHERE {condition}"
+    if where:
+        sql += f" AND ({where})"
+    return sql
+
+
+def _translate_one(sql):
+    stripped = sql.strip()
+    if not stripped:
+        return []
+    if re.match(r"(?:CREATE\s+DATABASE|USE)\b", stripped, re.IGNORECASE):
+        return []  # One embedded database, no schemas
+    if _CREATE_TABLE_RE.match(stripped):
+        return [Statement(s, False, None, 0, False) for s in _create_table(stripped)]
+    if _ALTER_TABLE_RE.match(stripped):
+        return [Statement(s, False, None, 0, False) for s in _alter_table(stripped)]
+
+    calc_found_rows = re.search(r"\bSQL_CALC_FOUND_ROWS\b", stripped, re.IGNORECASE) is not None
+    uses_found_rows = re.search(r"\bFOUND_ROWS\(\)", stripped, re.IGNORECASE) is not None
+
+    match = _UPDATE_JOIN_RE.match(stripped)
+    if match:
+        stripped = _update_join(stripped, match)
+    stripped = _INTERVAL_RE.sub(
+        lambda m: f"datetime('now', 'localtime', '{m.group(1)}' || {m.group(2)} || ' {m.group(3).lower()}s')", stripped
+    )
+    upsert = _UPSERT_RE.search(stripped)
+    if upsert:
+        assignments = _UPSERT_VALUES_RE.sub(r"excluded.\1", stripped[upsert.end():])
+        stripped = stripped[:upsert.start()] + " ON CONFLICT DO UPDATE SET " + assignments
+    match = _DELETE_LIMIT_RE.match(stripped)
+    if match:
+        table, where, limit = match.groups()
+        stripped = f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} {where} LIMIT {limit})"
+    for pattern, replacement in _REWRITES:
+        stripped = pattern.sub(replacement, stripped)
+
+    count_sql, count_params = None, 0
+    if calc_found_rows:
+        limit = _TRAILING_LIMIT_RE.search(stripped)
+        body = stripped[:limit.start()] if limit else stripped
+        count_sql = f"SELECT COUNT(*) FROM ({body})"
+        count_params = limit.group(0).count("?") if limit else 0
+    is_insert = re.match(r"INSERT\b(?!.*\bON\s+CONFLICT\b)", stripped, re.IGNORECASE | re.DOTALL) is not None
+    return [Statement(stripped, is_insert, count_sql, count_params, uses_found_rows)]
+
+
+_translations = {}
+_translations_lock = threading.Lock()
+
+
+def translate(sql):
+    """MySQL statement -> list of SQLite Statements (cached per SQL text)."""
+    statements = _translations.get(sql)
+    if statements is None:
+        masked, literals = _mask(sql)
+        statements = [
+            s._replace(sql=_unmask(s.sql, literals),
+                       count_sql=_unmask(s.count_sql, literals) if s.count_sql else None)
+            for s in _translate_one(masked)
+        ]
+        with _translations_lock:
+            if len(_translations) > 2000:
+                _translations.clear()
+            _translations[sql] = statements
+    return statements
+
+
+def split_script(script):
+    """Splits a .sql script into statements (semicolons inside strings and comments ignored)."""
+    masked, literals = _mask(script)
+    return [_unmask(part, literals) for part in masked.split(";") if part.strip()]
+
+
+# --- Driver shims ------------------------------------------------------------
+
+class SQLiteCursor:
+    """Cursor with the mysql.connector interface used by the repositories."""
+
+    def __init__(self, connection, dictionary=False, **kwargs):
+        # buffered / prepared are accepted and ignored: sqlite3 streams rows and
+        # keeps its own prepared statement cache
+        self._connection = connection
+        self._cursor = connection._db.cursor()
+        self._dictionary = dictionary
+        self.column_names = ()
+        self.description = None
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def execute(self, operation, params=None, multi=False):
+        params = tuple(params) if params else ()
+        self._connection._begin_implicit()
+        for statement in translate(operation):
+            sql = statement.sql
+            if statement.uses_found_rows:
+                sql = re.sub(r"\bFOUND_ROWS\(\)", str(self._connection.found_rows), sql, flags=re.IGNORECASE)
+            if statement.count_sql:
+                count_params = params[:len(params) - statement.count_params]
+                self._connection.found_rows = self._connection._db.execute(statement.count_sql, count_params).fetchone()[0]
+            self._cursor.execute(sql, params)
+            self._after_execute(statement)
+
+    def executemany(self, operation, seq_params):
+        statements = translate(operation)
+        self._connection._begin_implicit()
+        self._cursor.executemany(statements[0].sql, [tuple(p) for p in seq_params])
+        self._after_execute(statements[0])
+
+    def _after_execute(self, statement):
+        description = self._cursor.description
+        self.description = description
+        self.column_names = tuple(column[0] for column in description) if description else ()
+        self.rowcount = self._cursor.rowcount
+        lastrowid = self._cursor.lastrowid
+        if statement.is_insert and lastrowid and self.rowcount > 1:
+            # MySQL reports the first id of a multi-row INSERT, SQLite the last
+            lastrowid -= self.rowcount - 1
+        self.lastrowid = lastrowid
+
+    def _convert(self, rows):
+        if self._dictionary:
+            columns = self.column_names
+            return [dict(zip(columns, row)) for row in rows]
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip(self.column_names, row)) if self._dictionary else row
+
+    def fetchall(self):
+        rows = self._convert(self._cursor.fetchall())
+        if self.description:
+            self.rowcount = len(rows)
+        return rows
+
+    def fetchmany(self, size=1):
+        return self._convert(self._cursor.fetchmany(size))
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Connection with the mysql.connector interface used by the pool and sessions."""
+
+    def __init__(self, db):
+        self._db = db
+        self._closed = False
+        self.autocommit = True
+        self.found_rows = 0
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self, dictionary=dictionary, **kwargs)
+
+    @property
+    def in_transaction(self):
+        return self._db.in_transaction
+
+    def _begin_implicit(self):
+        # autocommit = False behaves like MySQL: the first statement opens a transaction
+        if not self.autocommit and not self._db.in_transaction:
+            self._db.execute("BEGIN")
+
+    def start_transaction(self, **kwargs):
+        if self._db.in_transaction:
+            raise sqlite3.ProgrammingError("Transaction already in progress")
+        self._db.execute("BEGIN")
+
+    def commit(self):
+        if self._db.in_transaction:
+            self._db.execute("COMMIT")
+
+    def rollback(self):
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if self._closed:
+            raise sqlite3.InterfaceError("Connection is closed")
+        self._db.execute("SELECT 1")
+
+    def is_connected(self):
+        return not self._closed
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._db.close()
+
+
+class SQLiteBackend(DatabaseBackend):
+    name = "sqlite"
+    Error = sqlite3.Error
+
+    _memory_ids = itertools.count(1)
+
+    def __init__(self, path=":memory:", schema_files=()):
+        self._keeper = None
+        if path == ":memory:":
+            # A named shared-cache database is visible to every pooled connection
+            # and lives as long as one connection to it stays open
+            self._uri = f"file:student_management_{os.getpid()}_{next(self._memory_ids)}?mode=memory&cache=shared"
+            self._keeper = self._open()
+        else:
+            self._uri = "file:" + urllib.parse.quote(os.path.abspath(path))
+        self._schema_files = list(schema_files)
+        self._schema_lock = threading.Lock()
+        self._schema_loaded = False
+
+    def _open(self):
+        db = sqlite3.connect(
+            self._uri, uri=True,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,        # Transactions are explicit, as on MySQL with autocommit
+            check_same_thread=False,     # Pooled connections move between threads
+            timeout=10
+        )
+        db.execute("PRAGMA foreign_keys = ON")  # ON DELETE CASCADE / SET NULL
+        if "mode=memory" not in self._uri:
+            db.execute("PRAGMA journal_mode = WAL")
+        return db
+
+    def connect(self, host=None, port=None):
+        if not self._schema_loaded:
+            self.load_schema()
+        return SQLiteConnection(self._open())
+
+    def table_columns(self, cursor, table):
+        cursor.execute("SELECT name FROM pragma_table_info(%s)", (table,))
+        return {row[0] for row in cursor.fetchall()}
+
+    def table_indexes(self, cursor, table):
+        cursor.execute(
+            "SELECT il.name, ii.name FROM pragma_index_list(%s) il "
+            "JOIN pragma_index_info(il.name) ii ORDER BY il.name, ii.seqno", (table,)
+        )
+        indexes = {}
+        for name, column in cursor.fetchall():
+            indexes[name] = indexes.get(name, ()) + (column,)
+        # INTEGER PRIMARY KEY is the rowid, not listed as an index
+        cursor.execute("SELECT name FROM pragma_table_info(%s) WHERE pk > 0 ORDER BY pk", (table,))
+        primary = tuple(row[0] for row in cursor.fetchall())
+        if primary:
+            indexes["PRIMARY"] = primary
+        return indexes
+
+    def table_foreign_keys(self, cursor, table):
+        cursor.execute("SELECT `from`, `table`, `to` FROM pragma_foreign_key_list(%s)", (table,))
+        return {tuple(row) for row in cursor.fetchall()}
+
+    def explain(self, cursor, sql, params=None):
+        # "SCAN t" = full table scan; "SCAN t USING INDEX" (ordered index walk) and "SEARCH" are not flagged
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params or ())
+        steps = []
+        for row in cursor.fetchall():
+            detail = row[3]
+            match = re.match(r"(SCAN|SEARCH) (?:TABLE )?(\w+)", detail)
+            full_scan = (match is not None and match.group(1) == "SCAN"
+                         and " USING " not in detail and match.group(2) != "CONSTANT")
+            steps.append(PlanStep(match.group(2) if match else None, full_scan, detail))
+        return steps
+
+    def load_schema(self, files=None):
+        """
+        Runs the schema scripts once, unless the database already has tables
+        (file databases), then applies pending migrations.
+        """
+        with self._schema_lock:
+            if self._schema_loaded:
+                return
+            connection = SQLiteConnection(self._open())
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'Users'")
+                if cursor.fetchone()[0] == 0:
+                    self.run_scripts(connection, files if files is not None else self._schema_files)
+                cursor.close()
+                # Indexes and later columns, same as `python -m database.migrations` on MySQL
+                MigrationRunner.apply(connection, self)
+            finally:
+                connection.close()
+            self._schema_loaded = True
+
+    @staticmethod
+    def run_scripts(connection, files):
+        """Executes .sql files statement by statement through the dialect translation."""
+        cursor = connection.cursor()
+        try:
+            for path in files:
+                with open(path, encoding="utf-8") as f:
+                    for statement in split_script(f.read()):
+                        cursor.execute(statement)
+        finally:
+            cursor.close()
@@ -0,0 +1,107 @@
+"""
+Per-connection LRU cache of server-side prepared statements.
+
+A mysql.connector prepared cursor keeps its statement prepared on the server
+for as long as it executes the same SQL object, so we keep one prepared
+cursor per distinct SQL text and reuse it. Only the parameters travel on
+subsequent calls; the server skips parsing and planning.
+"""
+import threading
+from collections import OrderedDict
+
+
+class StatementCache:
+    """LRU cache of prepared cursors belonging to a single pooled connection."""
+
+    # Process-wide counters across every connection's cache
+    _stats_lock = threading.Lock()
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+
+    def __init__(self, connection, capacity):
+        self.connection = connection
+        self.capacity = capacity
+        self._entries = OrderedDict()  # sql -> (sql object, prepared cursor)
+
+    @classmethod
+    def for_connection(cls, connection, capacity):
+        """Returns the cache attached to a pooled connection, creating it on first use."""
+        cache = connection.statement_cache
+        if cache is None:
+            cache = cls(connection, capacity)
+            connection.statement_cache = cache
+        return cache
+
+    def execute(self, sql, params=()):
+        """Executes `sql` on its cached prepared cursor and returns that cursor."""
+        entry = self._entries.get(sql)
+        if entry is not None:
+            self._entries.move_to_end(sql)
+            self._count(hit=True)
+        else:
+            self._count(hit=False)
+            entry = (sql, self.connection.cursor(prepared=True))
+            self._entries[sql] = entry
+            if len(self._entries) > self.capacity:
+                _, (_, old_cursor) = self._entries.popitem(last=False)
+                self._close_cursor(old_cursor)
+                with StatementCache._stats_lock:
+                    StatementCache._evictions += 1
+
+        # Execute with the cached string object: the cursor only re-prepares
+        # when handed a different operation
+        key, cursor = entry
+        try:
+            cursor.execute(key, params or ())
+        except Exception:
+            # Cursor state is unknown after a failure, prepare again next time
+            self._entries.pop(sql, None)
+            self._close_cursor(cursor)
+            raise
+        return cursor
+
+    @staticmethod
+    def fetch_dicts(cursor):
+        """Reads every row of a prepared cursor as dictionaries (it only returns tuples)."""
+        rows = cursor.fetchall()
+        if not rows:
+            return []
+        columns = cursor.column_names
+        return [dict(zip(columns, row)) for row in rows]
+
+    def clear(self):
+        """Deallocates every prepared statement held by this cache."""
+        for _, cursor in self._entries.values():
+            self._close_cursor(cursor)
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _close_cursor(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+    @classmethod
+    def _count(cls, hit):
+        with cls._stats_lock:
+            if hit:
+                cls._hits += 1
+            else:
+                cls._misses += 1
+
+    @classmethod
+    def stats(cls):
+        """Hit/miss counters summed over every connection."""
+        with cls._stats_lock:
+            total = cls._hits + cls._misses
+            return {
+                'hits': cls._hits,
+                'misses': cls._misses,
+                'evictions': cls._evictions,
+                'hit_ratio': cls._hits / total if total else 0.0,
+            }
@@ -0,0 +1,100 @@
+"""
+Unit of work: one pooled connection and one transaction shared by every
+repository call made inside the block on the current thread.
+
+Usage:
+    with UnitOfWork():
+        class_info = class_repo.get_by_id(class_id)
+        grade_repo.update_scores(grade)
+        ann_repo.add_notification(user_id, title, body)
+    # Single COMMIT here; any exception rolls everything back.
+
+Repositories need no changes: DatabaseConnection.session() (and therefore
+execute_query, execute_iter and get_cursor) reuses the active unit's
+connection instead of checking out a new one and committing on its own.
+
+Nested units join the outer transaction through a SAVEPOINT, so a failing
+inner block only undoes its own statements.
+"""
+import itertools
+
+from database.connection import DatabaseConnection
+
+
+class UnitOfWork:
+    _savepoint_ids = itertools.count(1)
+
+    def __init__(self):
+        self.connection = None
+        self._outer = None
+        self._savepoint = None
+        self._after_commit = []
+
+    @staticmethod
+    def current():
+        """The unit of work active on this thread, or None."""
+        return DatabaseConnection.current_unit_of_work()
+
+    def __enter__(self):
+        self._outer = self.current()
+        if self._outer is not None:
+            # Nested: share the outer connection, isolate our part with a savepoint
+            self.connection = self._outer.connection
+            self._savepoint = f"uow_{next(self._savepoint_ids)}"
+            self._execute(f"SAVEPOINT {self._savepoint}")
+        else:
+            self.connection = DatabaseConnection.get_connection()
+            try:
+                self.connection.start_transaction()
+            except Exception:
+                self.connection.close()
+                raise
+        DatabaseConnection._set_unit_of_work(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        DatabaseConnection._set_unit_of_work(self._outer)
+        if self._outer is not None:
+            if exc_type is None:
+                self._execute(f"RELEASE SAVEPOINT {self._savepoint}")
+                # Callbacks wait for the outermost commit
+                self._outer._after_commit.extend(self._after_commit)
+            else:
+                self._execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+            return False
+
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()  # Back to the pool
+
+        if exc_type is None:
+            for callback in self._after_commit:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Error in after-commit callback: {e}")
+        return False
+
+    def after_commit(self, callback):
+        """Runs `callback` once the transaction has been committed (dropped on rollback)."""
+        self._after_commit.append(callback)
+
+    @classmethod
+    def on_commit(cls, callback):
+        """Defers `callback` to the active unit's commit, or runs it now if there is none."""
+        uow = cls.current()
+        if uow is None:
+            callback()
+        else:
+            uow.after_commit(callback)
+
+    def _execute(self, sql):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
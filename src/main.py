@@ -1,10 +1,41 @@
 # Entry point for the application
+import sys
 import customtkinter as ctk
 from views.root_app import RootApp
+from config import Config
 
 ctk.set_appearance_mode("System")  # Modes: "System" (standard), "Dark", "Light"
 ctk.set_default_color_theme("green")  # Themes: "blue" (standard), "green", "dark-blue"
 
 if __name__ == "__main__":
+    # Bring the schema up to date before any screen queries it
+    from database.migrations import MigrationRunner
+    try:
+        MigrationRunner.ensure_current()
+    except Exception as e:
+        print(f"❌ Database schema check failed: {e}")
+        sys.exit(1)
+
+    if Config.DB_WAN_MODE:
+        # Open pooled connections while the login screen is being built
+        from database.connection import DatabaseConnection
+        DatabaseConnection.warm_up()
+
+    if Config.PERSISTENT_CACHE_PATH:
+        # Reference data from the last session, revalidated in the background
+        from database.persistent_cache import PersistentCache
+        PersistentCache.start()
+
+    if Config.CACHE_STATS_LOG_INTERVAL > 0:
+        from utils.cache import Cache
+        Cache.start_stats_logging()
+
     app = RootApp()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+
+    if Config.QUERY_STATS_DUMP_ON_EXIT:
+        from database.connection import DatabaseConnection
+        print(DatabaseConnection.query_stats())
+        print(DatabaseConnection.round_trip_stats())
+        from utils.cache import Cache
+        print(Cache.dump())
\ No newline at end of file
@@ -1,4 +1,14 @@
+from types import SimpleNamespace
+
+from database.row_mapper import RowMapper
+
 class Grade:
+    __slots__ = ('grade_id', 'student_id', 'class_id', 'attendance_score', 'midterm', 'final', 'total', 'letter_grade', '_extra')
+
+    # Constructor fields in positional order, used by database/row_mapper.py
+    ROW_FIELDS = __slots__[:-1]
+    ROW_DEFAULTS = {'total': 0, 'letter_grade': ""}
+
     def __init__(self, grade_id, student_id, class_id, attendance_score, midterm, final, total=0, letter_grade="", **kwargs):
         self.grade_id = grade_id
         self.student_id = student_id
@@ -10,30 +20,29 @@ class Grade:
         self.letter_grade = letter_grade
         
         # Hỗ trợ các thuộc tính mở rộng từ câu lệnh JOIN (ví dụ: course_name, credits)
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self._extra = SimpleNamespace(**kwargs) if kwargs else None
+
+    @classmethod
+    def from_values(cls, values, extra=None):
+        """Builds a Grade from ROW_FIELDS-ordered values; extra holds the JOIN columns (see database/row_mapper.py)."""
+        grade = cls.__new__(cls)
+        Grade.__init__(grade, *values)
+        grade._extra = extra
+        return grade
 
-    @classmethod # Factory method to create Grade object from a database row # Factory method to create Grade object from a database row
+    def __getattr__(self, name):
+        # Only reached when normal lookup fails: JOIN columns such as course_name, credits
+        if name.startswith('_') or self._extra is None:
+            raise AttributeError(name)
+        try:
+            return getattr(self._extra, name)
+        except AttributeError:
+            raise AttributeError(name) from None
+
+    @classmethod # Factory method to create Grade object from a database row
     def from_db_row(cls, row):
-        if not row:
-            return None
-        
-        # Separate standard Grade fields
-        init_args = {
-            'grade_id': row.get('grade_id'),
-            'student_id': row.get('student_id'),
-            'class_id': row.get('class_id'),
-            'attendance_score': row.get('attendance_score'),
-            'midterm': row.get('midterm'),
-            'final': row.get('final'),
-            'total': row.get('total'),
-            'letter_grade': row.get('letter_grade')
-        }
-        
-        # Remaining fields (like course_name) will be passed to kwargs
-        kwargs = {k: v for k, v in row.items() if k not in init_args}
-        
-        return cls(**init_args, **kwargs)
+        # Standard Grade fields go to the constructor, remaining fields (like course_name) to `extra`
+        return RowMapper.map_dict(cls, row)
 
     def calculate_total(self):
         """Calculates total score based on weights: 10% Attendance, 40% Midterm, 50% Final"""
@@ -1,6 +1,14 @@
+from database.row_mapper import RowMapper
 from .user import User
 
+_USER_FIELD_COUNT = len(User.ROW_FIELDS)
+
 class Lecturer(User):
+    __slots__ = ('lecturer_id', 'lecturer_code', 'dept_id', 'degree', 'dept_name')
+
+    ROW_FIELDS = User.ROW_FIELDS + __slots__
+    ROW_DEFAULTS = User.ROW_DEFAULTS
+
     def __init__(self, user_data, lecturer_id, lecturer_code, dept_id, degree, dept_name=None):
         super().__init__(**user_data)
         self.lecturer_id = lecturer_id
@@ -9,17 +17,14 @@ class Lecturer(User):
         self.degree = degree
         self.dept_name = dept_name
 
+    @classmethod
+    def from_values(cls, values, extra=None):
+        """Builds a Lecturer from ROW_FIELDS-ordered values (see database/row_mapper.py)."""
+        lecturer = super().from_values(values[:_USER_FIELD_COUNT], extra)
+        (lecturer.lecturer_id, lecturer.lecturer_code, lecturer.dept_id,
+         lecturer.degree, lecturer.dept_name) = values[_USER_FIELD_COUNT:]
+        return lecturer
+
     @classmethod
     def from_db_row(cls, row):
-        if not row: return None
-        user_keys = ['user_id', 'username', 'password', 'full_name', 'email', 'phone', 'role', 'status']
-        user_data = {k: row.get(k) for k in user_keys if k in row}
-        
-        return cls(
-            user_data=user_data,
-            lecturer_id=row.get('lecturer_id'),
-            lecturer_code=row.get('lecturer_code'),
-            dept_id=row.get('dept_id'),
-            degree=row.get('degree'),
-            dept_name=row.get('dept_name')
-        )
\ No newline at end of file
+        return RowMapper.map_dict(cls, row)
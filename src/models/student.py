@@ -1,6 +1,14 @@
+from database.row_mapper import RowMapper
 from .user import User
 
+_USER_FIELD_COUNT = len(User.ROW_FIELDS)
+
 class Student(User):
+    __slots__ = ('student_id', 'student_code', 'major', 'dept_id', 'academic_year', 'gpa', 'academic_status', 'dept_name')
+
+    ROW_FIELDS = User.ROW_FIELDS + __slots__
+    ROW_DEFAULTS = {**User.ROW_DEFAULTS, 'academic_status': "ACTIVE"}
+
     def __init__(self, user_data, student_id, student_code, major, dept_id, academic_year, gpa=0.0, academic_status="ACTIVE", dept_name=None):
         # Call parent User class init
         # user_data is a dict containing: user_id, username, full_name, email...
@@ -16,25 +24,17 @@ class Student(User):
         # Extended field (not in Students table but available when joined)
         self.dept_name = dept_name
 
+    @classmethod
+    def from_values(cls, values, extra=None):
+        """Builds a Student from ROW_FIELDS-ordered values without the user_data dict (see database/row_mapper.py)."""
+        student = super().from_values(values[:_USER_FIELD_COUNT], extra)
+        (student.student_id, student.student_code, student.major, student.dept_id,
+         student.academic_year, gpa, student.academic_status, student.dept_name) = values[_USER_FIELD_COUNT:]
+        student.gpa = float(gpa) if gpa else 0.0
+        return student
+
     @classmethod
     def from_db_row(cls, row):
         """Factory method: Creates a Student object from a DB data row (Dictionary)."""
-        if not row:
-            return None
-        
-        # Separate User data (based on column names in Users table)
-        user_keys = ['user_id', 'username', 'password', 'full_name', 'email', 'phone', 'role', 'status', 'address', 'dob']
-        # Filter keys existing in row
-        user_data = {k: row.get(k) for k in user_keys if k in row}
-        # Create Student object
-        return cls(
-            user_data=user_data,
-            student_id=row.get('student_id'),
-            student_code=row.get('student_code'),
-            major=row.get('major'),
-            dept_id=row.get('dept_id'),
-            academic_year=row.get('academic_year'),
-            gpa=row.get('gpa'),
-            academic_status=row.get('academic_status'),
-            dept_name=row.get('dept_name') # Retrieved from Departments table when joined
-        )
\ No newline at end of file
+        # Column-index plan is cached per column list, no per-row key filtering
+        return RowMapper.map_dict(cls, row)
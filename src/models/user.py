@@ -11,6 +11,15 @@ class UserStatus(Enum):
     LOCKED = "LOCKED"
 
 class User:
+    # Slots instead of a per-instance __dict__: rosters hold thousands of these
+    __slots__ = ('user_id', 'username', 'password', 'full_name', 'email', 'phone', 'role', 'status',
+                 'failed_login_attempts', 'lockout_time', 'address', 'dob', 'reset_token',
+                 'reset_token_expiry', '_extra')
+
+    # Constructor fields in positional order, used by database/row_mapper.py
+    ROW_FIELDS = __slots__[:-1]
+    ROW_DEFAULTS = {'status': "ACTIVE", 'failed_login_attempts': 0}
+
     def __init__(self, user_id, username, password, full_name, email, phone, role, status="ACTIVE", failed_login_attempts=0, lockout_time=None, address=None, dob=None, reset_token=None, reset_token_expiry=None):
         self.user_id = user_id
         self.username = username
@@ -28,6 +37,24 @@ class User:
 
         self.reset_token = reset_token
         self.reset_token_expiry = reset_token_expiry
+        self._extra = None
+
+    @classmethod
+    def from_values(cls, values, extra=None):
+        """Builds a User from ROW_FIELDS-ordered values (see database/row_mapper.py)."""
+        user = cls.__new__(cls)
+        User.__init__(user, *values)
+        user._extra = extra
+        return user
+
+    def __getattr__(self, name):
+        # Only reached when normal lookup fails: JOIN columns outside the model (e.g. dept_name)
+        if name.startswith('_') or self._extra is None:
+            raise AttributeError(name)
+        try:
+            return getattr(self._extra, name)
+        except AttributeError:
+            raise AttributeError(name) from None
 
     def is_locked(self):
         return self.status == UserStatus.LOCKED.value
\ No newline at end of file
@@ -1,74 +1,723 @@
 """
 Caching utility for frequently accessed data
 """
+import heapq
+import inspect
+import logging
+import os
+import sys
 import time
 import threading
+from collections import OrderedDict
 from functools import wraps
 
+from config import Config
+
+
+def approx_size(value, _depth=0):
+    """
+    Approximate memory footprint of a cached value in bytes. Containers are
+    measured recursively; long sequences are sampled so sizing a large
+    transcript or roster costs about as much as sizing a few rows.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 4 or isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        items = list(value.items())
+        sample = items[:approx_size.SAMPLE]
+        part = sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in sample)
+        return size + (part * len(items) // len(sample) if sample else 0)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = value if isinstance(value, (list, tuple)) else list(value)
+        sample = items[:approx_size.SAMPLE]
+        part = sum(approx_size(item, _depth + 1) for item in sample)
+        return size + (part * len(items) // len(sample) if sample else 0)
+    slots = getattr(type(value), '__slots__', None)
+    if slots:
+        if isinstance(slots, str):
+            slots = (slots,)
+        return size + sum(approx_size(getattr(value, name, None), _depth + 1) for name in slots)
+    attrs = getattr(value, '__dict__', None)
+    if attrs is not None:
+        return size + approx_size(attrs, _depth + 1)
+    return size
+
+approx_size.SAMPLE = 16  # Items measured per container
+
+
+class _Sentinel:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+# Returned by Cache.lookup() for keys with no live entry
+MISSING = _Sentinel("MISSING")
+# Stored in place of a cached None, so "absent" and "known to be None" differ
+_NEGATIVE = _Sentinel("NEGATIVE")
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "size", "stale")
+
+    def __init__(self, value, expires, size, stale=None):
+        self.value = value
+        self.expires = expires                               # Hard TTL: dropped after this
+        self.size = size
+        self.stale = expires if stale is None else stale     # Soft TTL (see get_or_revalidate)
+
+
+class _Flight:
+    """A computation in progress for one key (see Cache.single_flight)."""
+    __slots__ = ("owner", "done", "result", "error")
+
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Counters:
+    """Per-prefix statistics (see Cache.stats). Updated without a lock, so approximate."""
+    __slots__ = ("hits", "negative_hits", "misses", "evictions", "expirations", "computes", "compute_time")
+
+    def __init__(self):
+        self.hits = self.negative_hits = self.misses = 0
+        self.evictions = self.expirations = 0
+        self.computes = 0
+        self.compute_time = 0.0
+
+
+def stats_prefix(key):
+    """
+    Prefix a key is counted under in Cache.stats(): the function name of
+    cache_result tuple keys, the part before the first ":" of string keys
+    (e.g. "query" for QueryCache, "count" for CountService).
+    """
+    if key.__class__ is str:
+        return key.split(":", 1)[0]
+    return str(key[0])
+
+
+cache_stats_logger = logging.getLogger("utils.cache.stats")
+
+
+class _Store:
+    """The entries of Cache under one lock: an LRU dict, its expiry heap and the limits."""
+    __slots__ = ("entries", "expiry_heap", "bytes", "lock", "max_entries", "max_bytes", "flights",
+                 "refreshing", "namespaces")
+
+    def __init__(self, max_entries, max_bytes):
+        self.entries = OrderedDict()   # key -> _Entry, least recently used first
+        self.expiry_heap = []          # (expires, key); stale items are skipped when popped
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.flights = {}              # key -> _Flight being computed
+        self.refreshing = set()        # Stale keys with a background refresh scheduled
+        # OPTIMIZATION: stats_prefix -> keys, so remove_prefix() only visits the
+        # keys of the matching namespaces instead of every entry under the lock
+        self.namespaces = {}
+
+    def get(self, key, now):
+        """Returns (entry or None, expired)."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None, False
+            if now < entry.expires:
+                self.entries.move_to_end(key)
+                return entry, False
+            self.remove(key)
+        return None, True
+
+    def set(self, key, entry, now, sweep_batch):
+        """Stores entry; returns (expired keys, evicted keys) removed to make room."""
+        evicted = []
+        with self.lock:
+            self.remove(key)
+            self.entries[key] = entry
+            self.bytes += entry.size
+            namespace = stats_prefix(key)
+            keys = self.namespaces.get(namespace)
+            if keys is None:
+                keys = self.namespaces[namespace] = set()
+            keys.add(key)
+            heapq.heappush(self.expiry_heap, (entry.expires, key))
+            expired = self.sweep_expired(now, sweep_batch)
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                lru_key, lru = self.entries.popitem(last=False)
+                self.bytes -= lru.size
+                self._unindex(lru_key)
+                evicted.append(lru_key)
+            if len(self.expiry_heap) > 2 * len(self.entries) + 256:
+                self.expiry_heap[:] = [(e.expires, k) for k, e in self.entries.items()]
+                heapq.heapify(self.expiry_heap)
+        return expired, evicted
+
+    def remove(self, key):
+        """Caller holds lock."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+            self._unindex(key)
+
+    def _unindex(self, key):
+        """Caller holds lock."""
+        namespace = stats_prefix(key)
+        keys = self.namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.namespaces[namespace]
+
+    def sweep_expired(self, now, limit):
+        """Caller holds lock."""
+        expired = []
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now and (limit is None or len(expired) < limit):
+            expires, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires == expires:  # Not replaced since
+                self.remove(key)
+                expired.append(key)
+        return expired
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.expiry_heap.clear()
+            self.namespaces.clear()
+            self.bytes = 0
+
+    def remove_prefix(self, prefix):
+        # A key matching `prefix` has a stats_prefix starting with the part of
+        # `prefix` before its first ":", so only those namespaces are scanned
+        head = prefix.split(":", 1)[0]
+        with self.lock:
+            for namespace in [n for n in self.namespaces if n.startswith(head)]:
+                matches = [k for k in self.namespaces[namespace] if key_namespace(k).startswith(prefix)]
+                for k in matches:
+                    self.remove(k)
+
+
 class Cache:
-    """Simple in-memory cache with TTL support"""
-    _cache = {}
-    _lock = threading.Lock()
-    
+    """
+    In-memory LRU cache with per-entry TTL and a memory budget.
+
+    Bounded by Config.CACHE_MAX_ENTRIES entries and roughly
+    Config.CACHE_MAX_BYTES bytes (see approx_size); the least recently used
+    entries are evicted first. Expiry is checked on every get(), and set()
+    drops a few expired entries per call from an expiry heap instead of
+    scanning the whole cache.
+
+    All entries share one lock (see utils/cache_benchmark.py for the
+    throughput from concurrent threads).
+
+    Cache.stats() / dump() report hits, misses, evictions, memory and load
+    times per key prefix (see stats_prefix).
+
+    None is a cacheable result (negative caching): set(key, None) remembers
+    that a lookup found nothing, for a shorter TTL (Config.CACHE_NEGATIVE_TTL).
+    get() returns None both for that and for a miss; lookup() tells them apart.
+    """
+    SWEEP_BATCH = 32  # Expired entries dropped per set()
+    MISSING = MISSING
+
+    _store = None
+    _eviction_listeners = []
+
+    @classmethod
+    def configure(cls, max_entries=None, max_bytes=None):
+        """(Re)builds the store, dropping every entry. Defaults come from Config."""
+        cls._store = _Store(max_entries or Config.CACHE_MAX_ENTRIES, max_bytes or Config.CACHE_MAX_BYTES)
+
+    _counters = {}  # stats_prefix -> _Counters
+
+    @classmethod
+    def _stats(cls, key):
+        prefix = stats_prefix(key)
+        counters = cls._counters.get(prefix)
+        if counters is None:
+            counters = cls._counters.setdefault(prefix, _Counters())
+        return counters
+
     @classmethod
     def get(cls, key):
         """Get value from cache if not expired"""
-        with cls._lock:
-            if key in cls._cache:
-                value, expiry = cls._cache[key]
-                if time.time() < expiry:
-                    return value
-                else:
-                    del cls._cache[key]
-        return None
-    
-    @classmethod
-    def set(cls, key, value, ttl=300):
-        """Store value with TTL (default 5 minutes)"""
-        with cls._lock:
-            # Basic memory management: Clear expired items if cache gets too big
-            if len(cls._cache) > 1000:
-                now = time.time()
-                expired_keys = [k for k, v in cls._cache.items() if v[1] < now]
-                for k in expired_keys:
-                    del cls._cache[k]
-            
-            cls._cache[key] = (value, time.time() + ttl)
-    
+        value = cls.lookup(key)
+        return None if value is MISSING else value
+
+    @classmethod
+    def lookup(cls, key, count=True):
+        """
+        Cached value of `key`, None for a cached negative result, or
+        Cache.MISSING when there is no live entry. count=False leaves the
+        hit / miss counters alone (re-checks inside a computation).
+        """
+        entry, expired = cls._store.get(key, time.time())
+        if expired:
+            cls._removed([key], expired=True)
+        if entry is None:
+            if count:
+                cls._stats(key).misses += 1
+            return MISSING
+        if entry.value is _NEGATIVE:
+            if count:
+                cls._stats(key).negative_hits += 1
+            return None
+        if count:
+            cls._stats(key).hits += 1
+        return entry.value
+
+    @classmethod
+    def set(cls, key, value, ttl=300, negative_ttl=None, stale_after=None):
+        """
+        Store value with TTL (default 5 minutes). A None value is stored as a
+        negative result for negative_ttl seconds (default: the shorter of ttl
+        and Config.CACHE_NEGATIVE_TTL; 0 disables negative caching).
+        stale_after: soft TTL in seconds, see get_or_revalidate().
+        """
+        if value is None:
+            if negative_ttl is None:
+                negative_ttl = min(ttl, Config.CACHE_NEGATIVE_TTL)
+            if negative_ttl <= 0:
+                cls.clear(key)
+                return
+            value, ttl = _NEGATIVE, negative_ttl
+        store = cls._store
+        size = approx_size(value)
+        if size > store.max_bytes:
+            cls.clear(key)  # Too large to cache; do not keep a stale version either
+            return
+        now = time.time()
+        stale = now + stale_after if stale_after is not None and value is not _NEGATIVE else None
+        expired, evicted = store.set(key, _Entry(value, now + ttl, size, stale), now, cls.SWEEP_BATCH)
+        if expired:
+            cls._removed(expired, expired=True)
+        if evicted:
+            cls._removed(evicted, expired=False)
+
+    @classmethod
+    def single_flight(cls, key, compute):
+        """
+        Runs compute() once for all threads asking for `key` at the same time:
+        the first caller computes, concurrent callers wait and receive its
+        result (or its exception). A thread re-entering its own flight computes
+        directly instead of waiting for itself.
+        """
+        store = cls._store
+        with store.lock:
+            flight = store.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = store.flights[key] = _Flight()
+        if not leader:
+            if flight.owner == threading.get_ident():
+                return compute()
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = compute()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with store.lock:
+                store.flights.pop(key, None)
+            flight.done.set()
+
+    @classmethod
+    def get_or_compute(cls, key, compute, ttl=300, negative_ttl=None):
+        """
+        Cached value of `key`, or compute() and cache it (a None result as a
+        negative entry, see set()). Concurrent misses for the same key run
+        compute() once (see single_flight).
+        """
+        value = cls.lookup(key)
+        if value is not MISSING:
+            return value
+
+        def load():
+            # A flight that just finished may have filled the entry
+            value = cls.lookup(key, count=False)
+            if value is MISSING:
+                value = cls.timed(key, compute)
+                cls.set(key, value, ttl, negative_ttl)
+            return value
+
+        return cls.single_flight(key, load)
+
+    @classmethod
+    def get_or_revalidate(cls, key, compute, ttl, stale_after, on_refresh=None, tk_root=None):
+        """
+        Stale-while-revalidate: the cached value of `key` is returned at once
+        even after its soft TTL (stale_after seconds); a stale hit schedules a
+        single background refresh (utils.threading_helper) that stores the new
+        value and passes it to on_refresh (on the tkinter thread if tk_root is
+        given). The entry is only dropped after its hard TTL (ttl), and a miss
+        computes on the calling thread (once for concurrent callers).
+
+        Usage (from a background task):
+            data = Cache.get_or_revalidate(("StudentDashboard", user_id), load,
+                                           ttl=900, stale_after=30, on_refresh=self._show)
+        """
+        store = cls._store
+        now = time.time()
+        entry, expired = store.get(key, now)
+        if expired:
+            cls._removed([key], expired=True)
+        counters = cls._stats(key)
+        if entry is None:
+            counters.misses += 1
+
+            def load():
+                value = cls.lookup(key, count=False)  # Filled by a flight that just finished
+                if value is MISSING:
+                    value = cls.timed(key, compute)
+                    cls.set(key, value, ttl, stale_after=stale_after)
+                return value
+
+            return cls.single_flight(key, load)
+
+        value = None if entry.value is _NEGATIVE else entry.value
+        if entry.value is _NEGATIVE:
+            counters.negative_hits += 1
+        else:
+            counters.hits += 1
+        if now >= entry.stale:
+            with store.lock:
+                scheduled = key in store.refreshing
+                store.refreshing.add(key)
+            if not scheduled:
+                cls._schedule_refresh(store, key, compute, ttl, stale_after, on_refresh, tk_root)
+        return value
+
+    @classmethod
+    def _schedule_refresh(cls, store, key, compute, ttl, stale_after, on_refresh, tk_root):
+        from utils.threading_helper import run_in_background  # tkinter is only needed here
+
+        def revalidate():
+            try:
+                value = cls.single_flight(key, lambda: cls.timed(key, compute))
+                cls.set(key, value, ttl, stale_after=stale_after)
+                return value
+            finally:
+                with store.lock:
+                    store.refreshing.discard(key)
+
+        def failed(error):
+            print(f"Cache refresh error ({key!r}): {error}")
+
+        run_in_background(revalidate, on_refresh, failed, tk_root)
+
+    @classmethod
+    def timed(cls, key, compute):
+        """Runs compute() for a miss of `key`, adding its duration to the prefix's stats."""
+        start = time.perf_counter()
+        try:
+            return compute()
+        finally:
+            counters = cls._stats(key)
+            counters.computes += 1
+            counters.compute_time += time.perf_counter() - start
+
     @classmethod
     def clear(cls, key=None):
         """Clear specific key or all cache"""
-        with cls._lock:
-            if key:
-                cls._cache.pop(key, None)
-            else:
-                cls._cache.clear()
+        if key is not None:
+            store = cls._store
+            with store.lock:
+                store.remove(key)
+        else:
+            cls._store.clear()
 
     @classmethod
     def invalidate_prefix(cls, prefix):
         """Clear all keys starting with a specific prefix"""
-        with cls._lock:
-            keys_to_remove = [k for k in cls._cache if k.startswith(prefix)]
-            for k in keys_to_remove:
-                del cls._cache[k]
+        cls._store.remove_prefix(prefix)
+
+    @classmethod
+    def purge_expired(cls):
+        """Drops every expired entry now (set() otherwise does this a few entries at a time)."""
+        store = cls._store
+        with store.lock:
+            expired = store.sweep_expired(time.time(), None)
+        if expired:
+            cls._removed(expired, expired=True)
+        return len(expired)
+
+    @classmethod
+    def stats(cls):
+        """
+        Per-prefix statistics (see stats_prefix) since start or reset_stats():
+            {prefix: {'hits', 'negative_hits', 'misses', 'hit_ratio',
+                      'evictions', 'expirations', 'entries', 'bytes',
+                      'computes', 'avg_compute_ms'}}
+        evictions are LRU / memory-budget removals; entries and bytes are the
+        live entries now. avg_compute_ms is the mean time to load a missing
+        (or stale) value. Counters are approximate under heavy concurrency.
+        """
+        store = cls._store
+        with store.lock:
+            items = [(key, entry.size) for key, entry in store.entries.items()]
+        sizes = {}
+        for key, size in items:
+            prefix = stats_prefix(key)
+            count, total = sizes.get(prefix, (0, 0))
+            sizes[prefix] = (count + 1, total + size)
+
+        result = {}
+        for prefix in set(cls._counters) | set(sizes):
+            c = cls._counters.get(prefix) or _Counters()
+            entries, size = sizes.get(prefix, (0, 0))
+            lookups = c.hits + c.negative_hits + c.misses
+            result[prefix] = {
+                'hits': c.hits,
+                'negative_hits': c.negative_hits,
+                'misses': c.misses,
+                'hit_ratio': (c.hits + c.negative_hits) / lookups if lookups else 0.0,
+                'evictions': c.evictions,
+                'expirations': c.expirations,
+                'entries': entries,
+                'bytes': size,
+                'computes': c.computes,
+                'avg_compute_ms': c.compute_time * 1000.0 / c.computes if c.computes else 0.0,
+            }
+        return result
+
+    @classmethod
+    def dump(cls, limit=None):
+        """Formats stats() as a text table, busiest prefixes first."""
+        rows = sorted(cls.stats().items(),
+                      key=lambda item: item[1]['hits'] + item[1]['negative_hits'] + item[1]['misses'],
+                      reverse=True)
+        if limit:
+            rows = rows[:limit]
+        lines = [f"{'PREFIX':<50} {'HITS':>8} {'NEG':>6} {'MISSES':>7} {'HIT %':>6} {'EVICT':>6} "
+                 f"{'EXPIRE':>7} {'ENTRIES':>7} {'KB':>8} {'LOAD ms':>8}"]
+        for prefix, e in rows:
+            lines.append(
+                f"{prefix[:50]:<50} {e['hits']:>8} {e['negative_hits']:>6} {e['misses']:>7} "
+                f"{e['hit_ratio'] * 100:>6.1f} {e['evictions']:>6} {e['expirations']:>7} "
+                f"{e['entries']:>7} {e['bytes'] / 1024:>8.1f} {e['avg_compute_ms']:>8.2f}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def reset_stats(cls):
+        cls._counters = {}
+
+    @classmethod
+    def start_stats_logging(cls, interval=None):
+        """
+        Writes dump() to the "utils.cache.stats" log every `interval` seconds
+        (default Config.CACHE_STATS_LOG_INTERVAL) from a daemon thread: the
+        file in Config.CACHE_STATS_LOG_FILE, or stderr. main.py starts it
+        when the interval is set. Returns the thread, or None when disabled.
+        """
+        interval = Config.CACHE_STATS_LOG_INTERVAL if interval is None else interval
+        if interval <= 0:
+            return None
+        if not cache_stats_logger.handlers:
+            if Config.CACHE_STATS_LOG_FILE:
+                log_dir = os.path.dirname(Config.CACHE_STATS_LOG_FILE)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                handler = logging.FileHandler(Config.CACHE_STATS_LOG_FILE, encoding="utf-8")
+            else:
+                handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s [CACHE STATS]\n%(message)s"))
+            cache_stats_logger.addHandler(handler)
+            cache_stats_logger.setLevel(logging.INFO)
+            cache_stats_logger.propagate = False
+
+        def log_periodically():
+            while True:
+                time.sleep(interval)
+                try:
+                    cache_stats_logger.info(cls.dump())
+                except Exception as e:
+                    print(f"Cache stats logging error: {e}")
+
+        thread = threading.Thread(target=log_periodically, name="cache-stats", daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def size(cls):
+        """(entry count, approximate bytes) currently held."""
+        store = cls._store
+        with store.lock:
+            return len(store.entries), store.bytes
+
+    @classmethod
+    def add_eviction_listener(cls, callback):
+        """
+        Calls callback(keys) after entries are evicted (LRU, memory budget)
+        or expire, e.g. so an index over the cached keys can forget them.
+        Not called for clear() / invalidate_prefix().
+        """
+        cls._eviction_listeners.append(callback)
+
+    @classmethod
+    def _removed(cls, keys, expired):
+        """Counts expired or evicted keys per prefix and tells the eviction listeners."""
+        for key in keys:
+            counters = cls._stats(key)
+            if expired:
+                counters.expirations += 1
+            else:
+                counters.evictions += 1
+        cls._notify_evicted(keys)
+
+    @classmethod
+    def _notify_evicted(cls, keys):
+        for callback in cls._eviction_listeners:
+            try:
+                callback(keys)
+            except Exception as e:
+                print(f"Cache eviction listener error: {e}")
+
+
+Cache.configure()
+
+_SCALARS = (str, int, float, bool, bytes, type(None))
+
+
+def _key_part(value):
+    """
+    Compact, hashable, typed form of one argument: (type, value) for scalars
+    (so 1, 1.0 and True stay distinct), the same recursively for lists,
+    tuples, dicts and sets. Other hashable objects are used as they are;
+    anything else raises TypeError (the call is then not cached).
+    """
+    cls = value.__class__
+    if cls in _SCALARS:
+        return cls, value
+    if cls is list or cls is tuple:
+        return cls, tuple([_key_part(item) for item in value])
+    if cls is dict:
+        return cls, frozenset([(k, _key_part(v)) for k, v in value.items()])
+    if cls is set or cls is frozenset:
+        return cls, frozenset([_key_part(item) for item in value])
+    hash(value)
+    return cls, value
+
+
+def key_namespace(key):
+    """Prefix part of a cache key: the key itself for strings, the first item of cache_result tuple keys."""
+    return key if key.__class__ is str else key[0]
+
+
+def _key_builder(func, key_prefix, key_args):
+    """
+    Returns make_key(args, kwargs) for `func`. The parameter layout is resolved
+    once here, so a call only picks its key arguments by position or name.
+    """
+    params = list(inspect.signature(func).parameters.values())
+    # Methods and classmethods: the instance / class never belongs in the key
+    if params and params[0].name in ("self", "cls") and params[0].kind in (
+            inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+        offset = 1
+        params = params[1:]
+    else:
+        offset = 0
 
-def cache_result(ttl=300, key_prefix=None):
-    """Decorator to cache function results"""
+    named = [p for p in params if p.kind in (inspect.Parameter.POSITIONAL_ONLY,
+                                             inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                                             inspect.Parameter.KEYWORD_ONLY)]
+    has_varargs = any(p.kind is inspect.Parameter.VAR_POSITIONAL for p in params)
+    has_varkw = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params)
+    if key_args is None:
+        selected = named
+    else:
+        by_name = {p.name: p for p in named}
+        unknown = [name for name in key_args if name not in by_name]
+        if unknown:
+            raise ValueError(f"cache_result: {func.__qualname__} has no argument(s) {unknown}")
+        selected = [by_name[name] for name in key_args]
+        has_varargs = has_varkw = False
+
+    missing = object()
+    # (name, position in *args or None for keyword-only, default)
+    layout = tuple(
+        (p.name,
+         offset + named.index(p) if p.kind is not inspect.Parameter.KEYWORD_ONLY else None,
+         p.default if p.default is not inspect.Parameter.empty else missing)
+        for p in selected
+    )
+    positional_count = offset + sum(1 for p in named if p.kind is not inspect.Parameter.KEYWORD_ONLY)
+    named_set = {p.name for p in named}
+
+    def make_key(args, kwargs):
+        parts = [key_prefix]
+        for name, position, default in layout:
+            if name in kwargs:
+                value = kwargs[name]
+            elif position is not None and position < len(args):
+                value = args[position]
+            else:
+                value = default
+            parts.append(_key_part(value) if value is not missing else missing)
+        if has_varargs and len(args) > positional_count:
+            parts.append(_key_part(args[positional_count:]))
+        if has_varkw:
+            extra = {k: v for k, v in kwargs.items() if k not in named_set}
+            if extra:
+                parts.append(_key_part(extra))
+        return tuple(parts)
+
+    return make_key
+
+
+def cache_result(ttl=300, key_prefix=None, key_args=None, negative_ttl=None):
+    """
+    Decorator to cache function results.
+
+    Keys are tuples: the prefix (default: the function's qualified name, e.g.
+    "StudentController.view_grades") followed by the typed key arguments.
+    self / cls are left out, so every instance shares the cached results.
+    key_args names the arguments that form the key (default: all of them),
+    e.g. key_args=("student_id",) to ignore a `refresh` flag.
+
+    A None result is cached too, for negative_ttl seconds (default: the
+    shorter of ttl and Config.CACHE_NEGATIVE_TTL; 0 recomputes it every call).
+
+    On a miss the result is computed once even when several threads ask for
+    it at the same time (see Cache.single_flight).
+
+    The wrapper exposes cache_key(*args, **kwargs) and invalidate(*args, **kwargs).
+    """
     def decorator(func):
+        prefix = key_prefix or func.__qualname__
+        make_key = _key_builder(func, prefix, key_args)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = f"{key_prefix or func.__name__}:{args}:{kwargs}"
-            
-            # Try to get from cache
-            result = Cache.get(cache_key)
-            if result is not None:
-                return result
-            
-            # Compute and cache
-            result = func(*args, **kwargs)
-            Cache.set(cache_key, result, ttl)
-            return result
-        
+            try:
+                cache_key = make_key(args, kwargs)
+            except TypeError:
+                return func(*args, **kwargs)  # Unhashable argument: not cacheable
+
+            # Cached result, or compute once for every concurrent caller of this key
+            return Cache.get_or_compute(cache_key, lambda: func(*args, **kwargs), ttl, negative_ttl)
+
+        def invalidate(*args, **kwargs):
+            Cache.clear(make_key(args, kwargs))
+
+        wrapper.cache_key = lambda *args, **kwargs: make_key(args, kwargs)
+        wrapper.invalidate = invalidate
         return wrapper
     return decorator
@@ -0,0 +1,105 @@
+"""
+Cache throughput benchmark: a mixed get/set load (90% reads) from a growing
+number of threads, all contending for the cache's single lock. With
+--invalidate-every, one more thread calls Cache.invalidate_prefix() on a
+separate "count:" namespace meanwhile, the way writes evict CountService
+entries while pages read the query cache.
+
+Usage:
+    cd src && python -m utils.cache_benchmark
+    cd src && python -m utils.cache_benchmark --seconds 2 --keys 5000 --threads 1,4,16
+    cd src && python -m utils.cache_benchmark --invalidate-every 0.001
+"""
+import argparse
+import random
+import threading
+import time
+
+from utils.cache import Cache
+
+
+def _worker(keys, seconds, read_ratio, seed, counts, index):
+    rng = random.Random(seed)
+    picks = [rng.randrange(len(keys)) for _ in range(4096)]
+    reads = [rng.random() < read_ratio for _ in range(4096)]
+    value = [{'grade_id': 1, 'course_name': 'Benchmark', 'total': 8.5}]
+    ops = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for i in range(4096):
+            key = keys[picks[i]]
+            if reads[i]:
+                Cache.get(key)
+            else:
+                Cache.set(key, value, 300)
+        ops += 4096
+    counts[index] = ops
+
+
+def _invalidator(count_keys, interval, stop, counts):
+    """Refills the "count:" keys and invalidates them every `interval` seconds until stop is set."""
+    while not stop.is_set():
+        for key in count_keys:
+            Cache.set(key, 1, 300)
+        started = time.perf_counter()
+        Cache.invalidate_prefix("count:bench:")
+        counts[1] += time.perf_counter() - started
+        counts[0] += 1
+        stop.wait(interval)
+
+
+def run(threads, keys, seconds, read_ratio, invalidate_every=None):
+    """
+    (reader operations per second, invalidations per second, mean milliseconds
+    per invalidate_prefix() call) for one thread count.
+    """
+    Cache.configure()
+    for key in keys:
+        Cache.set(key, [{'grade_id': 1}], 300)
+    counts = [0] * threads
+    workers = [
+        threading.Thread(target=_worker, args=(keys, seconds, read_ratio, i, counts, i))
+        for i in range(threads)
+    ]
+    stop = threading.Event()
+    invalidations = [0, 0.0]  # Calls, seconds spent in them
+    if invalidate_every is not None:
+        count_keys = [f"count:bench:{i}" for i in range(100)]
+        invalidator = threading.Thread(target=_invalidator, args=(count_keys, invalidate_every, stop, invalidations))
+        invalidator.start()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    if invalidate_every is not None:
+        invalidator.join()
+    mean_ms = invalidations[1] * 1000 / invalidations[0] if invalidations[0] else 0.0
+    return sum(counts) / elapsed, invalidations[0] / elapsed, mean_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duration of each run")
+    parser.add_argument("--keys", type=int, default=2000, help="Distinct cache keys")
+    parser.add_argument("--threads", default="1,2,4,8,16", help="Comma-separated thread counts")
+    parser.add_argument("--read-ratio", type=float, default=0.9, help="Share of get() calls")
+    parser.add_argument("--invalidate-every", type=float, default=None,
+                        help="Seconds between invalidate_prefix() calls from a background thread")
+    args = parser.parse_args()
+
+    keys = [f"query:bench:{i}" for i in range(args.keys)]
+    thread_counts = [int(n) for n in args.threads.split(",")]
+    print(f"{'THREADS':>7} {'ops/s':>12} {'invalidations/s':>16} {'ms/invalidation':>16}")
+    try:
+        for threads in thread_counts:
+            ops, invalidations, mean_ms = run(threads, keys, args.seconds, args.read_ratio, args.invalidate_every)
+            print(f"{threads:>7} {ops:>12,.0f} {invalidations:>16,.0f} {mean_ms:>16.3f}")
+    finally:
+        Cache.configure()  # Back to an empty cache
+
+
+if __name__ == "__main__":
+    main()
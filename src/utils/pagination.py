@@ -1,6 +1,8 @@
 """
 Utility class for pagination support
 """
+import base64
+import json
 
 class PaginationHelper:
     @staticmethod
@@ -59,3 +61,45 @@ class PaginationHelper:
             'limit': per_page,
             'params': params
         }
+
+    @staticmethod
+    def encode_cursor(direction, key_values):
+        """
+        Builds an opaque keyset cursor.
+
+        Args:
+            direction: 'next' (rows after the key) or 'prev' (rows before it)
+            key_values: Sort key of the boundary row, e.g. ('S0042',)
+        """
+        payload = json.dumps({'d': direction, 'k': list(key_values)}, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Returns (direction, key_values) from a cursor made by encode_cursor."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            direction = payload['d']
+            if direction not in ('next', 'prev'):
+                raise ValueError(direction)
+            return direction, tuple(payload['k'])
+        except Exception as e:
+            raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+    @staticmethod
+    def seek_condition(columns, key_values, direction='next'):
+        """
+        Expands a row comparison into an index-friendly WHERE condition.
+        ('a', 'b') after (1, 2) -> "a > %s OR (a = %s AND b > %s)"
+
+        Returns:
+            (sql_condition, params)
+        """
+        op = '>' if direction == 'next' else '<'
+        clauses = []
+        params = []
+        for i, column in enumerate(columns):
+            parts = [f"{c} = %s" for c in columns[:i]] + [f"{column} {op} %s"]
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(key_values[:i + 1])
+        return " OR ".join(clauses), params
@@ -8,6 +8,7 @@ from views.admin.courses import CoursesFrame
 from views.admin.classes import ClassesFrame
 from views.admin.announcements import AnnouncementsFrame, AnnouncementDialog
 from utils.threading_helper import run_in_background
+from database.instrumentation import RoundTrips
 
 class AdminDashboard(ctk.CTkFrame):
     def __init__(self, parent, app, user):
@@ -27,7 +28,7 @@ class AdminDashboard(ctk.CTkFrame):
         # Load stats on background thread with tk_root
         self.stats = {'students': 0, 'lecturers': 0, 'courses': 0, 'classes': 0}
         run_in_background(
-            self.controller.get_dashboard_stats,
+            self._query_stats,
             on_complete=self._update_stats,
             tk_root=self.winfo_toplevel()
         )
@@ -208,11 +209,16 @@ class AdminDashboard(ctk.CTkFrame):
         self._draw_action_btn(actions_grid, "Schedule Class", "Assign room & time", lambda: self.switch_view("Classes", self.show_classes))
         self._draw_action_btn(actions_grid, "Manage Semesters", "Set up new terms", lambda: self.switch_view("Semesters", self.show_semesters))
 
+    def _query_stats(self):
+        # Counted as one user action by the round-trip counter (database/instrumentation.py)
+        with RoundTrips.action("AdminDashboard.load"):
+            return self.controller.get_dashboard_stats()
+
     def refresh_home(self):
         """Refreshes dashboard stats and shows home view"""
         self.show_home()
         run_in_background(
-            self.controller.get_dashboard_stats,
+            self._query_stats,
             on_complete=self._update_stats,
             tk_root=self.winfo_toplevel()
         )
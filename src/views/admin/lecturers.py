@@ -12,6 +12,10 @@ class LecturersFrame(ctk.CTkFrame):
         self.per_page = 5
         self.total_pages = 1 # Initialize total pages
         self.total_items = 0
+        # Keyset pagination: cursor that loads the current page (None = first page)
+        self.page_cursor = None
+        self.next_cursor = None
+        self.prev_cursor = None
         # --- FIXED WIDTH CONFIGURATION (PIXEL) ---
         self.col_widths = [80, 200, 200, 120, 150, 100, 120]
 
@@ -101,26 +105,30 @@ class LecturersFrame(ctk.CTkFrame):
     
     def perform_search(self):
         self.current_page = 1
+        self.page_cursor = None
         self.load_data()
 
     def _fetch_lecturers(self):
         try:
             search_query = self.search_ent.get().strip()
             # 1. Get current page data
-            lecturers, total_items = self.controller.get_all_lecturers(
-                page=self.current_page, per_page=self.per_page, search_query=search_query
+            page = self.controller.get_lecturers_page(
+                cursor=self.page_cursor, per_page=self.per_page, search_query=search_query
             )
+            total_items = page['total_items']
             
             total_pages = (total_items + self.per_page - 1) // self.per_page
             
             return {
-                'data': lecturers,
+                'data': page['data'],
                 'page': self.current_page,
                 'per_page': self.per_page,
                 'total_items': total_items,
                 'total_pages': total_pages,
-                'has_next': self.current_page < total_pages,
-                'has_prev': self.current_page > 1
+                'has_next': page['has_next'],
+                'has_prev': page['has_prev'],
+                'next_cursor': page['next_cursor'],
+                'prev_cursor': page['prev_cursor']
             }
         except Exception as e:
             print(f"Error fetching: {e}")
@@ -138,6 +146,10 @@ class LecturersFrame(ctk.CTkFrame):
             return
 
         self.total_pages = result['total_pages']
+        self.next_cursor = result['next_cursor']
+        self.prev_cursor = result['prev_cursor']
+        if not result['has_prev']:
+            self.current_page = 1  # Cursor fell back to the first page
         self.total_items = result['total_items']
         self.page_label.configure(text=f"Page {self.current_page} of {self.total_pages} ({self.total_items} items)")
         
@@ -155,12 +167,14 @@ class LecturersFrame(ctk.CTkFrame):
             self.create_row(item, idx)
 
     def prev_page(self):
-        if self.current_page > 1:
-            self.current_page -= 1
+        if self.prev_cursor:
+            self.page_cursor = self.prev_cursor
+            self.current_page = max(1, self.current_page - 1)
             self.load_data()
     
     def next_page(self):
-        if self.current_page < self.total_pages:
+        if self.next_cursor:
+            self.page_cursor = self.next_cursor
             self.current_page += 1
             self.load_data()
 
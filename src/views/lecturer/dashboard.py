@@ -6,6 +6,9 @@ import traceback
 from controllers.lecturer_controller import LecturerController
 from controllers.auth_controller import AuthController
 from utils.threading_helper import run_in_background
+from utils.cache import Cache
+from database.instrumentation import RoundTrips
+from config import Config
 
 # Import child Views (ProfileView removed)
 from views.lecturer.schedule import LecturerScheduleFrame
@@ -68,6 +71,7 @@ class LecturerDashboard(ctk.CTkFrame):
 
     def load_dashboard_data(self):
         """Fetch data from DB via Controller"""
+        self._tk_root = self.winfo_toplevel()  # Captured here: Tk calls belong on the main thread
         run_in_background(
             self._fetch_data,
             self._on_data_loaded,
@@ -76,15 +80,28 @@ class LecturerDashboard(ctk.CTkFrame):
 
     def _fetch_data(self):
         try:
-            # OPTIMIZATION: Use combined method to reduce DB calls
-            upcoming, stats = self.controller.get_dashboard_summary()
-            return {
-                'next_class': upcoming,
-                'stats': stats
-            }
+            # OPTIMIZATION: Stale-while-revalidate. Data older than DASHBOARD_STALE_AFTER is
+            # shown at once and refreshed in the background (_on_data_loaded runs again).
+            return Cache.get_or_revalidate(
+                self.controller.dashboard_cache_key(),
+                self._query_data,
+                ttl=Config.DASHBOARD_CACHE_TTL,
+                stale_after=Config.DASHBOARD_STALE_AFTER,
+                on_refresh=self._on_data_loaded,
+                tk_root=self._tk_root
+            )
         except Exception as e:
             return None
 
+    def _query_data(self):
+        # OPTIMIZATION: Use combined method to reduce DB calls
+        with RoundTrips.action("LecturerDashboard.load"):
+            upcoming, stats = self.controller.get_dashboard_summary()
+        return {
+            'next_class': upcoming,
+            'stats': stats
+        }
+
     def _on_data_loaded(self, data):
         if not self.winfo_exists(): return
         if data:
@@ -3,6 +3,7 @@ from views.auth.login_window import LoginView
 from views.student.dashboard import StudentDashboard
 from views.lecturer.dashboard import LecturerDashboard
 from views.admin.dashboard import AdminDashboard
+from database.change_journal import ChangePoller
 
 class RootApp(ctk.CTk):
     def __init__(self):
@@ -26,6 +27,8 @@ class RootApp(ctk.CTk):
 
     def show_dashboard(self, user):
         self.clear_window()
+        # Pick up other clients' writes so cached data does not go stale
+        ChangePoller.start()
         
         if user.role == "Student":
             self.current_frame = StudentDashboard(self, self, user)
@@ -8,6 +8,9 @@ from views.student.grades import GradesFrame
 from views.student.profile import ProfileView 
 from views.student.notifications import NotificationsView
 from utils.threading_helper import run_in_background
+from utils.cache import Cache
+from database.instrumentation import RoundTrips
+from config import Config
 import traceback
 
 class StudentDashboard(ctk.CTkFrame):
@@ -67,6 +70,7 @@ class StudentDashboard(ctk.CTkFrame):
 
     def load_real_data(self):
         """Loads data from the controller in a background thread"""
+        self._tk_root = self.winfo_toplevel()  # Captured here: Tk calls belong on the main thread
         run_in_background(
             self._fetch_dashboard_data,
             on_complete=self._on_data_loaded,
@@ -75,22 +79,39 @@ class StudentDashboard(ctk.CTkFrame):
 
     def _fetch_dashboard_data(self):
         try:
-            # Check for method existence before calling to avoid AttributeError
-            # This allows the Dashboard to still display other data sections if a method is missing
-            
+            # OPTIMIZATION: Stale-while-revalidate. Data older than DASHBOARD_STALE_AFTER is
+            # shown at once and refreshed in the background (_on_data_loaded runs again).
+            return Cache.get_or_revalidate(
+                self.controller.dashboard_cache_key(),
+                self._query_dashboard_data,
+                ttl=Config.DASHBOARD_CACHE_TTL,
+                stale_after=Config.DASHBOARD_STALE_AFTER,
+                on_refresh=self._on_data_loaded,
+                tk_root=self._tk_root
+            )
+        except Exception as e:
+            print(f"⚠️ Error fetching data: {e}")
+            return None
+
+    def _query_dashboard_data(self):
+        # Check for method existence before calling to avoid AttributeError
+        # This allows the Dashboard to still display other data sections if a method is missing
+
+        # Counted as one user action by the round-trip counter (database/instrumentation.py)
+        with RoundTrips.action("StudentDashboard.load"):
+            # OPTIMIZATION: One round trip for every dashboard query (served from the cache below)
+            self.controller.prefetch_dashboard(announcement_limit=3)
+
             # OPTIMIZATION: Fetch stats and recent grades in one go
             stats, recent = self.controller.get_dashboard_academic_summary()
-            
+
             data = {
                 'next_class': self.controller.get_upcoming_class() if hasattr(self.controller, 'get_upcoming_class') else None,
                 'stats': stats,
                 'recent_grades': recent,
                 'announcements': self.controller.get_latest_announcements(limit=3) if hasattr(self.controller, 'get_latest_announcements') else []
             }
-            return data
-        except Exception as e:
-            print(f"⚠️ Error fetching data: {e}")
-            return None
+        return data
 
     def _on_data_loaded(self, data):
         # SAFETY CHECK: Ensure widget still exists before updating UI
@@ -0,0 +1,70 @@
+"""
+Shared fixtures. Every test runs against a fresh in-memory SQLite database
+(see src/database/sqlite_backend.py) with empty caches.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = ":memory:"
+
+import pytest
+
+from database.backend import create_backend
+from database.connection import DatabaseConnection
+from database.query_cache import QueryCache
+from utils.cache import Cache
+
+
+@pytest.fixture(autouse=True)
+def db():
+    """A fresh database, empty caches (query cache, counts) and cache stats for each test."""
+    DatabaseConnection.use_backend(create_backend("sqlite"))
+    QueryCache.clear()
+    Cache.clear()
+    Cache.reset_stats()
+    yield DatabaseConnection
+    QueryCache.clear()
+    Cache.clear()
+
+
+def insert(sql, params=()):
+    """Runs one INSERT outside the repository layer (no cache eviction) and returns the new id."""
+    with DatabaseConnection.get_cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.lastrowid
+
+
+@pytest.fixture
+def school():
+    """One student enrolled in one class of an OPEN semester."""
+    ids = {}
+    ids['user_id'] = insert(
+        "INSERT INTO Users (username, password, full_name, email, role, status) "
+        "VALUES ('s1', 'x', 'Student One', 's1@example.com', 'Student', 'ACTIVE')"
+    )
+    ids['dept_id'] = insert("INSERT INTO Departments (dept_name) VALUES ('Computer Science')")
+    ids['student_id'] = insert(
+        "INSERT INTO Students (user_id, student_code, dept_id) VALUES (%s, 'S001', %s)",
+        (ids['user_id'], ids['dept_id'])
+    )
+    ids['semester_id'] = insert(
+        "INSERT INTO Semesters (name, start_date, end_date, status) VALUES ('HK1', '2026-01-01', '2026-06-01', 'OPEN')"
+    )
+    ids['course_id'] = insert(
+        "INSERT INTO Courses (course_code, course_name, credits, dept_id) VALUES ('CS101', 'Intro', 3, %s)",
+        (ids['dept_id'],)
+    )
+    ids['class_id'] = insert(
+        "INSERT INTO Course_Classes (course_id, semester_id, schedule) VALUES (%s, %s, 'Monday 07:00-09:00')",
+        (ids['course_id'], ids['semester_id'])
+    )
+    ids['grade_id'] = insert(
+        "INSERT INTO Grades (student_id, class_id) VALUES (%s, %s)", (ids['student_id'], ids['class_id'])
+    )
+    return ids
@@ -0,0 +1,73 @@
+from config import Config
+from controllers.admin_controller import AdminController
+from database.repositories.class_repo import ClassRepository
+from database.repositories.grade_repo import GradeRepository
+from database.repositories.semester_repo import SemesterRepository
+from database.repositories.student_repo import StudentRepository
+
+
+def count(table):
+    row = SemesterRepository().execute_query(f"SELECT COUNT(*) as count FROM {table}", fetch_one=True)
+    return row['count']
+
+
+def transcript(student_id):
+    return [(g.grade_id, g.course_name) for g in GradeRepository().get_by_student(student_id)]
+
+
+def close(semester_id):
+    SemesterRepository().execute_query("UPDATE Semesters SET status = 'CLOSED' WHERE semester_id = %s", (semester_id,))
+
+
+def test_only_closed_semesters_are_archived(school):
+    success, _ = SemesterRepository().archive(school['semester_id'])
+    assert not success
+    assert count("Archived_Course_Classes") == 0
+
+
+def test_archive_and_restore_round_trip(school):
+    repo = SemesterRepository()
+    before = transcript(school['student_id'])
+    schedule = ClassRepository().get_schedule_by_student(school['student_id'])
+    close(school['semester_id'])
+
+    assert repo.archive(school['semester_id'])[0]
+    assert (count("Course_Classes"), count("Grades")) == (0, 0)
+    assert (count("Archived_Course_Classes"), count("Archived_Grades")) == (1, 1)
+    assert repo.is_archived(school['semester_id'])
+    # Transcripts and schedules read the archive too
+    assert transcript(school['student_id']) == before
+    assert ClassRepository().get_schedule_by_student(school['student_id']) == schedule
+
+    assert repo.restore(school['semester_id'])[0]
+    assert (count("Course_Classes"), count("Grades")) == (1, 1)
+    assert (count("Archived_Course_Classes"), count("Archived_Grades")) == (0, 0)
+    assert not repo.is_archived(school['semester_id'])
+    assert transcript(school['student_id']) == before  # Same grade ids
+
+
+def test_archived_grades_block_deleting_the_student(school):
+    close(school['semester_id'])
+    assert SemesterRepository().archive(school['semester_id'])[0]
+    success, _ = StudentRepository().delete(school['student_id'])
+    assert not success
+    assert count("Archived_Grades") == 1
+
+
+def test_auto_archive_on_close_and_restore_on_reopen(school, monkeypatch):
+    monkeypatch.setattr(Config, "SEMESTER_AUTO_ARCHIVE", True)
+    admin = AdminController(school['user_id'])
+    args = (school['semester_id'], 'HK1', '2026-01-01', '2026-06-01')
+
+    assert admin.update_semester(*args, 'CLOSED')[0]
+    assert SemesterRepository().is_archived(school['semester_id'])
+    assert admin.update_semester(*args, 'OPEN')[0]
+    assert not SemesterRepository().is_archived(school['semester_id'])
+    assert count("Grades") == 1
+
+
+def test_closing_keeps_classes_in_place_by_default(school):
+    admin = AdminController(school['user_id'])
+    assert admin.update_semester(school['semester_id'], 'HK1', '2026-01-01', '2026-06-01', 'CLOSED')[0]
+    assert not SemesterRepository().is_archived(school['semester_id'])
+    assert count("Course_Classes") == 1
@@ -0,0 +1,88 @@
+from database.connection import DatabaseConnection
+from database.repositories.course_repo import CourseRepository
+from database.repositories.student_repo import StudentRepository
+
+from .conftest import insert
+
+
+COURSE_COLUMNS = ("course_code", "course_name", "credits", "dept_id")
+
+
+def course_ids_by_code(repo):
+    rows = repo.execute_query("SELECT course_id, course_code FROM Courses", fetch_all=True)
+    return {row['course_code']: row['course_id'] for row in rows}
+
+
+def test_bulk_insert_returns_ids_in_row_order():
+    repo = CourseRepository()
+    dept_id = insert("INSERT INTO Departments (dept_name) VALUES ('Computer Science')")
+    # An id handed out in between makes the generated ones non-consecutive
+    insert("INSERT INTO Courses (course_code, course_name, credits, dept_id) VALUES ('CS000', 'Other', 3, %s)", (dept_id,))
+    rows = [(code, code, 3, dept_id) for code in ("CS300", "CS100", "CS200")]
+
+    ids = repo.bulk_insert("Courses", COURSE_COLUMNS, rows, id_column="course_id", key_column="course_code")
+
+    by_code = course_ids_by_code(repo)
+    assert ids == [by_code["CS300"], by_code["CS100"], by_code["CS200"]]
+
+
+def test_bulk_insert_chunks_keep_the_mapping():
+    repo = CourseRepository()
+    dept_id = insert("INSERT INTO Departments (dept_name) VALUES ('Computer Science')")
+    rows = [(f"CS{i:03d}", f"Course {i}", 3, dept_id) for i in range(7)]
+
+    ids = repo.bulk_insert("Courses", COURSE_COLUMNS, rows, chunk_size=3,
+                           id_column="course_id", key_column="course_code")
+
+    by_code = course_ids_by_code(repo)
+    assert ids == [by_code[row[0]] for row in rows]
+
+
+def test_bulk_insert_without_key_returns_no_ids():
+    dept_id = insert("INSERT INTO Departments (dept_name) VALUES ('Computer Science')")
+    assert CourseRepository().bulk_insert("Courses", COURSE_COLUMNS, [("CS101", "Intro", 3, dept_id)]) == []
+
+
+def test_bulk_add_links_each_student_to_its_user():
+    dept_id = insert("INSERT INTO Departments (dept_name) VALUES ('Computer Science')")
+    insert("INSERT INTO Users (username, password, full_name, email, role, status) "
+           "VALUES ('admin', 'x', 'Admin', 'admin@example.com', 'Admin', 'ACTIVE')")
+    students = [{'code': f"B{i}", 'name': f"Student {i}", 'email': f"b{i}@example.com"} for i in range(3)]
+
+    success, message = StudentRepository().bulk_add(students, default_dept_id=dept_id)
+
+    assert success, message
+    with DatabaseConnection.get_cursor(readonly=True) as cursor:
+        cursor.execute("SELECT u.username, u.full_name, s.student_code FROM Students s JOIN Users u ON u.user_id = s.user_id")
+        rows = cursor.fetchall()
+    assert sorted((row['username'], row['student_code'], row['full_name']) for row in rows) == [
+        (f"B{i}", f"B{i}", f"Student {i}") for i in range(3)
+    ]
+
+
+def test_bulk_add_rolls_back_on_duplicate():
+    dept_id = insert("INSERT INTO Departments (dept_name) VALUES ('Computer Science')")
+    insert("INSERT INTO Users (username, password, full_name, email, role, status) "
+           "VALUES ('B1', 'x', 'Taken', 'taken@example.com', 'Student', 'ACTIVE')")
+    students = [{'code': f"B{i}", 'name': f"Student {i}", 'email': f"b{i}@example.com"} for i in range(3)]
+
+    success, _ = StudentRepository().bulk_add(students, default_dept_id=dept_id)
+
+    assert not success
+    row = StudentRepository().execute_query("SELECT COUNT(*) as count FROM Users", fetch_one=True)
+    assert row['count'] == 1
+
+
+def test_bulk_update_returns_the_keys_it_updated(school):
+    repo = CourseRepository()
+    other = insert("INSERT INTO Grades (student_id, class_id, is_locked) VALUES (%s, %s, 1)",
+                   (school['student_id'], school['class_id']))
+    rows = [(school['grade_id'], 8.0), (other, 9.0), (999, 7.0)]
+
+    updated = repo.bulk_update("Grades", "grade_id", ("final",), rows, where="t.is_locked = 0")
+
+    assert updated == [school['grade_id']]
+    finals = repo.execute_query("SELECT grade_id, final FROM Grades ORDER BY grade_id", fetch_all=True)
+    assert [(row['grade_id'], row['final']) for row in finals] == [(school['grade_id'], 8.0), (other, None)]
+    # Unchanged values still count as updated (MySQL's rowcount would report 0)
+    assert repo.bulk_update("Grades", "grade_id", ("final",), rows[:1]) == [school['grade_id']]
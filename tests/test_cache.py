@@ -0,0 +1,128 @@
+import threading
+import time
+
+from utils.cache import Cache, cache_result
+
+
+class Counter:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.values[min(self.calls, len(self.values)) - 1]
+
+
+def test_none_is_cached_as_a_negative_entry():
+    Cache.set("user:missing", None, ttl=60)
+    assert Cache.lookup("user:missing") is None
+    assert Cache.lookup("user:unknown") is Cache.MISSING
+    assert Cache.get("user:unknown") is None
+
+
+def test_negative_entry_expires_after_the_negative_ttl():
+    Cache.set("user:missing", None, ttl=60, negative_ttl=0.05)
+    time.sleep(0.1)
+    assert Cache.lookup("user:missing") is Cache.MISSING
+
+
+def test_negative_ttl_zero_disables_negative_caching():
+    Cache.set("user:missing", "old", ttl=60)
+    Cache.set("user:missing", None, ttl=60, negative_ttl=0)
+    assert Cache.lookup("user:missing") is Cache.MISSING
+
+
+def test_get_or_compute_remembers_a_none_result():
+    compute = Counter(None, "found")
+    assert Cache.get_or_compute("user:1", compute, ttl=60) is None
+    assert Cache.get_or_compute("user:1", compute, ttl=60) is None
+    assert compute.calls == 1
+    assert Cache.stats()["user"]["negative_hits"] == 1
+
+
+def test_cache_result_caches_none():
+    calls = []
+
+    @cache_result(ttl=60)
+    def find(user_id):
+        calls.append(user_id)
+        return None
+
+    assert find(1) is None and find(1) is None
+    assert calls == [1]
+    find.invalidate(1)
+    assert find(1) is None
+    assert calls == [1, 1]
+
+
+def test_stale_hit_is_served_and_refreshed_in_the_background():
+    compute = Counter("v1", "v2")
+    refreshed = threading.Event()
+    results = []
+
+    def on_refresh(value):
+        results.append(value)
+        refreshed.set()
+
+    assert Cache.get_or_revalidate("dash:1", compute, ttl=60, stale_after=0.05, on_refresh=on_refresh) == "v1"
+    assert Cache.get_or_revalidate("dash:1", compute, ttl=60, stale_after=0.05, on_refresh=on_refresh) == "v1"
+    assert compute.calls == 1  # Fresh hit
+
+    time.sleep(0.1)
+    # Stale: the old value comes back at once, the new one arrives through on_refresh
+    assert Cache.get_or_revalidate("dash:1", compute, ttl=60, stale_after=0.05, on_refresh=on_refresh) == "v1"
+    assert refreshed.wait(5)
+    assert results == ["v2"]
+    assert Cache.get("dash:1") == "v2"
+    assert compute.calls == 2
+
+
+def test_concurrent_stale_hits_schedule_one_refresh():
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls)
+
+    Cache.get_or_revalidate("dash:2", compute, ttl=60, stale_after=0.05)
+    time.sleep(0.1)
+    values = [Cache.get_or_revalidate("dash:2", compute, ttl=60, stale_after=0.05) for _ in range(5)]
+    release.set()
+    assert values == [1] * 5
+    deadline = time.time() + 5
+    while Cache.get("dash:2") != 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert Cache.get("dash:2") == 2
+    assert len(calls) == 2
+
+
+def test_entry_past_its_hard_ttl_is_recomputed():
+    compute = Counter("v1", "v2")
+    Cache.get_or_revalidate("dash:3", compute, ttl=0.05, stale_after=0.01)
+    time.sleep(0.1)
+    assert Cache.get_or_revalidate("dash:3", compute, ttl=0.05, stale_after=0.01) == "v2"
+
+
+def test_invalidate_prefix_only_drops_matching_keys():
+    Cache.set("count:students:", 3, ttl=60)
+    Cache.set("count:students:an", 1, ttl=60)
+    Cache.set("count:courses:", 2, ttl=60)
+    Cache.set("countdown", 9, ttl=60)
+    Cache.set(("StudentController.view_grades", 1), [], ttl=60)
+    Cache.invalidate_prefix("count:students:")
+    assert Cache.lookup("count:students:") is Cache.MISSING
+    assert Cache.lookup("count:students:an") is Cache.MISSING
+    assert Cache.get("count:courses:") == 2
+    Cache.invalidate_prefix("count")
+    assert Cache.lookup("count:courses:") is Cache.MISSING
+    assert Cache.lookup("countdown") is Cache.MISSING
+    Cache.invalidate_prefix("StudentController.")
+    assert Cache.lookup(("StudentController.view_grades", 1)) is Cache.MISSING
+    # The key index forgets removed keys, so a re-added key is invalidated again
+    Cache.set("count:students:", 4, ttl=60)
+    Cache.invalidate_prefix("count:students:")
+    assert Cache.lookup("count:students:") is Cache.MISSING
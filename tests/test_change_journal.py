@@ -0,0 +1,66 @@
+import pytest
+
+from config import Config
+from database.change_journal import ChangeJournal, ChangePoller
+from database.connection import DatabaseConnection
+from database.repositories.department_repo import DepartmentRepository
+
+from .conftest import insert
+
+
+@pytest.fixture
+def poller(monkeypatch):
+    """Journal on, and a poller that has seen every entry so far."""
+    monkeypatch.setattr(Config, "CHANGE_JOURNAL_ENABLED", True)
+    monkeypatch.setattr(ChangePoller, "_gaps", {})
+    monkeypatch.setattr(ChangePoller, "_subscribers", [])
+    monkeypatch.setattr(ChangePoller, "_last_version", 0)
+    poll()
+    return ChangePoller
+
+
+def poll():
+    with DatabaseConnection.get_cursor(readonly=True) as cursor:
+        ChangePoller.poll(cursor)
+
+
+def journal():
+    rows = DepartmentRepository().execute_query(
+        "SELECT table_name, row_id, operation, client_id FROM Change_Journal ORDER BY version", fetch_all=True)
+    return [(r['table_name'], r['row_id'], r['operation'], r['client_id']) for r in rows]
+
+
+def test_writes_are_journaled_with_their_row(poller):
+    dept_id = DepartmentRepository().execute_query("INSERT INTO Departments (dept_name) VALUES ('A')")
+    assert journal() == [("Departments", dept_id, "INSERT", ChangeJournal.CLIENT_ID)]
+
+
+def test_no_journal_when_disabled():
+    DepartmentRepository().execute_query("INSERT INTO Departments (dept_name) VALUES ('A')")
+    assert journal() == []
+
+
+def test_changes_of_other_clients_evict_the_cache_and_reach_subscribers(poller):
+    repo = DepartmentRepository()
+    assert repo.get_all() == []
+    received = []
+
+    def on_change(changes):
+        received.append(changes)
+    poller.subscribe(("Departments",), on_change)
+
+    # Own writes evict locally and are skipped by the poller
+    repo.execute_query("INSERT INTO Departments (dept_name) VALUES ('A')")
+    poll()
+    assert received == []
+
+    # Another client writes and journals without touching this cache
+    assert [d.dept_name for d in repo.get_all()] == ["A"]
+    dept_id = insert("INSERT INTO Departments (dept_name) VALUES ('B')")
+    insert("INSERT INTO Change_Journal (table_name, row_id, operation, client_id) VALUES ('Departments', %s, 'INSERT', 'other')",
+           (dept_id,))
+    assert [d.dept_name for d in repo.get_all()] == ["A"]  # Still cached
+    poll()
+    assert [d.dept_name for d in repo.get_all()] == ["A", "B"]
+    assert received == [[("Departments", dept_id, "INSERT")]]
+    assert ChangePoller.changed_rows(received[0], "Departments") == {dept_id}
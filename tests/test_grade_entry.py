@@ -0,0 +1,53 @@
+import datetime
+
+from controllers.lecturer_controller import LecturerController
+from controllers.student_controller import StudentController
+from database.repositories.grade_repo import GradeRepository
+
+from .conftest import insert
+
+
+def notifications(user_id):
+    row = GradeRepository().execute_query(
+        "SELECT COUNT(*) as count FROM Announcements WHERE user_id = %s", (user_id,), fetch_one=True)
+    return row['count']
+
+
+def open_until_next_year(school):
+    end_date = datetime.date.today() + datetime.timedelta(days=365)
+    insert("UPDATE Semesters SET end_date = %s WHERE semester_id = %s", (end_date, school['semester_id']))
+
+
+def test_saved_grades_reach_the_student_transcript(school):
+    open_until_next_year(school)
+    student = StudentController(school['user_id'])
+    assert student.view_grades()['transcript'][0].total is None  # Cached until the write evicts it
+
+    success, message = LecturerController(school['user_id']).update_class_grades(
+        school['class_id'], [(school['student_id'], 10, 8, 9), (school['student_id'], 11, 8, 9)])
+
+    assert success and "1 students" in message
+    grade = student.view_grades()['transcript'][0]
+    assert grade.total is not None and grade.letter_grade
+    assert notifications(school['user_id']) == 1
+
+
+def test_grades_locked_meanwhile_are_neither_counted_nor_notified(school, monkeypatch):
+    open_until_next_year(school)
+    repo = GradeRepository()
+    get_by_class = repo.get_by_class
+
+    def read_then_lock(class_id):
+        rows = get_by_class(class_id)
+        repo.lock_grades(class_id)  # Another lecturer locks the class after our read
+        return rows
+
+    lecturer = LecturerController(school['user_id'])
+    lecturer._grade_repo = repo
+    monkeypatch.setattr(repo, "get_by_class", read_then_lock)
+
+    success, _ = lecturer.update_class_grades(school['class_id'], [(school['student_id'], 10, 8, 9)])
+
+    assert not success
+    assert notifications(school['user_id']) == 0
+    assert StudentController(school['user_id']).view_grades()['transcript'][0].total is None
@@ -0,0 +1,38 @@
+from config import Config
+from database.connection import DatabaseConnection
+from database.instrumentation import QueryStats
+
+
+def add_departments(*names):
+    with DatabaseConnection.get_cursor() as cursor:
+        cursor.executemany("INSERT INTO Departments (dept_name) VALUES (%s)", [(name,) for name in names])
+
+
+def recorded(monkeypatch, read):
+    monkeypatch.setattr(Config, "QUERY_STATS_ENABLED", True)
+    QueryStats.reset()
+    with DatabaseConnection.get_cursor(readonly=True) as cursor:
+        cursor.execute("SELECT dept_name FROM Departments")
+        read(cursor)
+    return QueryStats.snapshot()['recorded']
+
+
+def test_select_rows_are_counted_as_they_are_fetched(monkeypatch):
+    add_departments("A", "B", "C")
+    for read in (lambda c: c.fetchall(), lambda c: list(c), lambda c: c.fetchmany(2) + c.fetchmany(2)):
+        stats = recorded(monkeypatch, read)
+        assert (stats['count'], stats['rows']) == (1, 3)
+
+
+def test_partly_read_result_is_recorded_when_the_cursor_is_released(monkeypatch):
+    add_departments("A", "B", "C")
+    stats = recorded(monkeypatch, lambda c: c.fetchone())
+    assert (stats['count'], stats['rows']) == (1, 1)
+
+
+def test_writes_record_the_affected_rows(monkeypatch):
+    monkeypatch.setattr(Config, "QUERY_STATS_ENABLED", True)
+    QueryStats.reset()
+    add_departments("A", "B")
+    stats = QueryStats.snapshot()['add_departments']
+    assert (stats['count'], stats['rows']) == (1, 2)
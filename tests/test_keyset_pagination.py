@@ -0,0 +1,70 @@
+from database.repositories.course_repo import CourseRepository
+
+from .conftest import insert
+
+
+def codes(page):
+    return [course.course_code for course in page['data']]
+
+
+def add_courses(count):
+    dept_id = insert("INSERT INTO Departments (dept_name) VALUES ('Computer Science')")
+    for i in range(1, count + 1):
+        insert(
+            "INSERT INTO Courses (course_code, course_name, credits, dept_id) VALUES (%s, %s, 3, %s)",
+            (f"CS{i:03d}", f"Course {i}", dept_id)
+        )
+
+
+def test_pages_forward_and_back():
+    add_courses(7)
+    repo = CourseRepository()
+
+    first = repo.get_page(per_page=3)
+    assert codes(first) == ["CS001", "CS002", "CS003"]
+    assert first['total_items'] == 7
+    assert first['has_next'] and not first['has_prev']
+
+    second = repo.get_page(per_page=3, cursor=first['next_cursor'])
+    assert codes(second) == ["CS004", "CS005", "CS006"]
+    assert second['has_next'] and second['has_prev']
+
+    last = repo.get_page(per_page=3, cursor=second['next_cursor'])
+    assert codes(last) == ["CS007"]
+    assert not last['has_next'] and last['next_cursor'] is None
+
+    back = repo.get_page(per_page=3, cursor=last['prev_cursor'])
+    assert codes(back) == codes(second)
+    back = repo.get_page(per_page=3, cursor=back['prev_cursor'])
+    assert codes(back) == codes(first)
+    assert not back['has_prev']
+
+
+def test_cursor_is_stable_under_inserts_before_it():
+    add_courses(6)
+    repo = CourseRepository()
+    first = repo.get_page(per_page=3)
+    # A new row sorting before the boundary must not shift the next page
+    insert("INSERT INTO Courses (course_code, course_name, credits, dept_id) VALUES ('CS000', 'New', 3, 1)")
+    assert codes(repo.get_page(per_page=3, cursor=first['next_cursor'])) == ["CS004", "CS005", "CS006"]
+
+
+def test_cursor_past_deleted_rows_returns_last_page():
+    add_courses(7)
+    repo = CourseRepository()
+    second = repo.get_page(per_page=3, cursor=repo.get_page(per_page=3)['next_cursor'])
+
+    repo.execute_query("DELETE FROM Courses WHERE course_code = 'CS007'")
+    page = repo.get_page(per_page=3, cursor=second['next_cursor'])
+
+    assert codes(page) == ["CS004", "CS005", "CS006"]
+    assert not page['has_next'] and page['has_prev']
+
+
+def test_search_filters_pages():
+    add_courses(12)
+    repo = CourseRepository()
+    page = repo.get_page(per_page=2, search_query="CS01")
+    assert codes(page) == ["CS010", "CS011"]
+    assert page['total_items'] == 3
+    assert codes(repo.get_page(per_page=2, cursor=page['next_cursor'], search_query="CS01")) == ["CS012"]
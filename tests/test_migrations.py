@@ -0,0 +1,43 @@
+import pytest
+
+from config import Config
+from database.connection import DatabaseConnection
+from database.migrations import MIGRATIONS, MigrationRunner
+
+
+def forget(*versions):
+    """Marks migrations as not applied, as on a database that predates them."""
+    with DatabaseConnection.get_cursor() as cursor:
+        for version in versions:
+            cursor.execute("DELETE FROM Schema_Migrations WHERE version = %s", (version,))
+
+
+def test_apply_on_a_given_connection_defaults_to_the_configured_backend():
+    forget(3)
+    with DatabaseConnection.get_cursor() as cursor:
+        cursor.execute("DROP INDEX idx_grade_enrollment ON Grades")
+    connection = DatabaseConnection.get_connection()
+    try:
+        assert MigrationRunner.apply(connection) == [3]
+        assert MigrationRunner.apply(connection) == []
+    finally:
+        connection.close()
+    with DatabaseConnection.get_cursor(dictionary=False) as cursor:
+        indexes = DatabaseConnection.get_backend().table_indexes(cursor, "Grades")
+    assert indexes["idx_grade_enrollment"] == ("student_id", "class_id")
+
+
+def test_steps_already_in_the_schema_are_skipped():
+    versions = [m.version for m in MIGRATIONS]
+    forget(*versions)
+    assert MigrationRunner.apply() == versions
+    assert MigrationRunner.pending() == []
+
+
+def test_ensure_current_refuses_pending_migrations_unless_auto_migrate(monkeypatch):
+    forget(6)
+    monkeypatch.setattr(Config, "DB_AUTO_MIGRATE", False)
+    with pytest.raises(RuntimeError, match="python -m database.migrations"):
+        MigrationRunner.ensure_current()
+    monkeypatch.setattr(Config, "DB_AUTO_MIGRATE", True)
+    assert MigrationRunner.ensure_current() == [6]
@@ -0,0 +1,72 @@
+import pickle
+import sqlite3
+
+import pytest
+
+from config import Config
+from database.change_journal import ChangePoller
+from database.persistent_cache import PersistentCache
+from database.query_cache import QueryCache
+from database.repositories.semester_repo import SemesterRepository
+from database.repositories.department_repo import DepartmentRepository
+from utils.cache import Cache
+
+from .conftest import insert
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CHANGE_JOURNAL_ENABLED", True)
+    monkeypatch.setattr(ChangePoller, "_applied_version", 0)
+    yield str(tmp_path / "cache" / "warm.db")
+    PersistentCache.close()
+
+
+def restart(path):
+    """Closes the file and empties the memory cache, like quitting the app, then opens the file again."""
+    PersistentCache.close()
+    QueryCache.clear()
+    Cache.clear()
+    assert PersistentCache.open(path)
+    return PersistentCache.warm()
+
+
+def test_reference_reads_survive_a_restart_with_their_types(path, school):
+    assert PersistentCache.open(path)
+    repo = SemesterRepository()
+    semester = repo.get_by_id(school['semester_id'])
+    raw = DepartmentRepository().execute_query(
+        "SELECT * FROM Departments", fetch_all=True, raw=True, cache_ttl=Config.QUERY_CACHE_TTL)
+
+    assert restart(path) == 2
+    # Changed behind the cache's back: the warmed rows are served without a query
+    insert("UPDATE Semesters SET name = 'Renamed'")
+    insert("UPDATE Departments SET dept_name = 'Renamed'")
+    warmed = repo.get_by_id(school['semester_id'])
+    assert vars(warmed) == vars(semester)
+    assert type(warmed.start_date) is type(semester.start_date)
+    # (column names, tuple rows) of a raw read keep their tuples
+    assert DepartmentRepository().execute_query(
+        "SELECT * FROM Departments", fetch_all=True, raw=True, cache_ttl=Config.QUERY_CACHE_TTL) == raw
+    assert type(raw[1][0]) is tuple
+
+
+def test_reads_of_other_tables_stay_in_memory(path, school):
+    assert PersistentCache.open(path)
+    SemesterRepository().execute_query("SELECT * FROM Grades", fetch_all=True, cache_ttl=60)
+    assert restart(path) == 0
+
+
+def test_pickled_cache_file_is_discarded_unread(path, tmp_path, school):
+    (tmp_path / "cache").mkdir()
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE cache_entries (cache_key TEXT PRIMARY KEY, query TEXT NOT NULL, "
+                       "version INTEGER NOT NULL, stored_at REAL NOT NULL, value BLOB NOT NULL)")
+    connection.execute("INSERT INTO cache_entries VALUES ('query:x', 'SELECT * FROM Departments', 0, 9e9, ?)",
+                       (pickle.dumps([{'dept_id': 1}]),))
+    connection.execute("PRAGMA user_version = 1")
+    connection.commit()
+    connection.close()
+
+    assert PersistentCache.open(path)
+    assert PersistentCache.warm() == 0
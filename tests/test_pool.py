@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from database.pool import ElasticConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.in_transaction = False
+        self.broken = False
+        self.closed = False
+
+    def rollback(self):
+        if self.broken:
+            raise OSError("connection lost")
+        self.in_transaction = False
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(connect=FakeConnection, **kwargs):
+    kwargs.setdefault("min_size", 0)
+    kwargs.setdefault("max_size", 1)
+    return ElasticConnectionPool(connect, ping_interval=60, autocommit=True, **kwargs)
+
+
+def test_checkout_reuses_released_connections():
+    pool = make_pool()
+    first = pool.get_connection()
+    first.close()
+    second = pool.get_connection()
+    assert second.raw is first.raw
+    assert pool.stats()['size'] == 1
+
+
+def test_waiter_gets_the_released_connection():
+    pool = make_pool()
+    held = pool.get_connection()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.get_connection(timeout=5)))
+    waiter.start()
+    while pool.stats()['waiting'] == 0:
+        pass
+    held.close()
+    waiter.join(5)
+    assert got and got[0].raw is held.raw
+
+
+def test_waiter_times_out():
+    pool = make_pool()
+    pool.get_connection()
+    with pytest.raises(PoolTimeoutError):
+        pool.get_connection(timeout=0.05)
+    assert pool.stats()['waiting'] == 0
+
+
+def test_timed_out_waiter_does_not_leak_its_replacement_connection():
+    opening = threading.Event()
+    gate = threading.Event()
+    connections = iter([FakeConnection()])
+
+    def connect():
+        try:
+            return next(connections)
+        except StopIteration:
+            opening.set()
+            gate.wait(5)  # Slow replacement connection
+            return FakeConnection()
+
+    pool = make_pool(connect)
+    held = pool.get_connection()
+    errors = []
+
+    def wait():
+        try:
+            pool.get_connection(timeout=0.2)
+        except Exception as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    while pool.stats()['waiting'] == 0:
+        pass
+    # Releasing a broken connection opens a replacement for the waiter
+    held.raw.in_transaction = held.raw.broken = True
+    releaser = threading.Thread(target=held.close)
+    releaser.start()
+    assert opening.wait(5)
+    waiter.join(5)
+    gate.set()
+    releaser.join(5)
+
+    assert len(errors) == 1 and isinstance(errors[0], PoolTimeoutError)
+    stats = pool.stats()
+    assert (stats['size'], stats['idle'], stats['waiting']) == (1, 1, 0)
+    assert pool.get_connection(timeout=0.1) is not None
@@ -0,0 +1,59 @@
+from database.change_journal import ChangePoller
+from database.repositories.course_repo import CourseRepository
+from database.repositories.grade_repo import GradeRepository
+from database.unit_of_work import UnitOfWork
+
+from .conftest import insert
+
+
+def course_names(student_id):
+    return [grade.course_name for grade in GradeRepository().get_by_student(student_id)]
+
+
+def add_second_enrollment(school):
+    course_id = insert(
+        "INSERT INTO Courses (course_code, course_name, credits, dept_id) VALUES ('CS102', 'Data', 3, %s)",
+        (school['dept_id'],)
+    )
+    class_id = insert("INSERT INTO Course_Classes (course_id, semester_id) VALUES (%s, %s)",
+                      (course_id, school['semester_id']))
+    insert("INSERT INTO Grades (student_id, class_id) VALUES (%s, %s)", (school['student_id'], class_id))
+
+
+def test_reads_are_served_from_the_cache(school):
+    assert course_names(school['student_id']) == ["Intro"]
+    add_second_enrollment(school)  # Bypasses the repository layer: nothing is evicted
+    assert course_names(school['student_id']) == ["Intro"]
+    assert sorted(grade.course_name for grade in
+                  GradeRepository().get_by_student(school['student_id'], refresh=True)) == ["Data", "Intro"]
+
+
+def test_repository_write_evicts_dependent_reads(school):
+    assert course_names(school['student_id']) == ["Intro"]
+    # The transcript joins Courses, so renaming a course evicts it
+    CourseRepository().execute_query("UPDATE Courses SET course_name = 'Renamed' WHERE course_id = %s",
+                                     (school['course_id'],))
+    assert course_names(school['student_id']) == ["Renamed"]
+
+
+def test_unrelated_write_keeps_the_entry(school):
+    assert course_names(school['student_id']) == ["Intro"]
+    add_second_enrollment(school)
+    CourseRepository().execute_query("UPDATE Announcements SET title = 'x'")
+    assert course_names(school['student_id']) == ["Intro"]
+
+
+def test_write_inside_a_unit_of_work_evicts_on_commit(school):
+    assert course_names(school['student_id']) == ["Intro"]
+    repo = CourseRepository()
+    with UnitOfWork():
+        repo.execute_query("UPDATE Courses SET course_name = 'Renamed' WHERE course_id = %s", (school['course_id'],))
+    assert course_names(school['student_id']) == ["Renamed"]
+
+
+def test_remote_change_evicts_the_tables_it_names(school):
+    assert course_names(school['student_id']) == ["Intro"]
+    add_second_enrollment(school)
+    # What the change poller applies for another client's INSERT INTO Grades
+    ChangePoller.apply([("Grades", None, "INSERT")])
+    assert sorted(course_names(school['student_id'])) == ["Data", "Intro"]
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from database.connection import DatabaseConnection
+from database.repositories.course_repo import CourseRepository
+
+
+class FakeRouter:
+    def get_connection(self, timeout=None):
+        return "replica"
+
+
+@pytest.fixture(autouse=True)
+def replicas(monkeypatch):
+    monkeypatch.setattr(DatabaseConnection, "_router", FakeRouter())
+    monkeypatch.setattr(DatabaseConnection, "_router_initialized", True)
+
+
+def read_goes_to_replica():
+    connection = DatabaseConnection.get_connection(readonly=True)
+    if connection == "replica":
+        return True
+    connection.close()
+    return False
+
+
+def in_thread(func):
+    """Runs func on a new thread (fresh read-your-writes state) and returns its result."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join(5)
+    return result[0]
+
+
+def test_reads_stay_on_the_replicas_without_writes():
+    def work():
+        CourseRepository().execute_query("SELECT * FROM Departments", fetch_all=True, readonly=False)
+        return read_goes_to_replica()
+    assert in_thread(work)
+
+
+def test_a_write_pins_only_the_writing_thread_to_the_primary():
+    def write():
+        CourseRepository().execute_query("INSERT INTO Departments (dept_name) VALUES ('A')")
+        return read_goes_to_replica(), in_thread(read_goes_to_replica)
+    assert in_thread(write) == (False, True)
@@ -0,0 +1,65 @@
+from database.replica_router import Replica, ReplicaRouter
+
+
+class FakeCursor:
+    def __init__(self, lag):
+        self.lag = lag
+
+    def execute(self, sql):
+        pass
+
+    def fetchone(self):
+        return {'Seconds_Behind_Source': self.lag}
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self, name, lag):
+        self.name = name
+        self.lag = lag
+
+    def get_connection(self, timeout=None):
+        if self.lag == "down":
+            raise OSError("connection refused")
+        return FakeConnection(self.name, self.lag)
+
+
+class FakeConnection:
+    def __init__(self, name, lag):
+        self.name = name
+        self.lag = lag
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.lag)
+
+    def close(self):
+        pass
+
+
+def router(**lags):
+    replicas = [Replica(name, 3306, lambda host, port, lag=lag: FakePool(host, lag)) for name, lag in lags.items()]
+    return ReplicaRouter(replicas, max_lag=5, check_interval=60)
+
+
+def test_parse_hosts():
+    assert ReplicaRouter.parse_hosts("db-r1, db-r2:3307,", 3306) == [("db-r1", 3306), ("db-r2", 3307)]
+    assert ReplicaRouter.parse_hosts("", 3306) == []
+
+
+def test_reads_rotate_over_healthy_replicas():
+    r = router(r1=0, r2=1)
+    assert sorted(r.get_connection().name for _ in range(4)) == ["r1", "r1", "r2", "r2"]
+
+
+def test_lagging_broken_and_unreachable_replicas_are_skipped():
+    r = router(r1=30, r2=None, r3="down", r4=2)
+    assert {r.get_connection().name for _ in range(4)} == {"r4"}
+    assert [replica.healthy for replica in r.replicas] == [False, False, False, True]
+
+
+def test_no_usable_replica_falls_back_to_the_primary():
+    r = router(r1=30)
+    assert r.get_connection() is None
+    assert r.fallbacks == 1
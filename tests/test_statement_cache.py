@@ -0,0 +1,67 @@
+from database.statement_cache import StatementCache
+
+
+class FakeCursor:
+    def __init__(self, fail=False):
+        self.executed = []
+        self.closed = False
+        self.fail = fail
+
+    def execute(self, sql, params=()):
+        if self.fail:
+            raise RuntimeError("statement failed")
+        self.executed.append((sql, params))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statement_cache = None
+        self.cursors = []
+        self.fail = False
+
+    def cursor(self, prepared=False):
+        assert prepared
+        self.cursors.append(FakeCursor(self.fail))
+        return self.cursors[-1]
+
+
+def test_same_sql_reuses_its_prepared_cursor():
+    connection = FakeConnection()
+    cache = StatementCache.for_connection(connection, capacity=2)
+    assert StatementCache.for_connection(connection, capacity=2) is cache
+
+    first = cache.execute("SELECT 1 WHERE a = %s", (1,))
+    second = cache.execute("SELECT 1 WHERE a = %s", (2,))
+
+    assert first is second and len(connection.cursors) == 1
+    assert first.executed == [("SELECT 1 WHERE a = %s", (1,)), ("SELECT 1 WHERE a = %s", (2,))]
+
+
+def test_least_recently_used_statement_is_closed():
+    connection = FakeConnection()
+    cache = StatementCache(connection, capacity=2)
+    a = cache.execute("SELECT a")
+    cache.execute("SELECT b")
+    cache.execute("SELECT a")
+    cache.execute("SELECT c")  # Evicts b
+
+    assert len(cache) == 2
+    assert [c.closed for c in connection.cursors] == [False, True, False]
+    assert cache.execute("SELECT a") is a
+
+
+def test_failed_statement_is_prepared_again():
+    connection = FakeConnection()
+    cache = StatementCache(connection, capacity=2)
+    connection.fail = True
+    try:
+        cache.execute("SELECT a")
+    except RuntimeError:
+        pass
+    connection.fail = False
+    assert len(cache) == 0 and connection.cursors[0].closed
+    cache.execute("SELECT a")
+    assert len(connection.cursors) == 2
@@ -0,0 +1,87 @@
+import pytest
+
+from database.repositories.course_repo import CourseRepository
+from database.unit_of_work import UnitOfWork
+
+
+class Boom(Exception):
+    pass
+
+
+def names():
+    rows = CourseRepository().execute_query("SELECT dept_name FROM Departments ORDER BY dept_id", fetch_all=True)
+    return [row['dept_name'] for row in rows]
+
+
+def add(name):
+    CourseRepository().execute_query("INSERT INTO Departments (dept_name) VALUES (%s)", (name,))
+
+
+def test_commits_every_statement_together():
+    with UnitOfWork():
+        add("A")
+        add("B")
+    assert names() == ["A", "B"]
+
+
+def test_exception_rolls_everything_back():
+    with pytest.raises(Boom):
+        with UnitOfWork():
+            add("A")
+            add("B")
+            raise Boom()
+    assert names() == []
+
+
+def test_failing_nested_unit_only_undoes_its_savepoint():
+    with UnitOfWork():
+        add("outer")
+        with pytest.raises(Boom):
+            with UnitOfWork():
+                add("inner")
+                raise Boom()
+        add("after")
+    assert names() == ["outer", "after"]
+
+
+def test_nested_unit_commits_with_the_outer_one():
+    with pytest.raises(Boom):
+        with UnitOfWork():
+            with UnitOfWork():
+                add("inner")
+            raise Boom()
+    assert names() == []
+
+
+def test_on_commit_runs_after_commit_only():
+    calls = []
+    with UnitOfWork():
+        add("A")
+        UnitOfWork.on_commit(lambda: calls.append(names()))
+        assert calls == []
+    assert calls == [["A"]]
+
+    with pytest.raises(Boom):
+        with UnitOfWork():
+            UnitOfWork.on_commit(lambda: calls.append("rolled back"))
+            raise Boom()
+    assert calls == [["A"]]
+
+
+def test_on_commit_of_nested_unit_waits_for_the_outermost_commit():
+    calls = []
+    with UnitOfWork():
+        with UnitOfWork():
+            UnitOfWork.on_commit(lambda: calls.append("kept"))
+        with pytest.raises(Boom):
+            with UnitOfWork():
+                UnitOfWork.on_commit(lambda: calls.append("dropped"))
+                raise Boom()
+        assert calls == []
+    assert calls == ["kept"]
+
+
+def test_on_commit_without_a_unit_runs_now():
+    calls = []
+    UnitOfWork.on_commit(lambda: calls.append(1))
+    assert calls == [1]